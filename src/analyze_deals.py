@@ -0,0 +1,146 @@
+"""
+Wsadowa analiza wygrywalności rozdań - punkt wejścia wiersza poleceń.
+
+Buduje rozdania dla zakresu ziaren, rozwiązuje je solverem na puli
+procesów i dopisuje wynik każdego rozdania do pliku CSV lub JSONL
+zaraz po jego zakończeniu. Ponowne uruchomienie z tym samym plikiem
+wyjściowym pomija rozdania, które już są w pliku.
+
+Przykład:
+    python src/analyze_deals.py 0 10000 --difficulty hard --output wyniki.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from multiprocessing import Pool
+from core.deal import deal_compact, DEAL_NUMBER_BITS
+from core.enums import Difficulty, SolveStatus
+from core.solver import solve, DEFAULT_MAX_NODES, DEFAULT_MAX_SECONDS
+
+FIELDS = ["seed", "difficulty", "result", "nodes", "time", "moves"]
+
+def solve_seed(task: tuple) -> dict:
+    """
+    Rozwiązuje jedno rozdanie (funkcja wykonywana w procesie puli).
+
+    Args:
+        task (tuple): (ziarno, nazwa trudności, limit węzłów, limit czasu)
+
+    Returns:
+        dict: Wiersz wyniku z polami FIELDS
+    """
+    seed, difficulty, max_nodes, max_seconds = task
+    result = solve(deal_compact(seed, Difficulty[difficulty]), max_nodes=max_nodes, max_seconds=max_seconds)
+    return {
+        "seed": seed,
+        "difficulty": difficulty.lower(),
+        "result": result.status.value,
+        "nodes": result.nodes,
+        "time": round(result.elapsed, 4),
+        "moves": len(result.moves),
+    }
+
+def is_csv(path: str) -> bool:
+    """
+    Sprawdza czy plik wyjściowy ma być zapisany jako CSV.
+
+    Args:
+        path (str): Ścieżka pliku wyjściowego
+
+    Returns:
+        bool: True dla rozszerzenia .csv, False dla JSONL
+    """
+    return path.lower().endswith(".csv")
+
+def read_finished(path: str, difficulty: str) -> set[int]:
+    """
+    Odczytuje ziarna, które są już zapisane w pliku wyjściowym.
+
+    Niedokończona ostatnia linia (np. po przerwaniu w trakcie zapisu)
+    jest usuwana z pliku, żeby kolejne wyniki dopisywały się poprawnie.
+
+    Args:
+        path (str): Ścieżka pliku wyjściowego
+        difficulty (str): Nazwa poziomu trudności analizowanych rozdań
+
+    Returns:
+        set[int]: Ziarna z zapisanym wynikiem
+    """
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+
+    lines = data.decode("utf-8").splitlines()
+    if is_csv(path):
+        rows = csv.DictReader(lines)
+    else:
+        rows = (json.loads(line) for line in lines if line.strip())
+
+    return {int(row["seed"]) for row in rows if row["difficulty"] == difficulty.lower()}
+
+def main(argv=None) -> int:
+    """
+    Uruchamia analizę rozdań.
+
+    Args:
+        argv (list[str], optional): Argumenty wiersza poleceń
+
+    Returns:
+        int: Kod wyjścia procesu
+    """
+    parser = argparse.ArgumentParser(description="Analyze Klondike deal winnability for a range of seeds.")
+    parser.add_argument("start", type=int, help="first seed (inclusive)")
+    parser.add_argument("stop", type=int, help="last seed (exclusive)")
+    parser.add_argument("--difficulty", choices=["easy", "hard"], default="hard")
+    parser.add_argument("--output", default="deals.jsonl", help="output file (.csv or .jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES)
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS)
+    args = parser.parse_args(argv)
+    for name in ("start", "stop"):
+        if not 0 <= getattr(args, name) <= 1 << DEAL_NUMBER_BITS:
+            parser.error(f"{name} must be in range 0..2**{DEAL_NUMBER_BITS}")
+
+    difficulty = args.difficulty.upper()
+    finished = read_finished(args.output, difficulty)
+    pending = [(seed, difficulty, args.max_nodes, args.max_seconds)
+               for seed in range(args.start, args.stop) if seed not in finished]
+    print(f"{len(finished)} deals already analyzed, {len(pending)} to go.")
+
+    counts = {status.value: 0 for status in SolveStatus}
+    is_new = not os.path.exists(args.output) or os.path.getsize(args.output) == 0
+
+    with open(args.output, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS) if is_csv(args.output) else None
+        if writer and is_new:
+            writer.writeheader()
+
+        # Wyjście z bloku with kończy procesy puli także po błędzie w procesie roboczym
+        with Pool(args.workers) as pool:
+            try:
+                for row in pool.imap_unordered(solve_seed, pending):
+                    if writer:
+                        writer.writerow(row)
+                    else:
+                        f.write(json.dumps(row) + "\n")
+                    f.flush()
+                    counts[row["result"]] += 1
+            except KeyboardInterrupt:
+                print("Interrupted. Run the same command again to resume.")
+                return 130
+
+    done = sum(counts.values())
+    summary = ", ".join(f"{name}: {count}" for name, count in counts.items())
+    print(f"Analyzed {done} deals ({summary}).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
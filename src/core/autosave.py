@@ -0,0 +1,199 @@
+"""
+Zapis gry w tle.
+
+AutosaveWriter przyjmuje gotowe, zakodowane zapisy i zapisuje je do pliku
+w osobnym wątku, więc wątek obsługujący wejście nie czeka na dysk. Gdy
+zapisy przychodzą szybciej, niż można je zapisać, oczekujący zapis jest
+zastępowany nowszym - na dysk trafia tylko najnowszy stan. Każdy zapis
+trafia najpierw do pliku tymczasowego, który następnie podmienia plik
+docelowy, więc przerwany zapis nigdy nie zostawia uszkodzonego pliku.
+
+Opcjonalnie zapisujący prowadzi też dziennik dopisywany na końcu pliku
+(append()): rekordy oczekujące na zapis są łączone w jedno dopisanie,
+a pełny zapis (submit()) podmienia dziennik na nowy, zaczynający się od
+podanego nagłówka. Po nieudanym zapisie dziennik nie pasuje już do stanu,
+z którego powstają kolejne rekordy, więc aż do następnego udanego pełnego
+zapisu rekordy nie są dopisywane, tylko liczone jako nieudane.
+"""
+
+import os
+import threading
+from typing import Optional
+
+class AutosaveWriter:
+    """
+    Wątek zapisujący w tle najnowszy przekazany zapis gry.
+
+    Attributes:
+        path (str): Ścieżka pliku zapisu
+        log_path (str | None): Ścieżka pliku dziennika dopisywanego przez append()
+        requested (int): Liczba zapisów przekazanych do submit() i append()
+        written (int): Liczba zapisów faktycznie zapisanych na dysk
+        coalesced (int): Liczba zapisów zastąpionych nowszymi, zanim trafiły na dysk
+        failed (int): Liczba zapisów, które nie powiodły się
+        last_error (OSError | None): Ostatni błąd zapisu
+    """
+
+    def __init__(self, path: str, log_path: Optional[str] = None):
+        """
+        Tworzy zapisującego; wątek startuje przy pierwszym zapisie.
+
+        Args:
+            path (str): Ścieżka pliku zapisu
+            log_path (str, optional): Ścieżka pliku dziennika; None wyłącza append()
+        """
+        self.path = path
+        self.log_path = log_path
+        self.requested = 0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_error: Optional[OSError] = None
+        self._pending: Optional[bytes] = None
+        self._log_header = b""
+        self._appends: list[bytes] = []
+        self._log_stale = False  # Po nieudanym zapisie dziennik czeka na pełny zapis
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def _idle(self) -> bool:
+        return self._pending is None and not self._appends and not self._writing
+
+    def _enqueue(self) -> None:
+        """
+        Uruchamia wątek przy pierwszym zapisie i budzi go (wywoływane z założoną blokadą).
+
+        Raises:
+            RuntimeError: Jeśli zapisujący został już zamknięty
+        """
+        if self._closed:
+            raise RuntimeError("Autosave writer is closed")
+        self.requested += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+            self._thread.start()
+        self._condition.notify_all()
+
+    def submit(self, data: bytes, log_header: bytes = b"") -> None:
+        """
+        Przekazuje zapis do zapisania w tle, zastępując oczekujący zapis.
+
+        Oczekujące rekordy dziennika również są pomijane - nowy zapis
+        zawiera już ich skutki.
+
+        Args:
+            data (bytes): Zakodowany stan gry
+            log_header (bytes): Początek nowego dziennika zapisywanego razem ze stanem
+
+        Raises:
+            RuntimeError: Jeśli zapisujący został już zamknięty
+        """
+        with self._condition:
+            if self._pending is not None:
+                self.coalesced += 1
+            self.coalesced += len(self._appends)
+            self._pending = data
+            self._log_header = log_header
+            self._appends = []
+            self._enqueue()
+
+    def append(self, record: bytes) -> None:
+        """
+        Przekazuje rekord do dopisania na końcu dziennika.
+
+        Jeśli poprzedni zapis się nie powiódł, rekord nie zostanie dopisany
+        (zwiększy licznik failed) - dziennik zostanie podmieniony dopiero
+        przy następnym submit().
+
+        Args:
+            record (bytes): Zakodowany rekord
+
+        Raises:
+            RuntimeError: Jeśli zapisujący nie ma dziennika albo został już zamknięty
+        """
+        if self.log_path is None:
+            raise RuntimeError("Autosave writer has no log file")
+        with self._condition:
+            self._appends.append(record)
+            self._enqueue()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka, aż wszystkie przekazane zapisy trafią na dysk.
+
+        Args:
+            timeout (float, optional): Maksymalny czas oczekiwania w sekundach
+
+        Returns:
+            bool: True jeśli nie ma już oczekujących zapisów
+        """
+        with self._condition:
+            return self._condition.wait_for(self._idle, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Zapisuje oczekujący zapis i zatrzymuje wątek.
+
+        Args:
+            timeout (float, optional): Maksymalny czas oczekiwania w sekundach
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """
+        Pętla wątku: zapisuje najnowszy oczekujący zapis, dopóki zapisujący nie zostanie zamknięty.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._appends or self._closed)
+                if self._pending is None and not self._appends:
+                    return
+                data, log_header, appends = self._pending, self._log_header, self._appends
+                self._pending, self._appends = None, []
+                self._writing = True
+            error = None
+            try:
+                if data is not None:
+                    self._log_stale = True
+                    self._replace(self.path, data)
+                    if self.log_path is not None:
+                        self._replace(self.log_path, log_header + b"".join(appends))
+                    self._log_stale = False
+                elif self._log_stale:
+                    error = self.last_error
+                else:
+                    with open(self.log_path, "ab") as file:
+                        file.write(b"".join(appends))
+            except OSError as exc:
+                error = exc
+                self._log_stale = True
+            count = (data is not None) + len(appends)
+            with self._condition:
+                if error is None:
+                    self.written += count
+                else:
+                    self.failed += count
+                    self.last_error = error
+                self._writing = False
+                self._condition.notify_all()
+
+    def _replace(self, path: str, data: bytes) -> None:
+        """
+        Zapisuje dane atomowo: do pliku tymczasowego, a potem podmienia plik docelowy.
+
+        Args:
+            path (str): Ścieżka pliku docelowego
+            data (bytes): Dane do zapisania
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
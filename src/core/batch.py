@@ -0,0 +1,414 @@
+"""
+Silnik wsadowy prowadzący wiele rozdań jednocześnie na tablicach NumPy.
+
+Stan N gier jest przechowywany w tablicach o kształcie (N, ...), a maski
+dozwolonych ruchów dla wszystkich gier są liczone jedną serią operacji
+wektorowych. Ruchy są numerowane stałą przestrzenią akcji (ACTION_COUNT),
+dzięki czemu polityki mogą wybierać akcje dla całej partii gier naraz.
+Zasady są takie same jak w core.tableau, core.stock i core.foundations
+(i w CompactState, z którym silnik wymienia stany).
+"""
+
+import numpy as np
+from typing import Optional
+from core.card import CARD_COUNT, CARD_SUIT, CARD_RANK, RANKS, SUITS
+from core.compact import CompactState
+from core.rules import CAN_STACK, CAN_START_COLUMN
+from core.enums import TransferType
+from core.move import Move, DRAW
+from core.tableau import Tableau
+
+PILE_COUNT = Tableau.PILE_COUNT
+COLUMN_CAPACITY = 19  # 6 zakrytych kart + pełna sekwencja od króla do asa
+
+# Przestrzeń akcji
+TABLEAU_TO_FOUNDATION = 0                                       # + kolumna
+WASTE_TO_FOUNDATION = TABLEAU_TO_FOUNDATION + PILE_COUNT
+TABLEAU_TO_TABLEAU = WASTE_TO_FOUNDATION + 1                    # + źródło * 7 + cel
+WASTE_TO_TABLEAU = TABLEAU_TO_TABLEAU + PILE_COUNT * PILE_COUNT  # + cel
+FOUNDATION_TO_TABLEAU = WASTE_TO_TABLEAU + PILE_COUNT            # + kolor * 7 + cel
+DRAW_ACTION = FOUNDATION_TO_TABLEAU + len(SUITS) * PILE_COUNT
+ACTION_COUNT = DRAW_ACTION + 1
+NO_ACTION = -1  # Akcja pomijająca grę w apply()
+
+# Tablice indeksowane numerem karty + 1, żeby -1 (brak karty) trafiało w wiersz 0
+_SUIT = np.array([0] + CARD_SUIT, dtype=np.intp)
+_RANK = np.array([-1] + CARD_RANK, dtype=np.int8)
+# _STACK[karta + 1, wierzch + 1]: czy kartę można położyć na wierzchu kolumny (wierzch -1 = pusta kolumna)
+_STACK = np.zeros((CARD_COUNT + 1, CARD_COUNT + 1), dtype=bool)
+_STACK[1:, 0] = CAN_START_COLUMN
+_STACK[1:, 1:] = np.array(CAN_STACK, dtype=bool).T
+
+# _FITS[wierzch + 1]: karty (+ 1), które można położyć na wierzchu kolumny, uzupełnione zerami
+_FITS = np.zeros((CARD_COUNT + 1, 4), dtype=np.intp)
+for _top in range(CARD_COUNT + 1):
+    _fitting = np.flatnonzero(_STACK[1:, _top]) + 1
+    _FITS[_top, :len(_fitting)] = _fitting
+
+class BatchState:
+    """
+    Stan N gier zapisany w tablicach NumPy.
+
+    Wartości poza długością stosu (lengths, stock_lengths, waste_lengths)
+    są nieokreślone i nie są nigdy odczytywane.
+
+    Attributes:
+        tableau (np.ndarray): (N, 7, COLUMN_CAPACITY) numery kart od spodu kolumn
+        lengths (np.ndarray): (N, 7) liczba kart w kolumnach
+        hidden (np.ndarray): (N, 7) liczba zakrytych kart na spodzie kolumn
+        stock (np.ndarray): (N, 52) karty talii, wierzch na końcu
+        stock_lengths (np.ndarray): (N,) liczba kart w talii
+        waste (np.ndarray): (N, 52) karty stosu odrzutowego, wierzch na końcu
+        waste_lengths (np.ndarray): (N,) liczba kart na stosie odrzutowym
+        foundations (np.ndarray): (N, 4) liczba kart na fundamencie każdego koloru
+        draw_amounts (np.ndarray): (N,) liczba kart dobieranych naraz
+        difficulties (list[Difficulty]): Poziom trudności każdej gry
+    """
+
+    def __init__(self, size: int):
+        """
+        Tworzy N pustych gier.
+
+        Args:
+            size (int): Liczba gier
+        """
+        self.tableau = np.full((size, PILE_COUNT, COLUMN_CAPACITY), -1, dtype=np.int8)
+        self.lengths = np.zeros((size, PILE_COUNT), dtype=np.int8)
+        self.hidden = np.zeros((size, PILE_COUNT), dtype=np.int8)
+        self.stock = np.full((size, CARD_COUNT), -1, dtype=np.int8)
+        self.stock_lengths = np.zeros(size, dtype=np.int8)
+        self.waste = np.full((size, CARD_COUNT), -1, dtype=np.int8)
+        self.waste_lengths = np.zeros(size, dtype=np.int8)
+        self.foundations = np.zeros((size, len(SUITS)), dtype=np.int8)
+        self.draw_amounts = np.zeros(size, dtype=np.int8)
+        self.difficulties = [None] * size
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @staticmethod
+    def from_states(states: list[CompactState]) -> 'BatchState':
+        """
+        Buduje stan wsadowy z listy zwartych stanów.
+
+        Args:
+            states (list[CompactState]): Stany kolejnych gier
+
+        Returns:
+            BatchState: Stan wsadowy
+
+        Raises:
+            ValueError: Jeśli któraś kolumna nie mieści się w COLUMN_CAPACITY
+        """
+        batch = BatchState(len(states))
+        for n, state in enumerate(states):
+            for i, column in enumerate(state.tableau):
+                if len(column) > COLUMN_CAPACITY:
+                    raise ValueError(f"Column {i} of game {n} has more than {COLUMN_CAPACITY} cards.")
+                batch.tableau[n, i, :len(column)] = column
+                batch.lengths[n, i] = len(column)
+            batch.hidden[n] = state.hidden
+            batch.stock[n, :len(state.stock)] = state.stock
+            batch.stock_lengths[n] = len(state.stock)
+            batch.waste[n, :len(state.waste)] = state.waste
+            batch.waste_lengths[n] = len(state.waste)
+            batch.foundations[n] = state.foundations
+            batch.draw_amounts[n] = state.draw_amount
+            batch.difficulties[n] = state.difficulty
+        return batch
+
+    def to_state(self, n: int) -> CompactState:
+        """
+        Zwraca zwarty stan jednej gry.
+
+        Args:
+            n (int): Numer gry
+
+        Returns:
+            CompactState: Stan gry n
+        """
+        state = CompactState(self.difficulties[n])
+        state.tableau = [self.tableau[n, i, :self.lengths[n, i]].tolist() for i in range(PILE_COUNT)]
+        state.hidden = self.hidden[n].tolist()
+        state.stock = self.stock[n, :self.stock_lengths[n]].tolist()
+        state.waste = self.waste[n, :self.waste_lengths[n]].tolist()
+        state.foundations = self.foundations[n].tolist()
+        state.draw_amount = int(self.draw_amounts[n])
+        return state
+
+    def _tops(self) -> np.ndarray:
+        """
+        Zwraca wierzchnie karty kolumn.
+
+        Returns:
+            np.ndarray: (N, 7) numery kart, -1 dla pustych kolumn
+        """
+        lengths = self.lengths.astype(np.intp)
+        tops = np.take_along_axis(self.tableau, np.maximum(lengths - 1, 0)[..., None], axis=2)[..., 0]
+        return np.where(lengths > 0, tops, -1)
+
+    def _waste_tops(self) -> np.ndarray:
+        """
+        Zwraca wierzchnie karty stosów odrzutowych.
+
+        Returns:
+            np.ndarray: (N,) numery kart, -1 dla pustych stosów
+        """
+        lengths = self.waste_lengths.astype(np.intp)
+        tops = self.waste[np.arange(len(self)), np.maximum(lengths - 1, 0)]
+        return np.where(lengths > 0, tops, -1)
+
+    def _foundable(self, cards: np.ndarray) -> np.ndarray:
+        """
+        Sprawdza czy karty są następne na fundamentach swoich kolorów.
+
+        Args:
+            cards (np.ndarray): (N, ...) numery kart lub -1
+
+        Returns:
+            np.ndarray: Maska o kształcie cards
+        """
+        rows = np.arange(len(self)).reshape((-1,) + (1,) * (cards.ndim - 1))
+        return self.foundations[rows, _SUIT[cards + 1]] == _RANK[cards + 1]
+
+    def _tableau_moves(self, tops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Liczy ruchy między kolumnami tableau dla wszystkich gier.
+
+        Na kolumnę docelową pasują tylko dwie karty (albo cztery króle dla
+        pustej kolumny), więc zamiast porównywać każdą parę kart wystarczy
+        sprawdzić, w której kolumnie i na jakiej głębokości te karty leżą
+        w przenoszalnej sekwencji. Ruch jest w pełni opisany parą
+        (źródło, cel) i głębokością przenoszonej karty.
+
+        Args:
+            tops (np.ndarray): (N, 7) wierzchnie karty kolumn
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Maska (N, 7, 7) i głębokości (N, 7, 7)
+        """
+        size = len(self)
+        positions = np.arange(COLUMN_CAPACITY)
+        in_pile = positions < self.lengths[..., None]
+        cards = self.tableau.astype(np.intp) + 1
+
+        # good[p]: karta p leży poprawnie na karcie p - 1 (albo jest poza stosem)
+        good = np.ones(self.tableau.shape, dtype=bool)
+        good[..., 1:] = _STACK[cards[..., 1:], cards[..., :-1]] | ~in_pile[..., 1:]
+        # tail_ok[p]: wszystkie karty nad p tworzą poprawną sekwencję
+        all_from = np.logical_and.accumulate(good[..., ::-1], axis=2)[..., ::-1]
+        tail_ok = np.ones(self.tableau.shape, dtype=bool)
+        tail_ok[..., :-1] = all_from[..., 1:]
+        movable = in_pile & (positions >= self.hidden[..., None]) & tail_ok
+
+        # Kolumna i głębokość każdej karty, którą można przenieść (-1 gdy nie można)
+        rows, columns, depths = np.nonzero(movable)
+        card_column = np.full((size, CARD_COUNT + 1), -1, dtype=np.intp)
+        card_depth = np.zeros((size, CARD_COUNT + 1), dtype=np.intp)
+        card_column[rows, cards[rows, columns, depths]] = columns
+        card_depth[rows, cards[rows, columns, depths]] = depths
+
+        candidates = _FITS[tops.astype(np.intp) + 1]                       # (N, 7, 4)
+        game = np.arange(size)[:, None, None]
+        sources = card_column[game, candidates]
+        target = np.broadcast_to(np.arange(PILE_COUNT)[None, :, None], sources.shape)
+        found = (sources >= 0) & (sources != target)
+
+        rows, targets, slots = np.nonzero(found)
+        sources = sources[rows, targets, slots]
+        mask = np.zeros((size, PILE_COUNT, PILE_COUNT), dtype=bool)
+        result = np.zeros((size, PILE_COUNT, PILE_COUNT), dtype=np.intp)
+        mask[rows, sources, targets] = True
+        result[rows, sources, targets] = card_depth[rows, candidates[rows, targets, slots]]
+        return mask, result
+
+    def legal_actions(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Liczy maskę dozwolonych akcji dla wszystkich gier.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Maska (N, ACTION_COUNT) oraz
+                głębokości ruchów między kolumnami (N, 7, 7)
+        """
+        size = len(self)
+        tops = self._tops()
+        waste_tops = self._waste_tops()
+        mask = np.zeros((size, ACTION_COUNT), dtype=bool)
+
+        mask[:, TABLEAU_TO_FOUNDATION:WASTE_TO_FOUNDATION] = (tops >= 0) & self._foundable(tops)
+        mask[:, WASTE_TO_FOUNDATION] = (waste_tops >= 0) & self._foundable(waste_tops)
+
+        tableau_mask, depths = self._tableau_moves(tops)
+        mask[:, TABLEAU_TO_TABLEAU:WASTE_TO_TABLEAU] = tableau_mask.reshape(size, -1)
+        mask[:, WASTE_TO_TABLEAU:FOUNDATION_TO_TABLEAU] = _STACK[waste_tops[:, None] + 1, tops + 1]
+
+        counts = self.foundations.astype(np.intp)
+        foundation_tops = np.where(counts > 0, np.arange(len(SUITS)) * len(RANKS) + counts - 1, -1)
+        mask[:, FOUNDATION_TO_TABLEAU:DRAW_ACTION] = \
+            _STACK[foundation_tops[:, :, None] + 1, tops[:, None, :] + 1].reshape(size, -1)
+
+        mask[:, DRAW_ACTION] = (self.stock_lengths > 0) | (self.waste_lengths > 0)
+        return mask, depths
+
+    def _reveal(self, rows: np.ndarray, columns: np.ndarray) -> None:
+        """
+        Odkrywa wierzchnie karty podanych kolumn, jeśli są zakryte.
+
+        Args:
+            rows (np.ndarray): Numery gier
+            columns (np.ndarray): Indeksy kolumn
+        """
+        hidden = self.hidden[rows, columns]
+        covered = (hidden > 0) & (hidden == self.lengths[rows, columns])
+        self.hidden[rows[covered], columns[covered]] -= 1
+
+    def _push(self, rows: np.ndarray, columns: np.ndarray, cards: np.ndarray) -> None:
+        """
+        Kładzie karty na wierzchu kolumn.
+
+        Args:
+            rows (np.ndarray): Numery gier
+            columns (np.ndarray): Indeksy kolumn
+            cards (np.ndarray): Numery kart
+        """
+        self.tableau[rows, columns, self.lengths[rows, columns]] = cards
+        self.lengths[rows, columns] += 1
+
+    def _draw(self, rows: np.ndarray) -> None:
+        """
+        Dobiera karty w podanych grach (jak Stock.draw_cards).
+
+        Args:
+            rows (np.ndarray): Numery gier
+        """
+        recycle = rows[self.stock_lengths[rows] == 0]
+        self.stock[recycle] = self.waste[recycle]
+        self.stock_lengths[recycle] = self.waste_lengths[recycle]
+        self.waste_lengths[recycle] = 0
+
+        for k in range(int(self.draw_amounts[rows].max(initial=0))):
+            active = rows[(k < self.draw_amounts[rows]) & (self.stock_lengths[rows] > 0)]
+            self.stock_lengths[active] -= 1
+            self.waste[active, self.waste_lengths[active]] = self.stock[active, self.stock_lengths[active]]
+            self.waste_lengths[active] += 1
+
+    def apply(self, actions: np.ndarray, depths: Optional[np.ndarray] = None) -> None:
+        """
+        Wykonuje po jednej akcji w każdej grze, bez sprawdzania poprawności.
+
+        Args:
+            actions (np.ndarray): (N,) akcje dozwolone według legal_actions()
+                lub NO_ACTION dla gier, które mają stać w miejscu
+            depths (np.ndarray, optional): Głębokości zwrócone przez
+                legal_actions() dla tego samego stanu; None liczy je od nowa
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        every = np.arange(len(self))
+        tops = self._tops()
+
+        rows = every[(actions >= TABLEAU_TO_FOUNDATION) & (actions < WASTE_TO_FOUNDATION)]
+        if len(rows):
+            columns = actions[rows] - TABLEAU_TO_FOUNDATION
+            self.foundations[rows, _SUIT[tops[rows, columns] + 1]] += 1
+            self.lengths[rows, columns] -= 1
+            self._reveal(rows, columns)
+
+        rows = every[actions == WASTE_TO_FOUNDATION]
+        if len(rows):
+            self.foundations[rows, _SUIT[self._waste_tops()[rows] + 1]] += 1
+            self.waste_lengths[rows] -= 1
+
+        rows = every[(actions >= TABLEAU_TO_TABLEAU) & (actions < WASTE_TO_TABLEAU)]
+        if len(rows):
+            sources, targets = np.divmod(actions[rows] - TABLEAU_TO_TABLEAU, PILE_COUNT)
+            if depths is None:
+                depths = self._tableau_moves(tops)[1]
+            depths = depths[rows, sources, targets]
+            counts = self.lengths[rows, sources] - depths
+            for k in range(int(counts.max())):
+                moving = k < counts
+                self._push(rows[moving], targets[moving], self.tableau[rows[moving], sources[moving], depths[moving] + k])
+            self.lengths[rows, sources] = depths
+            self._reveal(rows, sources)
+
+        rows = every[(actions >= WASTE_TO_TABLEAU) & (actions < FOUNDATION_TO_TABLEAU)]
+        if len(rows):
+            self._push(rows, actions[rows] - WASTE_TO_TABLEAU, self._waste_tops()[rows])
+            self.waste_lengths[rows] -= 1
+
+        rows = every[(actions >= FOUNDATION_TO_TABLEAU) & (actions < DRAW_ACTION)]
+        if len(rows):
+            suits, targets = np.divmod(actions[rows] - FOUNDATION_TO_TABLEAU, PILE_COUNT)
+            self.foundations[rows, suits] -= 1
+            self._push(rows, targets, suits * len(RANKS) + self.foundations[rows, suits])
+
+        rows = every[actions == DRAW_ACTION]
+        if len(rows):
+            self._draw(rows)
+
+    def moves(self, n: int, mask: np.ndarray, depths: np.ndarray) -> list[Move]:
+        """
+        Zamienia dozwolone akcje jednej gry na ruchy.
+
+        Args:
+            n (int): Numer gry
+            mask (np.ndarray): Maska akcji zwrócona przez legal_actions()
+            depths (np.ndarray): Głębokości zwrócone przez legal_actions()
+
+        Returns:
+            list[Move]: Ruchy gry n w kolejności numerów akcji
+        """
+        moves = []
+        tops = self._tops()[n]
+        for action in np.flatnonzero(mask[n]):
+            if action < WASTE_TO_FOUNDATION:
+                column = action - TABLEAU_TO_FOUNDATION
+                moves.append(Move(TransferType.TABLEAU, column, int(self.lengths[n, column]) - 1,
+                                  TransferType.FOUNDATION, CARD_SUIT[tops[column]]))
+            elif action == WASTE_TO_FOUNDATION:
+                card = self.waste[n, self.waste_lengths[n] - 1]
+                moves.append(Move(TransferType.STOCK, 0, 0, TransferType.FOUNDATION, CARD_SUIT[card]))
+            elif action < WASTE_TO_TABLEAU:
+                source, target = divmod(action - TABLEAU_TO_TABLEAU, PILE_COUNT)
+                moves.append(Move(TransferType.TABLEAU, source, int(depths[n, source, target]),
+                                  TransferType.TABLEAU, target))
+            elif action < FOUNDATION_TO_TABLEAU:
+                moves.append(Move(TransferType.STOCK, 0, 0, TransferType.TABLEAU, action - WASTE_TO_TABLEAU))
+            elif action < DRAW_ACTION:
+                suit, target = divmod(action - FOUNDATION_TO_TABLEAU, PILE_COUNT)
+                moves.append(Move(TransferType.FOUNDATION, suit, 0, TransferType.TABLEAU, target))
+            else:
+                moves.append(DRAW)
+        return moves
+
+    def is_won(self) -> np.ndarray:
+        """
+        Sprawdza, które gry są wygrane.
+
+        Returns:
+            np.ndarray: (N,) maska wygranych gier
+        """
+        return self.foundations.sum(axis=1) == CARD_COUNT
+
+def action_for_move(move: Move) -> int:
+    """
+    Zamienia ruch na numer akcji.
+
+    Args:
+        move (Move): Ruch zwrócony np. przez CompactState.legal_moves()
+
+    Returns:
+        int: Numer akcji w przestrzeni ACTION_COUNT
+    """
+    source, source_index, _, target, target_index = move
+    if move.is_draw:
+        return DRAW_ACTION
+    if target == TransferType.FOUNDATION:
+        if source == TransferType.TABLEAU:
+            return TABLEAU_TO_FOUNDATION + source_index
+        return WASTE_TO_FOUNDATION
+    if source == TransferType.TABLEAU:
+        return TABLEAU_TO_TABLEAU + source_index * PILE_COUNT + target_index
+    if source == TransferType.STOCK:
+        return WASTE_TO_TABLEAU + target_index
+    return FOUNDATION_TO_TABLEAU + source_index * PILE_COUNT + target_index
@@ -1,124 +1,188 @@
 """
 Definicja klasy Card reprezentującej kartę do gry oraz funkcji pomocniczych.
 Zawiera logikę porównywania kart i operacji na nich.
+
+Istnieją dokładnie 52 obiekty Card, tworzone raz przy imporcie modułu.
+Karty są niezmienne, więc stosy i kopie gry mogą je współdzielić, a dwie
+karty są równe tylko wtedy, gdy są tym samym obiektem. To, czy karta leży
+zakryta, zapisuje stos (Pile), a nie sama karta.
 """
 
 from core.enums import Suit, Rank, Color
 from core.randomizer import get_random_suit, get_random_rank
 
+SUITS = list(Suit)
+RANKS = list(Rank)
+CARD_COUNT = len(SUITS) * len(RANKS)
+
+# Tablice wyliczone raz dla wszystkich 52 kart
+CARD_SUIT = [index // len(RANKS) for index in range(CARD_COUNT)]
+CARD_RANK = [index % len(RANKS) for index in range(CARD_COUNT)]
+CARD_RED = [SUITS[suit] in (Suit.HEARTS, Suit.DIAMONDS) for suit in CARD_SUIT]
+CARD_COLOR = [Color.RED if red else Color.BLACK for red in CARD_RED]
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+
 class Card:
     """
     Reprezentuje pojedynczą kartę do gry.
-    
-    Zawiera informacje o kolorze, randze i czy karta jest ukryta.
-    Udostępnia metody do porównywania kart i operacji na nich.
+
+    Zawiera kolor i rangę karty oraz wyliczone z góry numer karty, kolor
+    (czerwony/czarny) i skróconą nazwę. Udostępnia metody do porównywania
+    kart i operacji na nich.
+
+    Konstruktor nie tworzy nowych obiektów - Card(suit, rank) zwraca
+    jedną z 52 współdzielonych kart.
     """
-    
-    def __init__(self, suit: Suit, rank: Rank, hidden: bool = False):
+
+    __slots__ = ("suit", "rank", "index", "color", "short_name")
+
+    def __new__(cls, suit: Suit, rank: Rank):
         """
-        Inicjalizuje nową kartę.
-        
+        Zwraca współdzieloną kartę o podanym kolorze i randze.
+
         Args:
             suit (Suit): Kolor karty (kier, karo, trefl, pik)
             rank (Rank): Ranga karty (As, 2-10, Walet, Dama, Król)
-            hidden (bool): Czy karta jest ukryta (domyślnie False)
+
+        Returns:
+            Card: Jedna z 52 kart
         """
-        self.suit = suit
-        self.rank = rank
-        self.hidden = hidden
+        return CARDS[SUIT_INDEX[suit] * len(RANKS) + rank.value]
+
+    @classmethod
+    def _build(cls, index: int) -> 'Card':
+        card = object.__new__(cls)
+        suit, rank = SUITS[CARD_SUIT[index]], RANKS[CARD_RANK[index]]
+        for name, value in (("suit", suit), ("rank", rank), ("index", index),
+                            ("color", CARD_COLOR[index]), ("short_name", rank.short_name() + str(suit))):
+            object.__setattr__(card, name, value)
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are immutable")
+
+    def __reduce__(self):
+        # Zapisywane i kopiowane karty wracają jako te same współdzielone obiekty
+        return index_card, (self.index,)
+
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo) -> 'Card':
+        return self
 
     def is_rank_higher(self, other_card: 'Card') -> bool:
         """
         Sprawdza czy ranga tej karty jest wyższa od innej karty.
-        
+
         Args:
             other_card (Card): Karta do porównania
-            
+
         Returns:
             bool: True jeśli ranga tej karty jest wyższa
         """
         return self.rank.value > other_card.rank.value
-    
+
     def is_same_suit(self, other_card: 'Card') -> bool:
         """
         Sprawdza czy ta karta ma ten sam kolor co inna karta.
-        
+
         Args:
             other_card (Card): Karta do porównania
-            
+
         Returns:
             bool: True jeśli karty mają ten sam kolor
         """
         return self.suit == other_card.suit
-    
+
     def is_same_color(self, other_card: 'Card') -> bool:
         """
         Sprawdza czy ta karta ma ten sam kolor (czerwony/czarny) co inna karta.
-        
+
         Args:
             other_card (Card): Karta do porównania
-            
+
         Returns:
             bool: True jeśli karty mają ten sam kolor (czerwony/czarny)
         """
-        return self.get_color() == other_card.get_color()
-    
+        return self.color is other_card.color
+
     def get_color(self):
         """
         Zwraca kolor karty (czerwony lub czarny).
-        
+
         Returns:
             Color: RED dla kier i karo, BLACK dla trefl i pik
         """
-        return Color.RED if self.suit in [Suit.HEARTS, Suit.DIAMONDS] else Color.BLACK
+        return self.color
 
     def __str__(self):
         """
         Zwraca tekstową reprezentację karty.
-        
+
         Returns:
-            str: Opis karty w formacie "Ranga of Kolor (KOLOR)" lub "??? of ????? (HIDDEN)"
+            str: Opis karty w formacie "Ranga of Kolor (KOLOR)"
         """
-        if self.hidden:
-            return "??? of ????? (HIDDEN)"
-        return f"{self.rank.name} of {self.suit.name} ({self.get_color().name})"
+        return f"{self.rank.name} of {self.suit.name} ({self.color.name})"
+
+    def __repr__(self):
+        return f"Card({self.short_name})"
 
     def clone(self) -> 'Card':
         """
-        Tworzy kopię karty.
-        
+        Zwraca kartę - karty są niezmienne, więc kopia jest tym samym obiektem.
+
         Returns:
-            Card: Nowa karta z takimi samymi właściwościami
+            Card: Ta sama karta
         """
-        card = Card(self.suit, self.rank)
-        card.hidden = self.hidden
-        return card
-    
+        return self
+
     def copy(self) -> 'Card':
         """
-        Alias dla clone() - tworzy kopię karty.
-        
+        Alias dla clone().
+
         Returns:
-            Card: Nowa karta z takimi samymi właściwościami
+            Card: Ta sama karta
         """
-        return self.clone()
-    
-def create_card(suit=None, rank=None, hidden=False) -> Card:
+        return self
+
+CARDS = tuple(Card._build(index) for index in range(CARD_COUNT))
+
+def create_card(suit=None, rank=None) -> Card:
     """
-    Tworzy nową kartę z opcjonalnymi parametrami.
-    
+    Zwraca kartę o podanym kolorze i randze.
+
     Jeśli kolor lub ranga nie są podane, zostaną wygenerowane losowo.
-    
+
     Args:
         suit (Suit, optional): Kolor karty. Jeśli None, zostanie wylosowany
         rank (Rank, optional): Ranga karty. Jeśli None, zostanie wylosowana
-        hidden (bool): Czy karta ma być ukryta (domyślnie False)
-        
+
+    Returns:
+        Card: Karta z podanymi lub wylosowanymi właściwościami
+    """
+    return Card(suit or get_random_suit(), rank or get_random_rank())
+
+def card_index(card: Card) -> int:
+    """
+    Zamienia kartę na jej numer 0..51.
+
+    Args:
+        card (Card): Karta do zakodowania
+
+    Returns:
+        int: Numer karty (kolor * 13 + ranga)
+    """
+    return card.index
+
+def index_card(index: int) -> Card:
+    """
+    Zwraca kartę o podanym numerze.
+
+    Args:
+        index (int): Numer karty 0..51
+
     Returns:
-        Card: Nowa karta z podanymi lub wylosowanymi właściwościami
+        Card: Karta odpowiadająca numerowi
     """
-    return Card(
-        suit or get_random_suit(),
-        rank or get_random_rank(),
-        hidden=hidden
-    )
\ No newline at end of file
+    return CARDS[index]
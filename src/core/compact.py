@@ -0,0 +1,363 @@
+"""
+Zwarta reprezentacja stanu gry oparta na liczbach całkowitych.
+
+Karta jest liczbą 0..51 (kolor * 13 + ranga), a tableau, talia, stos
+odrzutowy i fundamenty są małymi listami liczb. Stan można zbudować
+z SolitareGame i przenieść z powrotem, a ruchy (Move) są zgodne z tymi,
+które wykonuje SolitareGame, więc narzędzia wsadowe mogą liczyć na
+CompactState, a interfejs dalej korzysta z obiektów Card i Pile.
+"""
+
+from core.card import (Card, SUITS, RANKS, CARD_COUNT, CARD_SUIT, CARD_RANK, CARD_RED, CARD_COLOR,
+                       SUIT_INDEX, card_index, index_card)
+from core.enums import Suit, Rank, Color, Difficulty, TransferType
+from core.difficulty import get_draw_amount
+from core.move import Move, DRAW
+from core.pile_part import create_pile
+from core.tableau import Tableau
+from core.rules import KING, CAN_STACK, CAN_START_COLUMN, STACKABLE_ON, KINGS, OPPOSITE_SUITS
+
+_TABLEAU = TransferType.TABLEAU
+_STOCK = TransferType.STOCK
+_FOUNDATION = TransferType.FOUNDATION
+
+class CompactState:
+    """
+    Stan gry zapisany w listach liczb całkowitych.
+
+    Ukryte karty w kolumnie tableau zawsze tworzą jej spód, dlatego dla
+    każdej kolumny pamiętana jest tylko ich liczba.
+
+    Attributes:
+        tableau (list[list[int]]): Kolumny tableau od spodu do wierzchu
+        hidden (list[int]): Liczba zakrytych kart na spodzie każdej kolumny
+        stock (list[int]): Talia - karty dobierane są z końca listy
+        waste (list[int]): Stos odrzutowy - wierzchnia karta jest na końcu
+        foundations (list[int]): Liczba kart na fundamencie każdego koloru
+        difficulty (Difficulty): Poziom trudności gry
+        draw_amount (int): Liczba kart dobieranych naraz
+    """
+
+    __slots__ = ("tableau", "hidden", "stock", "waste", "foundations", "difficulty", "draw_amount")
+
+    def __init__(self, difficulty: Difficulty = Difficulty.HARD):
+        """
+        Inicjalizuje pusty stan gry.
+
+        Args:
+            difficulty (Difficulty): Poziom trudności gry
+        """
+        self.tableau = [[] for _ in range(Tableau.PILE_COUNT)]
+        self.hidden = [0] * Tableau.PILE_COUNT
+        self.stock = []
+        self.waste = []
+        self.foundations = [0] * len(SUITS)
+        self.difficulty = difficulty
+        self.draw_amount = get_draw_amount(difficulty)
+
+    @classmethod
+    def from_game(cls, game) -> 'CompactState':
+        """
+        Buduje zwarty stan na podstawie gry.
+
+        Args:
+            game (SolitareGame): Gra do zakodowania
+
+        Returns:
+            CompactState: Stan odpowiadający grze
+        """
+        state = cls(game.difficulty)
+        for i, pile in enumerate(game.tableau.piles):
+            if pile is None:
+                continue
+            state.tableau[i] = [card_index(card) for card in pile]
+            state.hidden[i] = pile.first_face_up()
+        state.stock = [card_index(card) for card in game.stock.stock_cards()]
+        state.waste = [card_index(card) for card in game.stock.waste_cards()]
+        for suit, foundation in game.foundations.foundations.items():
+            state.foundations[SUIT_INDEX[suit]] = len(foundation.as_list())
+        return state
+
+    def restore(self, game) -> None:
+        """
+        Przenosi ten stan do istniejącej gry, zastępując jej karty.
+
+        Args:
+            game (SolitareGame): Gra, której stosy zostaną nadpisane
+        """
+        game.difficulty = self.difficulty
+        for i, column in enumerate(self.tableau):
+            game.tableau.piles[i] = create_pile(*[index_card(card) for card in column], hidden=self.hidden[i])
+        game.stock.set_piles([index_card(card) for card in self.stock], [index_card(card) for card in self.waste])
+        for suit_index, count in enumerate(self.foundations):
+            suit = SUITS[suit_index]
+            cards = [index_card(suit_index * len(RANKS) + rank) for rank in range(count)]
+            game.foundations.foundations[suit].pile = create_pile(*cards)
+        game.rehash()
+
+    def to_game(self, transfer_listener=None):
+        """
+        Tworzy nową grę SolitareGame w tym stanie.
+
+        Args:
+            transfer_listener (Callable[[Time], None], optional): Nasłuchiwacz transferów
+
+        Returns:
+            SolitareGame: Gra odpowiadająca temu stanowi
+        """
+        from core.game import SolitareGame  # game buduje rozdania przez core.deal, który importuje ten moduł
+        game = SolitareGame(self.difficulty, transfer_listener)
+        self.restore(game)
+        return game
+
+    def copy(self) -> 'CompactState':
+        """
+        Tworzy niezależną kopię stanu.
+
+        Returns:
+            CompactState: Kopia stanu
+        """
+        state = CompactState.__new__(CompactState)
+        state.tableau = [column[:] for column in self.tableau]
+        state.hidden = self.hidden[:]
+        state.stock = self.stock[:]
+        state.waste = self.waste[:]
+        state.foundations = self.foundations[:]
+        state.difficulty = self.difficulty
+        state.draw_amount = self.draw_amount
+        return state
+
+    def can_stack(self, card: int, column: int) -> bool:
+        """
+        Sprawdza czy kartę można położyć na kolumnie tableau.
+
+        Args:
+            card (int): Numer karty
+            column (int): Indeks kolumny
+
+        Returns:
+            bool: True jeśli ruch jest zgodny z zasadami
+        """
+        pile = self.tableau[column]
+        if not pile:
+            return CAN_START_COLUMN[card]
+        return CAN_STACK[pile[-1]][card]
+
+    def can_found(self, card: int) -> bool:
+        """
+        Sprawdza czy kartę można położyć na jej fundamencie.
+
+        Args:
+            card (int): Numer karty
+
+        Returns:
+            bool: True jeśli karta jest następna na fundamencie swojego koloru
+        """
+        return self.foundations[CARD_SUIT[card]] == CARD_RANK[card]
+
+    def is_safe_to_found(self, card: int) -> bool:
+        """
+        Sprawdza czy położenie karty na fundamencie nie może zaszkodzić.
+
+        Karta jest bezpieczna, gdy żadna karta przeciwnego koloru nie będzie
+        jej już potrzebować w tableau - asy i dwójki zawsze, wyższe karty gdy
+        oba fundamenty przeciwnego koloru sięgają rangi o jeden niższej.
+
+        Args:
+            card (int): Numer karty
+
+        Returns:
+            bool: True jeśli kartę można bezpiecznie położyć na fundamencie
+        """
+        if not self.can_found(card):
+            return False
+        rank = CARD_RANK[card]
+        if rank <= 1:
+            return True
+        foundations = self.foundations
+        return all(foundations[suit] >= rank for suit in OPPOSITE_SUITS[CARD_SUIT[card]])
+
+    def _movable_depth(self, column: int) -> int:
+        """
+        Zwraca najmniejszą głębokość, od której karty tworzą poprawną sekwencję.
+
+        Args:
+            column (int): Indeks kolumny
+
+        Returns:
+            int: Głębokość pierwszej karty najdłuższej przenoszalnej sekwencji
+        """
+        pile = self.tableau[column]
+        depth = len(pile) - 1
+        limit = self.hidden[column]
+        while depth > limit and CAN_STACK[pile[depth - 1]][pile[depth]]:
+            depth -= 1
+        return depth
+
+    def legal_moves(self) -> list[Move]:
+        """
+        Zwraca wszystkie ruchy dozwolone w tym stanie.
+
+        Kolejność: ruchy na fundamenty, ruchy w obrębie tableau, ruchy ze
+        stosu odrzutowego, ruchy z fundamentów i na końcu dobranie kart.
+
+        Returns:
+            list[Move]: Lista dozwolonych ruchów
+        """
+        moves = []
+        tableau = self.tableau
+        columns = range(len(tableau))
+
+        # Dla każdej karty: kolumny, na których można ją położyć
+        targets = {}
+        for j in columns:
+            pile = tableau[j]
+            for card in (STACKABLE_ON[pile[-1]] if pile else KINGS):
+                targets.setdefault(card, []).append(j)
+
+        for i in columns:
+            pile = tableau[i]
+            if pile and self.can_found(pile[-1]):
+                moves.append(Move(_TABLEAU, i, len(pile) - 1, _FOUNDATION, CARD_SUIT[pile[-1]]))
+        if self.waste and self.can_found(self.waste[-1]):
+            moves.append(Move(_STOCK, 0, 0, _FOUNDATION, CARD_SUIT[self.waste[-1]]))
+
+        for i in columns:
+            pile = tableau[i]
+            if not pile:
+                continue
+            for depth in range(self._movable_depth(i), len(pile)):
+                for j in targets.get(pile[depth], ()):
+                    if j != i:
+                        moves.append(Move(_TABLEAU, i, depth, _TABLEAU, j))
+
+        if self.waste:
+            for j in targets.get(self.waste[-1], ()):
+                moves.append(Move(_STOCK, 0, 0, _TABLEAU, j))
+
+        for suit, count in enumerate(self.foundations):
+            if count == 0:
+                continue
+            for j in targets.get(suit * len(RANKS) + count - 1, ()):
+                moves.append(Move(_FOUNDATION, suit, 0, _TABLEAU, j))
+
+        if self.stock or self.waste:
+            moves.append(DRAW)
+        return moves
+
+    def is_legal(self, move: Move) -> bool:
+        """
+        Sprawdza czy ruch jest dozwolony, bez wyliczania wszystkich ruchów.
+
+        Wynik jest taki sam jak sprawdzenie `move in legal_moves()`, ale
+        koszt zależy tylko od głębokości przenoszonej sekwencji. Postać ruchu
+        sprawdza Move.is_well_formed(), wspólne z SolitareGame.can_apply_move().
+
+        Args:
+            move (Move): Ruch do sprawdzenia
+
+        Returns:
+            bool: True jeśli ruch jest zgodny z zasadami
+        """
+        if not move.is_well_formed():
+            return False
+        source, source_index, depth, target, target_index = move
+        if source == _STOCK:
+            if target == _STOCK:
+                return bool(self.stock or self.waste)
+            if not self.waste:
+                return False
+            card = self.waste[-1]
+        elif source == _TABLEAU:
+            pile = self.tableau[source_index]
+            if not self.hidden[source_index] <= depth < len(pile):
+                return False
+            if target == _FOUNDATION and depth != len(pile) - 1:
+                return False
+            if depth < self._movable_depth(source_index):
+                return False
+            card = pile[depth]
+        else:
+            if not self.foundations[source_index]:
+                return False
+            card = source_index * len(RANKS) + self.foundations[source_index] - 1
+
+        if target == _FOUNDATION:
+            return target_index == CARD_SUIT[card] and self.can_found(card)
+        return self.can_stack(card, target_index)
+
+    def _reveal(self, column: int) -> None:
+        """
+        Odkrywa wierzchnią kartę kolumny, jeśli jest zakryta.
+
+        Args:
+            column (int): Indeks kolumny
+        """
+        if self.hidden[column] and self.hidden[column] == len(self.tableau[column]):
+            self.hidden[column] -= 1
+
+    def draw(self) -> None:
+        """
+        Dobiera karty z talii na stos odrzutowy.
+
+        Jeśli talia jest pusta, najpierw przenosi do niej stos odrzutowy
+        (tak jak Stock.draw_cards).
+        """
+        if not self.stock:
+            if not self.waste:
+                return
+            self.stock = self.waste
+            self.waste = []
+        stock = self.stock
+        waste = self.waste
+        for _ in range(self.draw_amount):
+            if not stock:
+                break
+            waste.append(stock.pop())
+
+    def apply_move(self, move: Move) -> None:
+        """
+        Wykonuje ruch bez sprawdzania jego poprawności.
+
+        Args:
+            move (Move): Ruch zwrócony przez legal_moves()
+        """
+        source, source_index, depth, target, target_index = move
+        if source == _STOCK:
+            if target == _STOCK:
+                self.draw()
+                return
+            cards = [self.waste.pop()]
+        elif source == _TABLEAU:
+            pile = self.tableau[source_index]
+            cards = pile[depth:]
+            del pile[depth:]
+            self._reveal(source_index)
+        else:
+            self.foundations[source_index] -= 1
+            cards = [source_index * len(RANKS) + self.foundations[source_index]]
+
+        if target == _TABLEAU:
+            self.tableau[target_index].extend(cards)
+        else:
+            self.foundations[CARD_SUIT[cards[0]]] += 1
+
+    def is_won(self) -> bool:
+        """
+        Sprawdza czy wszystkie karty leżą na fundamentach.
+
+        Returns:
+            bool: True jeśli gra jest wygrana
+        """
+        return sum(self.foundations) == CARD_COUNT
+
+    def key(self) -> bytes:
+        """
+        Zwraca klucz pozycji niezależny od kolejności kolumn tableau.
+
+        Returns:
+            bytes: Klucz nadający się do tablic transpozycji
+        """
+        columns = sorted([bytes([hidden, len(column), *column]) for hidden, column in zip(self.hidden, self.tableau)])
+        columns.append(bytes([len(self.stock), *self.stock, len(self.waste), *self.waste, *self.foundations]))
+        return b"".join(columns)
@@ -0,0 +1,91 @@
+"""
+Deterministyczne rozdania identyfikowane numerem.
+
+Numer rozdania (64-bitowa liczba) wyznacza kolejność talii przez
+prywatny generator random.Random, więc to samo ziarno zawsze daje to samo
+rozdanie, niezależnie od globalnego stanu modułu random. Z tego samego
+układu korzystają SolitareGame i CompactState.
+"""
+
+import random
+from core.compact import CompactState, CARD_COUNT
+from core.difficulty import get_draw_amount
+from core.enums import Difficulty
+from core.tableau import Tableau
+
+DEAL_NUMBER_BITS = 64  # Numery rozdań należą do zakresu 0 .. 2**64 - 1
+
+def new_deal_number() -> int:
+    """
+    Losuje numer nowego rozdania z systemowego źródła losowości.
+
+    Returns:
+        int: Losowy numer rozdania
+    """
+    return random.SystemRandom().getrandbits(DEAL_NUMBER_BITS)
+
+def shuffled_deck(deal_number: int) -> list[int]:
+    """
+    Zwraca potasowaną talię dla danego numeru rozdania.
+
+    Args:
+        deal_number (int): Numer rozdania (ziarno)
+
+    Returns:
+        list[int]: Numery kart 0..51 w kolejności rozdawania
+
+    Raises:
+        ValueError: Jeśli numer rozdania nie mieści się w 64 bitach
+    """
+    if not 0 <= deal_number < 1 << DEAL_NUMBER_BITS:
+        raise ValueError(f"Deal number must be in range 0..2**{DEAL_NUMBER_BITS} - 1, got {deal_number}.")
+    order = list(range(CARD_COUNT))
+    random.Random(deal_number).shuffle(order)
+    return order
+
+def deal_layout(deal_number: int) -> tuple[list[list[int]], list[int]]:
+    """
+    Rozkłada potasowaną talię na kolumny tableau i talię.
+
+    Kolumna i dostaje i + 1 kolejnych kart (ostatnia z nich jest odkryta),
+    pozostałe karty trafiają do talii w tej samej kolejności.
+
+    Args:
+        deal_number (int): Numer rozdania (ziarno)
+
+    Returns:
+        tuple[list[list[int]], list[int]]: Kolumny tableau od spodu i karty talii
+    """
+    order = shuffled_deck(deal_number)
+    columns = []
+    position = 0
+    for i in range(Tableau.PILE_COUNT):
+        columns.append(order[position:position + i + 1])
+        position += i + 1
+    return columns, order[position:]
+
+def deal_compact(deal_number: int, difficulty: Difficulty = Difficulty.HARD) -> CompactState:
+    """
+    Tworzy zwarty stan początkowy rozdania.
+
+    Karty są rozkładane tak jak w SolitareGame: kolumna i dostaje i + 1 kart,
+    z których tylko ostatnia jest odkryta, reszta trafia do talii, a na
+    koniec wykonywane jest pierwsze dobranie kart.
+
+    Args:
+        deal_number (int): Numer rozdania (ziarno)
+        difficulty (Difficulty): Poziom trudności gry
+
+    Returns:
+        CompactState: Stan początkowy rozdania
+    """
+    columns, stock = deal_layout(deal_number)
+    state = CompactState(difficulty)
+    for i, column in enumerate(columns):
+        state.tableau[i] = column
+        state.hidden[i] = i
+    state.stock = stock
+    # SolitareGame._setup_game dobiera karty z domyślnym poziomem trudności
+    for _ in range(get_draw_amount(Difficulty.HARD)):
+        state.waste.append(state.stock.pop())
+    return state
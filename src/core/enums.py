@@ -175,4 +175,19 @@ class Time(Enum):
     """
     POST_MOVE = "post_move"  # Po wykonaniu ruchu
     PRE_MOVE = "pre_move"    # Przed wykonaniem ruchu
-    
\ No newline at end of file
+
+class ReplayAction(Enum):
+    """
+    Enum reprezentujący rodzaje kroków zapisanych w powtórce.
+    """
+    MOVE = 0  # Wykonanie ruchu
+    UNDO = 1  # Cofnięcie ostatniego ruchu
+    REDO = 2  # Ponowienie cofniętego ruchu
+
+class SolveStatus(Enum):
+    """
+    Enum reprezentujący wynik przeszukiwania solvera.
+    """
+    WON = "won"                # Znaleziono wygrywającą sekwencję ruchów
+    UNWINNABLE = "unwinnable"  # Przeszukano wszystkie pozycje bez wygranej
+    UNKNOWN = "unknown"        # Przekroczono limit węzłów lub czasu
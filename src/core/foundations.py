@@ -1,21 +1,23 @@
 from core.enums import Suit, Rank, TransferType
 from core.pile_part import create_pile
+from core import zobrist
+from core.card import SUITS, SUIT_INDEX
+from core.rules import NEXT_FOUNDATION
 
 class Foundation:
     def __init__(self, type: Suit):
         self.type = type
         self.pile = None    
+        self._next = NEXT_FOUNDATION[SUIT_INDEX[type]]
         
     def can_place_card(self, card):
-        if self.pile is None:
-            return card.rank == Rank.ACE and card.suit == self.type
-        return card.suit == self.type and card.rank.value == self.pile.get_last().get_card().rank.value + 1    
+        return self._next[len(self.pile) if self.pile else 0] == card.index
     
     def is_finished(self):
         if self.pile is None:
             return False
         
-        return self.pile.get_last().get_card().rank == Rank.KING and self.pile.length() == len(Rank)
+        return len(self.pile) == len(Rank) and self.pile.top().rank == Rank.KING
     
     def copy(self):
         new_foundation = Foundation(self.type)
@@ -36,6 +38,8 @@ class Foundation:
 class Foundations:
     def __init__(self):
         self.foundations = {suit: Foundation(suit) for suit in Suit}
+        self._hash = 0
+        self._card_count = 0
 
     def can_place_card(self, card):
         foundation = self.foundations.get(card.suit)
@@ -48,6 +52,8 @@ class Foundations:
         if foundation is None:
             return False
         if foundation.can_place_card(card):
+            self._toggle_count(card, card.rank.value)
+            self._card_count += 1
             if foundation.pile is None:
                 foundation.pile = create_pile(card)
             else:
@@ -68,48 +74,62 @@ class Foundations:
         new_foundations = Foundations()
         for suit, foundation in self.foundations.items():
             new_foundations.foundations[suit] = foundation.copy()
+        new_foundations._hash = self._hash
+        new_foundations._card_count = self._card_count
         return new_foundations
 
+    def _toggle_count(self, card, count: int):
+        """Moves the hash of the card's foundation between count and count + 1 cards"""
+        keys = zobrist.FOUNDATION_KEYS[SUIT_INDEX[card.suit]]
+        self._hash ^= keys[count] ^ keys[count + 1]
+
+    def rehash(self):
+        """Recomputes the Zobrist hash and card count after the piles were changed directly"""
+        counts = [len(foundation.pile or ()) for foundation in self.foundations.values()]
+        self._hash = zobrist.foundations_hash(counts)
+        self._card_count = sum(counts)
+
+    def card_count(self):
+        """Number of cards on all foundations"""
+        return self._card_count
+
+    def zobrist_hash(self) -> int:
+        return self._hash
+
     def get_top_card(self, target_index: int):
         """Get the top card from foundation at target_index (0-3 for suits)"""
-        suits = list(Suit)
-        if 0 <= target_index < len(suits):
-            foundation = self.foundations[suits[target_index]]
+        if 0 <= target_index < len(SUITS):
+            foundation = self.foundations[SUITS[target_index]]
             if foundation.pile:
-                return foundation.pile.get_last().get_card()
+                return foundation.pile.top()
         return None
 
+    def get_count(self, target_index: int):
+        """Number of cards on the foundation at target_index (0-3 for suits)"""
+        pile = self.foundations[SUITS[target_index]].pile
+        return len(pile) if pile else 0
+
     def place_card(self, card):
         """Place a card on the appropriate foundation"""
         return self.attempt_place_card(card)
 
     def place_top_card(self, target_index: int):
         """Remove the top card from foundation at target_index"""
-        suits = list(Suit)
-        if 0 <= target_index < len(suits):
-            foundation = self.foundations[suits[target_index]]
+        if 0 <= target_index < len(SUITS):
+            foundation = self.foundations[SUITS[target_index]]
             if foundation.pile:
-                if foundation.pile.next is None:
-                    # Only one card, remove the pile
-                    card = foundation.pile.get_card()
+                card = foundation.pile.pop()
+                if not foundation.pile:
                     foundation.pile = None
-                    return card
-                else:
-                    # Multiple cards, remove the last one
-                    # Find second to last
-                    current = foundation.pile
-                    while current.next.next:
-                        current = current.next
-                    card = current.next.get_card()
-                    current.next = None
-                    return card
+                self._toggle_count(card, card.rank.value)
+                self._card_count -= 1
+                return card
         return None
 
     def can_place_card_on_foundation(self, card, target_index: int):
         """Check if card can be placed on foundation at target_index"""
-        suits = list(Suit)
-        if 0 <= target_index < len(suits):
-            foundation = self.foundations[suits[target_index]]
+        if 0 <= target_index < len(SUITS):
+            foundation = self.foundations[SUITS[target_index]]
             return foundation.can_place_card(card)
         return False
 
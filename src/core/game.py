@@ -6,15 +6,18 @@ gry takie jak tableau, stock, fundamenty i system transferu kart.
 """
 
 from core.tableau import Tableau
-from core.card import Card, create_card
-from core.difficulty import Difficulty
+from core.card import Card, CARD_COUNT, SUITS, SUIT_INDEX, create_card, index_card
+from core.difficulty import Difficulty, get_draw_amount
 from core.stock import Stock
 from core.foundations import Foundations
-from core.enums import Suit, Rank, Color, TransferContext, Time
+from core.enums import Suit, Rank, Color, TransferContext, TransferType, Time
 from core.transfer import Transfer, TableauTransfer, StockTransfer, FoundationTransfer
 from core.pile_part import create_pile
-from time import time
-import random 
+from core.move import Move, DRAW
+from core.journal import Journal, JournalEntry
+from core.deal import deal_layout, new_deal_number
+from core import zobrist
+from core.rules import CAN_STACK, CAN_START_COLUMN, OPPOSITE_SUITS
 from typing import Callable, Optional, Union
 
 class SolitareGame:
@@ -31,9 +34,12 @@ class SolitareGame:
         foundations (Foundations): Stosy finałowe podzielone według kolorów
         difficulty (Difficulty): Poziom trudności gry
         transfer_listener (Callable): Funkcja nasłuchująca transferów kart
+        deal_number (int): Numer rozdania, z którego powstała gra
+        journal (Journal): Dziennik wykonanych ruchów do cofania i ponawiania
     """
     
-    def __init__(self, difficulty: Difficulty, transfer_listener: Callable[[Time], None]):
+    def __init__(self, difficulty: Difficulty, transfer_listener: Callable[[Time], None],
+                 deal_number: Optional[int] = None):
         """
         Inicjalizuje nową grę pasjans.
         
@@ -41,35 +47,31 @@ class SolitareGame:
             difficulty (Difficulty): Poziom trudności gry
             transfer_listener (Callable[[Time], None]): Funkcja wywoływana 
                 przed i po każdym ruchu kart
+            deal_number (int, optional): 64-bitowy numer rozdania; ta sama
+                liczba zawsze daje ten sam układ kart. Jeśli None, zostanie wylosowany
         """
         self.tableau = Tableau()
-        self.stock = Stock()
         self.foundations = Foundations()
         self.difficulty = difficulty
         self.transfer_listener = transfer_listener
-
-        random.seed(time())
+        self.journal = Journal()
+        self.deal_number = new_deal_number() if deal_number is None else deal_number
 
         self._setup_game()
 
     def _assemble_tableau(self):
         """
-        Układa karty na tableau zgodnie z regułami pasjansa.
+        Układa karty rozdania na tableau i w talii.
         
-        Rozdaje karty z stock do stosów tableau - pierwszy stos otrzymuje 1 kartę,
-        drugi 2 karty, trzeci 3 karty itd. Wszystkie karty oprócz ostatniej
-        w każdym stosie są ukryte.
+        Układ pochodzi z deal_layout(): pierwszy stos otrzymuje 1 kartę,
+        drugi 2 karty, trzeci 3 karty itd., a reszta trafia prosto do talii,
+        bez budowania i tasowania pełnej talii. Wszystkie karty oprócz
+        ostatniej w każdym stosie są ukryte.
         """
-        for i in range(Tableau.PILE_COUNT):
-            for j in range(i + 1):
-                card = self.stock.remove_random_card()
-                if card:
-                    card.hidden = (j != i)
-                    if self.tableau.piles[i] is None:
-
-                        self.tableau.piles[i] = create_pile(card)
-                    else:
-                        self.tableau.piles[i].add_card(card)
+        columns, stock = deal_layout(self.deal_number)
+        for i, column in enumerate(columns):
+            self.tableau.piles[i] = create_pile(*[index_card(card) for card in column], hidden=i)
+        self.stock = Stock([index_card(card) for card in stock])
 
     def _setup_game(self):
         """
@@ -78,25 +80,41 @@ class SolitareGame:
         Układa karty na tableau i przygotowuje stock do gry.
         """
         self._assemble_tableau()
+        self.tableau.rehash()
         self.stock.draw_cards()    
         
-    def _patch_difficulty(self, source: Transfer, target: Transfer):
+    def _transfer_move(self, source: Transfer, target: Transfer) -> Optional[Move]:
         """
-        Aplikuje poziom trudności do obiektów transferu.
-        
+        Zamienia parę obiektów transferu na ruch.
+
+        Karta kładziona na fundament zawsze trafia na fundament swojego
+        koloru, niezależnie od tego, który fundament wskazuje cel.
+
         Args:
             source (Transfer): Źródłowy obiekt transferu
             target (Transfer): Docelowy obiekt transferu
+
+        Returns:
+            Move | None: Odpowiadający ruch lub None, gdy transferu nie da się wyrazić ruchem
         """
-        source.difficulty = self.difficulty
-        target.difficulty = self.difficulty    
-    
+        origin = source.source()
+        destination = target.destination()
+        if origin is None or destination is None:
+            return None
+        move = Move(*origin, *destination)
+        if move.target == TransferType.FOUNDATION:
+            card = self._moved_card(move)
+            if card is None:
+                return None
+            move = move._replace(target_index=SUIT_INDEX[card.suit])
+        return move
+
     def transfer(self, source: Transfer, target: Transfer) -> bool:
         """
         Wykonuje transfer kart między stosami.
         
-        Sprawdza czy transfer jest możliwy, wykonuje go jeśli tak,
-        i powiadamia nasłuchiwacza o ruchu.
+        Transfer jest zamieniany na ruch (Move) i wykonywany przez
+        apply_move(), bez tworzenia ofert i domknięć.
         
         Args:
             source (Transfer): Źródłowy obiekt transferu
@@ -105,21 +123,8 @@ class SolitareGame:
         Returns:
             bool: True jeśli transfer został wykonany pomyślnie, False w przeciwnym razie
         """
-        self._patch_difficulty(source, target)
-
-        if isinstance(source, TableauTransfer) and source.source_index >= 0:
-            if source.tableau.piles[source.source_index] is None:
-                return False
-
-        offer = source.create_offer(target.get_type())
-        if offer is None:
-            return False
-        if not target.verify_offer(offer):
-            return False
-        self.transfer_listener(Time.PRE_MOVE)
-        offer.complete()
-        self.transfer_listener(Time.POST_MOVE)
-        return True
+        move = self._transfer_move(source, target)
+        return move is not None and self.apply_move(move)
     
     def can_transfer(self, source: Transfer, target: Transfer) -> bool:
         """
@@ -132,11 +137,342 @@ class SolitareGame:
         Returns:
             bool: True jeśli transfer jest możliwy, False w przeciwnym razie
         """
-        self._patch_difficulty(source, target)
-        offer = source.create_offer(target.get_type())
-        if offer is None:
+        move = self._transfer_move(source, target)
+        return move is not None and self.can_apply_move(move)
+
+    def _tableau_targets(self, card: Card, tops: list[Optional[Card]], skip: int = -1) -> list[int]:
+        """
+        Zwraca indeksy stosów tableau, na których można położyć kartę.
+
+        Args:
+            card (Card): Karta do położenia
+            tops (list[Optional[Card]]): Wierzchnie karty stosów (None dla pustych)
+            skip (int): Indeks stosu źródłowego, który należy pominąć
+
+        Returns:
+            list[int]: Indeksy stosów docelowych
+        """
+        index = card.index
+        return [j for j, top in enumerate(tops)
+                if j != skip and (CAN_START_COLUMN[index] if top is None else CAN_STACK[top.index][index])]
+
+    def legal_moves(self) -> list[Move]:
+        """
+        Zwraca wszystkie dozwolone ruchy w jednym przejściu po planszy.
+
+        Ruchy są zwracane w tej samej kolejności co CompactState.legal_moves():
+        na fundamenty, w obrębie tableau, ze stosu odrzutowego, z fundamentów
+        i na końcu dobranie kart. Nie są tworzone obiekty Transfer.
+
+        Returns:
+            list[Move]: Lista dozwolonych ruchów
+        """
+        moves = []
+        piles = [pile.as_list() if pile else [] for pile in self.tableau.piles]
+        tops = [cards[-1] if cards else None for cards in piles]
+        waste_top = self.stock.get_top_waste_card()
+
+        for i, top in enumerate(tops):
+            if top is not None and self.foundations.can_place_card(top):
+                moves.append(Move(TransferType.TABLEAU, i, len(piles[i]) - 1, TransferType.FOUNDATION, SUIT_INDEX[top.suit]))
+        if waste_top is not None and self.foundations.can_place_card(waste_top):
+            moves.append(Move(TransferType.STOCK, 0, 0, TransferType.FOUNDATION, SUIT_INDEX[waste_top.suit]))
+
+        for i, cards in enumerate(piles):
+            if not cards:
+                continue
+            face_up = self.tableau.piles[i].first_face_up()
+            depth = len(cards) - 1
+            while depth > face_up and CAN_STACK[cards[depth - 1].index][cards[depth].index]:
+                depth -= 1
+            for depth in range(max(depth, face_up), len(cards)):
+                for j in self._tableau_targets(cards[depth], tops, skip=i):
+                    moves.append(Move(TransferType.TABLEAU, i, depth, TransferType.TABLEAU, j))
+
+        if waste_top is not None:
+            for j in self._tableau_targets(waste_top, tops):
+                moves.append(Move(TransferType.STOCK, 0, 0, TransferType.TABLEAU, j))
+
+        for i in range(len(SUITS)):
+            card = self.foundations.get_top_card(i)
+            if card is not None:
+                for j in self._tableau_targets(card, tops):
+                    moves.append(Move(TransferType.FOUNDATION, i, 0, TransferType.TABLEAU, j))
+
+        if self.stock.can_draw():
+            moves.append(DRAW)
+        return moves
+
+    def _moved_card(self, move: Move) -> Optional[Card]:
+        """
+        Zwraca pierwszą kartę, którą przenosi ruch.
+
+        Args:
+            move (Move): Ruch (nie może być dobraniem kart)
+
+        Returns:
+            Card | None: Przenoszona karta lub None jeśli źródło jest puste
+        """
+        if move.source == TransferType.TABLEAU:
+            pile = self.tableau.get_pile(move.source_index)
+            return pile.card_at(move.depth) if pile and 0 <= move.depth < len(pile) else None
+        if move.source == TransferType.STOCK:
+            return self.stock.get_top_waste_card()
+        return self.foundations.get_top_card(move.source_index)
+
+    def can_apply_move(self, move: Move) -> bool:
+        """
+        Sprawdza czy ruch jest dozwolony bez jego wykonywania.
+
+        Ruch musi być dokładnie taki, jaki zwraca legal_moves(): postać ruchu
+        sprawdza Move.is_well_formed() (to samo sprawdzenie wykonuje
+        CompactState.is_legal()), a indeks fundamentu musi odpowiadać
+        kolorowi karty.
+
+        Args:
+            move (Move): Ruch do sprawdzenia
+
+        Returns:
+            bool: True jeśli ruch jest zgodny z zasadami gry
+        """
+        if not move.is_well_formed():
             return False
-        return target.verify_offer(offer)
+        if move.is_draw:
+            return self.stock.can_draw()
+
+        card = self._moved_card(move)
+        if card is None:
+            return False
+        if move.source == TransferType.TABLEAU:
+            if self.tableau.get_pile(move.source_index).is_face_down(move.depth):
+                return False
+            if not self.tableau.can_move_sequence(move.source_index, move.depth):
+                return False
+
+        if move.target == TransferType.TABLEAU:
+            return self.tableau.can_place_card(card, move.target_index)
+        if move.source == TransferType.TABLEAU and move.depth != self.tableau.get_pile_size(move.source_index) - 1:
+            return False
+        return move.target_index == SUIT_INDEX[card.suit] and self.foundations.can_place_card(card)
+
+    def _perform(self, move: Move) -> JournalEntry:
+        """
+        Wykonuje sprawdzony ruch bezpośrednio na stosach gry.
+
+        Args:
+            move (Move): Dozwolony ruch
+
+        Returns:
+            JournalEntry: Rekord pozwalający cofnąć ruch
+        """
+        if move.is_draw:
+            recycled = self.stock.get_remaining_cards() == 0
+            drawn = self.stock.draw_cards(self.difficulty)
+            return JournalEntry(move, len(drawn), recycled=recycled)
+
+        count, revealed = 1, False
+        if move.source == TransferType.TABLEAU:
+            count = self.tableau.get_pile_size(move.source_index) - move.depth
+            if move.depth > 0:
+                revealed = self.tableau.get_pile(move.source_index).is_face_down(move.depth - 1)
+            if move.target == TransferType.TABLEAU:
+                self.tableau.move_pile(move.source_index, move.target_index, move.depth)
+                return JournalEntry(move, count, revealed)
+            card = self.tableau.remove_top_card(move.source_index)
+        elif move.source == TransferType.STOCK:
+            card = self.stock.draw_top_card_from_waste()
+        else:
+            card = self.foundations.place_top_card(move.source_index)
+
+        if move.target == TransferType.TABLEAU:
+            self.tableau.place_card(card, move.target_index)
+        else:
+            self.foundations.attempt_place_card(card)
+        return JournalEntry(move, count, revealed)
+
+    def _revert(self, entry: JournalEntry) -> None:
+        """
+        Odwraca ruch zapisany w dzienniku.
+
+        Karty są zdejmowane ze stosu docelowego i odkładane na źródłowy bez
+        sprawdzania zasad, a odkryta przez ruch karta jest ponownie zakrywana.
+
+        Args:
+            entry (JournalEntry): Rekord ruchu do odwrócenia
+        """
+        move = entry.move
+        if move.is_draw:
+            self.stock.undraw_cards(entry.count, entry.recycled)
+            return
+
+        if move.target == TransferType.TABLEAU:
+            depth = self.tableau.get_pile_size(move.target_index) - entry.count
+            part = self.tableau.detach_pile(move.target_index, depth)
+        else:
+            part = create_pile(self.foundations.place_top_card(move.target_index))
+
+        if move.source == TransferType.TABLEAU:
+            if entry.revealed:
+                self.tableau.hide_top_card(move.source_index)
+            self.tableau.attach_pile(part, move.source_index)
+        elif move.source == TransferType.STOCK:
+            self.stock.return_to_waste(part.get_card())
+        else:
+            self.foundations.attempt_place_card(part.get_card())
+
+    def apply_move(self, move: Move) -> bool:
+        """
+        Wykonuje ruch zwrócony przez legal_moves().
+
+        Ruch jest sprawdzany przed wykonaniem, a nasłuchiwacz transferów
+        (jeśli jest ustawiony) jest powiadamiany tak samo jak przy transfer().
+
+        Args:
+            move (Move): Ruch do wykonania
+
+        Returns:
+            bool: True jeśli ruch był dozwolony i został wykonany
+        """
+        if not self.can_apply_move(move):
+            return False
+        if self.transfer_listener:
+            self.transfer_listener(Time.PRE_MOVE)
+        self.journal.record(self._perform(move))
+        if self.transfer_listener:
+            self.transfer_listener(Time.POST_MOVE)
+        return True
+
+    def is_safe_to_found(self, card: Card) -> bool:
+        """
+        Sprawdza czy położenie karty na fundamencie nie może zaszkodzić.
+
+        Karta jest bezpieczna, gdy żadna karta przeciwnego koloru nie będzie
+        jej już potrzebować w tableau - asy i dwójki zawsze, wyższe karty gdy
+        oba fundamenty przeciwnego koloru sięgają rangi o jeden niższej.
+        Zasada jest ta sama co w CompactState.is_safe_to_found().
+
+        Args:
+            card (Card): Karta do sprawdzenia
+
+        Returns:
+            bool: True jeśli kartę można bezpiecznie położyć na fundamencie
+        """
+        if not self.foundations.can_place_card(card):
+            return False
+        rank = card.rank.value
+        return rank <= 1 or all(self.foundations.get_count(suit) >= rank
+                                for suit in OPPOSITE_SUITS[SUIT_INDEX[card.suit]])
+
+    def safe_foundation_move(self) -> Optional[Move]:
+        """
+        Zwraca bezpieczny ruch na fundament z wierzchu tableau lub stosu odrzutowego.
+
+        Returns:
+            Move | None: Pierwszy bezpieczny ruch lub None, gdy takiego nie ma
+        """
+        for i, pile in enumerate(self.tableau.piles):
+            if pile and not pile.is_face_down(len(pile) - 1) and self.is_safe_to_found(pile.top()):
+                return Move(TransferType.TABLEAU, i, len(pile) - 1,
+                            TransferType.FOUNDATION, SUIT_INDEX[pile.top().suit])
+        card = self.stock.get_top_waste_card()
+        if card is not None and self.is_safe_to_found(card):
+            return Move(TransferType.STOCK, 0, 0, TransferType.FOUNDATION, SUIT_INDEX[card.suit])
+        return None
+
+    def auto_complete(self) -> list[tuple[Move, Card]]:
+        """
+        Kładzie na fundamentach wszystkie karty, które można tam bezpiecznie przenieść.
+
+        Ruchy są wykonywane jeden po drugim, dopóki pojawiają się nowe
+        bezpieczne ruchy, i każdy trafia do dziennika (można je cofać
+        pojedynczo). Nasłuchiwacz transferów jest powiadamiany tylko raz,
+        przed pierwszym i po ostatnim ruchu całej serii. Dobieranie kart
+        z talii nie jest częścią serii.
+
+        Returns:
+            list[tuple[Move, Card]]: Wykonane ruchy wraz z przeniesionymi kartami
+        """
+        done = []
+        move = self.safe_foundation_move()
+        if move is None:
+            return done
+        if self.transfer_listener:
+            self.transfer_listener(Time.PRE_MOVE)
+        while move is not None:
+            card = self._moved_card(move)
+            self.journal.record(self._perform(move))
+            done.append((move, card))
+            move = self.safe_foundation_move()
+        if self.transfer_listener:
+            self.transfer_listener(Time.POST_MOVE)
+        return done
+
+    def rehash(self) -> None:
+        """
+        Przelicza od zera hashe Zobrista i liczniki kart wszystkich stosów.
+
+        Potrzebne tylko po bezpośredniej zmianie stosów (np. przy
+        odtwarzaniu stanu) - zwykłe ruchy aktualizują hashe na bieżąco.
+        """
+        self.tableau.rehash()
+        self.stock.rehash()
+        self.foundations.rehash()
+
+    def zobrist_hash(self) -> int:
+        """
+        Zwraca hash Zobrista aktualnej pozycji w czasie stałym.
+
+        Hash jest aktualizowany przyrostowo przy każdym ruchu, dobraniu
+        kart i odkryciu karty, więc nie wymaga przechodzenia po stosach.
+
+        Returns:
+            int: 64-bitowy hash pozycji
+        """
+        return (self.tableau.zobrist_hash() ^ self.stock.zobrist_hash()
+                ^ self.foundations.zobrist_hash() ^ zobrist.DIFFICULTY_KEYS[get_draw_amount(self.difficulty)])
+
+    def canonical_key(self) -> int:
+        """
+        Zwraca kanoniczny klucz pozycji do tablic transpozycji i pamięci podpowiedzi.
+
+        Klucz nie zależy od kolejności kolumn tableau, więc pozycje różniące
+        się tylko tym, która kolumna jest pusta lub gdzie leży dana kolumna,
+        mają ten sam klucz.
+
+        Returns:
+            int: 64-bitowy klucz pozycji
+        """
+        return (self.tableau.canonical_hash() ^ self.stock.zobrist_hash()
+                ^ self.foundations.zobrist_hash() ^ zobrist.DIFFICULTY_KEYS[get_draw_amount(self.difficulty)])
+
+    def undo(self) -> bool:
+        """
+        Cofa ostatni ruch zapisany w dzienniku.
+
+        Koszt zależy tylko od liczby kart przenoszonych przez ruch, a liczba
+        możliwych cofnięć nie jest ograniczona.
+
+        Returns:
+            bool: True jeśli ruch został cofnięty, False gdy nie ma czego cofać
+        """
+        entry = self.journal.pop_undo()
+        if entry is None:
+            return False
+        self._revert(entry)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Ponawia ostatnio cofnięty ruch.
+
+        Returns:
+            bool: True jeśli ruch został ponowiony, False gdy nie ma czego ponawiać
+        """
+        entry = self.journal.pop_redo()
+        if entry is None:
+            return False
+        self._perform(entry.move)
+        return True
 
     def get_difficulty(self) -> Difficulty:
         """
@@ -148,31 +484,54 @@ class SolitareGame:
     
     def copy(self) -> 'SolitareGame':
         """
-        Tworzy głęboką kopię gry.
-        
+        Tworzy niezależną kopię gry.
+
+        Kopia nie rozdaje kart od nowa, a stosy, talia i dziennik współdzielą
+        dane z oryginałem do pierwszej zmiany (kopiowanie przy zapisie), więc
+        koszt zależy tylko od liczby stosów.
+
         Returns:
             SolitareGame: Nowa instancja gry będąca kopią aktualnej
         """
-        new_game = SolitareGame(self.difficulty, self.transfer_listener)
+        new_game = SolitareGame.__new__(SolitareGame)
+        new_game.difficulty = self.difficulty
+        new_game.transfer_listener = self.transfer_listener
+        new_game.deal_number = self.deal_number
         new_game.tableau = self.tableau.copy()
         new_game.stock = self.stock.copy()
         new_game.foundations = self.foundations.copy()
+        new_game.journal = self.journal.copy()
         return new_game
     
     def has_won(self) -> bool:
         """
         Sprawdza czy gracz wygrał grę.
-        
-        Gra jest wygrana gdy wszystkie stosy są poprawnie ułożone:
-        - Tableau: wszystkie stosy są puste lub posortowane
-        - Fundamenty: wszystkie stosy są kompletne i posortowane
-        - Stock: jest pusty
-        
+
+        Gra jest wygrana gdy wszystkie 52 karty leżą na fundamentach. Licznik
+        kart na fundamentach jest aktualizowany przy każdym ruchu, więc
+        sprawdzenie działa w czasie stałym.
+
         Returns:
             bool: True jeśli gra została wygrana, False w przeciwnym razie
         """
-        tableau_complete = all(pile is None or pile.is_sorted() for pile in self.tableau.piles)
-        foundations_complete = all(foundation.is_sorted() for foundation in self.foundations.get_all())
-        stock_complete = self.stock.is_empty()
+        return self.foundations.card_count() == CARD_COUNT
+
+    def all_revealed(self) -> bool:
+        """
+        Sprawdza czy w tableau nie ma już zakrytych kart.
+
+        Karty w talii i na stosie odrzutowym mogą jeszcze czekać na dobranie.
+
+        Returns:
+            bool: True jeśli wszystkie karty tableau są odkryte
+        """
+        return self.tableau.hidden_count() == 0
 
-        return tableau_complete and foundations_complete and stock_complete
\ No newline at end of file
+    def progress(self) -> float:
+        """
+        Zwraca postęp gry jako część kart położonych na fundamentach.
+
+        Returns:
+            float: Wartość od 0.0 (początek gry) do 1.0 (wygrana)
+        """
+        return self.foundations.card_count() / CARD_COUNT
@@ -0,0 +1,161 @@
+"""
+Dziennik ruchów do nieograniczonego cofania i ponawiania.
+
+Zamiast kopii całej gry dziennik przechowuje dla każdego ruchu krótki
+rekord: sam ruch, liczbę przeniesionych kart oraz informację, czy ruch
+odkrył kartę albo przełożył stos odrzutowy z powrotem do talii. To
+wystarcza, żeby odwrócić ruch w czasie proporcjonalnym do jego rozmiaru.
+"""
+
+from typing import NamedTuple, Optional
+from core.move import Move
+
+class JournalEntry(NamedTuple):
+    """
+    Rekord pojedynczego wykonanego ruchu.
+
+    Attributes:
+        move (Move): Wykonany ruch
+        count (int): Liczba przeniesionych (lub dobranych) kart
+        revealed (bool): Czy ruch odkrył kartę w stosie źródłowym tableau
+        recycled (bool): Czy dobranie przełożyło stos odrzutowy do talii
+    """
+    move: Move
+    count: int = 1
+    revealed: bool = False
+    recycled: bool = False
+
+class Journal:
+    """
+    Historia ruchów z osobnymi stosami do cofania i ponawiania.
+
+    Zapisanie nowego ruchu czyści stos ponawiania, tak jak w edytorach.
+    """
+
+    def __init__(self):
+        """
+        Inicjalizuje pusty dziennik.
+        """
+        self._done = []
+        self._undone = []
+        self._shared = False
+
+    def _own(self) -> None:
+        """
+        Zapewnia dziennikowi własne listy ruchów przed ich zmianą.
+        """
+        if self._shared:
+            self._done = self._done.copy()
+            self._undone = self._undone.copy()
+            self._shared = False
+
+    def record(self, entry: JournalEntry) -> None:
+        """
+        Zapisuje nowo wykonany ruch.
+
+        Args:
+            entry (JournalEntry): Rekord ruchu
+        """
+        self._own()
+        self._done.append(entry)
+        self._undone.clear()
+
+    def can_undo(self) -> bool:
+        """
+        Sprawdza czy jest ruch do cofnięcia.
+
+        Returns:
+            bool: True jeśli dziennik zawiera wykonane ruchy
+        """
+        return bool(self._done)
+
+    def can_redo(self) -> bool:
+        """
+        Sprawdza czy jest ruch do ponowienia.
+
+        Returns:
+            bool: True jeśli jakiś ruch został cofnięty
+        """
+        return bool(self._undone)
+
+    def pop_undo(self) -> Optional[JournalEntry]:
+        """
+        Zdejmuje ostatni wykonany ruch i przenosi go na stos ponawiania.
+
+        Returns:
+            JournalEntry | None: Rekord ruchu do odwrócenia lub None
+        """
+        if not self._done:
+            return None
+        self._own()
+        entry = self._done.pop()
+        self._undone.append(entry)
+        return entry
+
+    def pop_redo(self) -> Optional[JournalEntry]:
+        """
+        Zdejmuje ostatnio cofnięty ruch i przenosi go z powrotem do historii.
+
+        Returns:
+            JournalEntry | None: Rekord ruchu do ponowienia lub None
+        """
+        if not self._undone:
+            return None
+        self._own()
+        entry = self._undone.pop()
+        self._done.append(entry)
+        return entry
+
+    def entries(self) -> list[JournalEntry]:
+        """
+        Zwraca wykonane ruchy od najstarszego.
+
+        Returns:
+            list[JournalEntry]: Kopia historii ruchów
+        """
+        return self._done.copy()
+
+    def undone_entries(self) -> list[JournalEntry]:
+        """
+        Zwraca cofnięte ruchy w kolejności, w jakiej zostały cofnięte.
+
+        Returns:
+            list[JournalEntry]: Kopia stosu ponawiania (ostatni element jest ponawiany jako pierwszy)
+        """
+        return self._undone.copy()
+
+    @classmethod
+    def from_entries(cls, done: list[JournalEntry], undone: list[JournalEntry] = ()) -> 'Journal':
+        """
+        Odtwarza dziennik z zapisanych rekordów.
+
+        Args:
+            done (list[JournalEntry]): Wykonane ruchy od najstarszego
+            undone (list[JournalEntry]): Cofnięte ruchy jak z undone_entries()
+
+        Returns:
+            Journal: Dziennik z podaną historią
+        """
+        journal = cls()
+        journal._done = list(done)
+        journal._undone = list(undone)
+        return journal
+
+    def copy(self) -> 'Journal':
+        """
+        Tworzy kopię dziennika w czasie stałym.
+
+        Rekordy są niezmienne, a listy ruchów są współdzielone do pierwszej
+        zmiany któregoś z dzienników.
+
+        Returns:
+            Journal: Nowy dziennik z tą samą historią
+        """
+        new_journal = Journal()
+        new_journal._done = self._done
+        new_journal._undone = self._undone
+        new_journal._shared = self._shared = True
+        return new_journal
+
+    def __len__(self) -> int:
+        return len(self._done)
@@ -0,0 +1,77 @@
+"""
+Definicja rekordu ruchu używanego przez silniki gry.
+
+Ruch opisuje skąd (rodzaj obszaru, indeks, głębokość) i dokąd
+(rodzaj obszaru, indeks) przenoszone są karty. Dobranie kart z talii
+jest zapisywane jako ruch ze STOCK do STOCK.
+"""
+
+from typing import NamedTuple
+from core.enums import Suit, TransferType
+
+TABLEAU_PILES = 7             # Liczba kolumn tableau
+FOUNDATION_PILES = len(Suit)  # Liczba fundamentów (po jednym na kolor)
+
+class Move(NamedTuple):
+    """
+    Pojedynczy ruch w grze.
+
+    Attributes:
+        source (TransferType): Obszar, z którego pochodzą karty
+        source_index (int): Indeks stosu źródłowego (tableau lub fundament)
+        depth (int): Głębokość pierwszej przenoszonej karty w stosie tableau
+        target (TransferType): Obszar docelowy
+        target_index (int): Indeks stosu docelowego (tableau lub fundament)
+    """
+    source: TransferType
+    source_index: int
+    depth: int
+    target: TransferType
+    target_index: int
+
+    @property
+    def is_draw(self) -> bool:
+        """
+        Sprawdza czy ruch jest dobraniem kart z talii.
+
+        Returns:
+            bool: True jeśli źródłem i celem jest talia
+        """
+        return self.source == TransferType.STOCK and self.target == TransferType.STOCK
+
+    def is_well_formed(self) -> bool:
+        """
+        Sprawdza czy ruch ma postać, w jakiej zwracają go legal_moves().
+
+        Indeksy muszą mieścić się w zakresie, pola nieużywane przez dany
+        rodzaj ruchu muszą być zerowe, a ruch nie może kończyć się w tej
+        samej kolumnie ani zaczynać na fundamencie i na nim kończyć.
+        Sprawdzenie nie zależy od kart, więc SolitareGame.can_apply_move()
+        i CompactState.is_legal() zaczynają od niego i różnią się tylko
+        sposobem odczytu kart.
+
+        Returns:
+            bool: True jeśli ruch jest poprawnie zbudowany
+        """
+        source, source_index, depth, target, target_index = self
+        if source == TransferType.STOCK:
+            if source_index or depth:
+                return False
+            if target == TransferType.STOCK:
+                return target_index == 0
+        elif source == TransferType.TABLEAU:
+            if not 0 <= source_index < TABLEAU_PILES or depth < 0:
+                return False
+        elif source == TransferType.FOUNDATION:
+            if depth or target != TransferType.TABLEAU or not 0 <= source_index < FOUNDATION_PILES:
+                return False
+        else:
+            return False
+
+        if target == TransferType.TABLEAU:
+            return 0 <= target_index < TABLEAU_PILES and not (source == TransferType.TABLEAU and target_index == source_index)
+        if target == TransferType.FOUNDATION:
+            return 0 <= target_index < FOUNDATION_PILES
+        return False
+
+DRAW = Move(TransferType.STOCK, 0, 0, TransferType.STOCK, 0)  # Dobranie kart z talii
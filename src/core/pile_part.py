@@ -1,158 +1,287 @@
 """
-Implementacja struktury danych dla reprezentacji stosu kart jako listy powiązanej.
-Każdy PilePart reprezentuje jeden element w stosie kart.
+Implementacja stosu kart przechowującego karty w tablicy.
+
+Pile pamięta swoje karty od spodu do wierzchu oraz liczbę zakrytych kart
+na spodzie. Same karty są niezmienne i nie wiedzą, czy leżą zakryte.
+Dzięki temu wierzchnia karta, rozmiar, dokładanie i zdejmowanie kart
+działają w czasie stałym, a odcięcie sekwencji kosztuje tylko tyle, ile
+kart jest przenoszonych.
+
+Kopia stosu współdzieli listę kart z oryginałem (kopiowanie przy zapisie):
+lista jest kopiowana dopiero przy pierwszej zmianie któregoś z nich, więc
+kopia całej gry nie przepisuje kart z niezmienionych stosów.
 """
 
+from typing import Iterable, Iterator, Optional
 from core.card import Card
 
-class PilePart:
+class Pile:
     """
-    Reprezentuje pojedynczy element w stosie kart zaimplementowanym jako lista powiązana.
-    
-    Każdy PilePart zawiera kartę i referencję do następnego elementu w stosie.
-    Zapewnia funkcjonalność do manipulacji i przeszukiwania stosu kart.
+    Reprezentuje stos kart (kolumnę tableau lub fundament).
+
+    Karty są zapisane od spodu (indeks 0) do wierzchu. Zakryte karty zawsze
+    tworzą spód stosu, więc wystarczy pamiętać indeks pierwszej odkrytej karty.
     """
-    
-    def __init__(self, card: Card, next: 'PilePart' = None):
+
+    def __init__(self, cards: Iterable[Card] = (), hidden: int = 0):
         """
-        Inicjalizuje nowy element stosu kart.
-        
+        Inicjalizuje nowy stos kart.
+
         Args:
-            card (Card): Karta przypisana do tego elementu
-            next (PilePart, optional): Następny element w stosie
+            cards (Iterable[Card]): Karty od spodu do wierzchu stosu
+            hidden (int): Liczba zakrytych kart na spodzie stosu
+        """
+        self._cards = list(cards)
+        self._first_face_up = max(0, min(hidden, len(self._cards)))
+        self._shared = False
+
+    def _own(self):
+        """
+        Zapewnia stosowi własną listę kart przed jej zmianą.
         """
-        self._card = card
-        self.next = next
+        if self._shared:
+            self._cards = self._cards.copy()
+            self._shared = False
 
     def get_card(self) -> Card:
         """
-        Zwraca kartę przypisaną do tego elementu.
-        
+        Zwraca kartę leżącą na spodzie stosu.
+
+        Returns:
+            Card: Pierwsza karta stosu
+        """
+        return self._cards[0]
+
+    def top(self) -> Card:
+        """
+        Zwraca wierzchnią kartę stosu.
+
+        Returns:
+            Card: Ostatnia karta stosu
+        """
+        return self._cards[-1]
+
+    def card_at(self, depth: int) -> Card:
+        """
+        Zwraca kartę na określonej głębokości.
+
+        Args:
+            depth (int): Głębokość karty (0 = spód stosu)
+
+        Returns:
+            Card: Karta na podanej głębokości
+        """
+        return self._cards[depth]
+
+    def first_face_up(self) -> int:
+        """
+        Zwraca głębokość pierwszej odkrytej karty (równą liczbie zakrytych kart).
+
+        Returns:
+            int: Indeks pierwszej odkrytej karty lub długość stosu, gdy wszystkie są zakryte
+        """
+        return self._first_face_up
+
+    def is_face_down(self, depth: int) -> bool:
+        """
+        Sprawdza czy karta na podanej głębokości leży zakryta.
+
+        Args:
+            depth (int): Głębokość karty (0 = spód stosu)
+
         Returns:
-            Card: Karta w tym elemencie stosu
+            bool: True jeśli karta jest zakryta
         """
-        return self._card
+        return depth < self._first_face_up
 
     def add_card(self, card: Card):
         """
-        Dodaje nową kartę na koniec stosu.
-        
+        Kładzie odkrytą kartę na wierzchu stosu.
+
+        Args:
+            card (Card): Karta do dodania
+        """
+        self._own()
+        self._cards.append(card)
+
+    def pop(self) -> Card:
+        """
+        Zdejmuje wierzchnią kartę ze stosu.
+
+        Returns:
+            Card: Zdjęta karta
+        """
+        self._own()
+        card = self._cards.pop()
+        self._first_face_up = min(self._first_face_up, len(self._cards))
+        return card
+
+    def split(self, depth: int) -> 'Pile':
+        """
+        Odcina karty od podanej głębokości do wierzchu.
+
+        Args:
+            depth (int): Głębokość pierwszej odcinanej karty
+
+        Returns:
+            Pile: Nowy stos z odciętymi kartami
+        """
+        part = Pile.__new__(Pile)
+        part._cards = self._cards[depth:]
+        part._first_face_up = max(self._first_face_up - depth, 0)
+        part._shared = False
+        if self._shared:
+            self._cards = self._cards[:depth]
+            self._shared = False
+        else:
+            del self._cards[depth:]
+        self._first_face_up = min(self._first_face_up, depth)
+        return part
+
+    def extend(self, other: 'Pile'):
+        """
+        Kładzie na wierzchu wszystkie karty innego stosu.
+
+        Args:
+            other (Pile): Stos do dołożenia
+        """
+        if self._first_face_up == len(self._cards):
+            self._first_face_up += other._first_face_up
+        self._own()
+        self._cards.extend(other._cards)
+
+    def set_top_hidden(self, hidden: bool) -> bool:
+        """
+        Zakrywa lub odkrywa wierzchnią kartę.
+
+        Zakryć można tylko kartę leżącą tuż nad zakrytymi, a odkryć tylko
+        wtedy, gdy cały stos jest zakryty.
+
         Args:
-            card (Card): Karta do dodania na koniec stosu
+            hidden (bool): Czy karta ma być zakryta
+
+        Returns:
+            bool: True jeśli stan karty się zmienił
         """
-        last = self.get_last()
-        last.next = PilePart(card)
+        top = len(self._cards) - 1
+        if hidden and self._first_face_up == top:
+            self._first_face_up = top + 1
+            return True
+        if not hidden and self._first_face_up == top + 1 and top >= 0:
+            self._first_face_up = top
+            return True
+        return False
 
-    def get_at_depth(self, depth: int) -> 'PilePart | None':
+    def get_at_depth(self, depth: int) -> 'Pile | None':
         """
-        Zwraca element stosu na określonej głębokości.
-        
+        Zwraca kopię części stosu od określonej głębokości.
+
         Args:
-            depth (int): Głębokość elementu (0 = pierwszy element)
-            
+            depth (int): Głębokość pierwszej karty (0 = spód stosu)
+
         Returns:
-            PilePart | None: Element na określonej głębokości lub None
+            Pile | None: Karty od podanej głębokości do wierzchu lub None
         """
-        current = self
-        for _ in range(depth):
-            if current is None:
-                return None
-            current = current.next
-        return current
+        if not 0 <= depth < len(self._cards):
+            return None
+        return Pile(self._cards[depth:], self._first_face_up - depth)
 
-    def get_last(self) -> 'PilePart':
+    def get_last(self) -> 'Pile':
         """
-        Zwraca ostatni element w stosie.
-        
+        Zwraca stos złożony tylko z wierzchniej karty.
+
         Returns:
-            PilePart: Ostatni element w stosie
+            Pile: Jednokartowy stos z wierzchnią kartą
         """
-        current = self
-        while current.next is not None:
-            current = current.next
-        return current
-    
+        return Pile(self._cards[-1:], self._first_face_up - len(self._cards) + 1)
+
     def is_last(self) -> bool:
         """
-        Sprawdza czy ten element jest ostatni w stosie.
-        
+        Sprawdza czy stos składa się z jednej karty.
+
         Returns:
-            bool: True jeśli to ostatni element
+            bool: True jeśli stos ma jedną kartę
         """
-        return self.next is None
-    
+        return len(self._cards) == 1
+
     def length(self) -> int:
         """
-        Zwraca liczbę elementów w stosie począwszy od tego elementu.
-        
+        Zwraca liczbę kart w stosie.
+
         Returns:
-            int: Liczba elementów w stosie
+            int: Liczba kart w stosie
         """
-        count = 0
-        current = self
-        while current is not None:
-            count += 1
-            current = current.next
-        return count
-    
+        return len(self._cards)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards)
+
     def is_sorted(self, reversed=False) -> bool:
         """
         Sprawdza czy karty w stosie są posortowane według rangi.
-        
+
         Args:
             reversed (bool): True dla sortowania malejącego, False dla rosnącego
-            
+
         Returns:
             bool: True jeśli karty są posortowane
         """
-        current = self
-        previous_rank = None
-        while current is not None:
-            if previous_rank is not None:
-                if reversed:
-                    if current.get_card().rank.value >= previous_rank.value:
-                        return False
-                else:
-                    if current.get_card().rank.value <= previous_rank.value:
-                        return False
-            previous_rank = current.get_card().rank
-            current = current.next
+        for lower, upper in zip(self._cards, self._cards[1:]):
+            if reversed:
+                if upper.rank.value >= lower.rank.value:
+                    return False
+            elif upper.rank.value <= lower.rank.value:
+                return False
         return True
-    
+
     def as_list(self) -> list[Card]:
-        cards = []
-        current = self
-        while current is not None:
-            cards.append(current.get_card())
-            current = current.next
-        return cards
-    
+        """
+        Zwraca karty stosu od spodu do wierzchu.
+
+        Returns:
+            list[Card]: Kopia listy kart
+        """
+        return self._cards.copy()
+
     def is_hidden(self) -> bool:
-        current = self
-        while current is not None:
-            if current.get_card().hidden:
-                return True
-            current = current.next
-        return False
-    
-    def copy(self):
-        if self is None:
-            return None
-        new_head = PilePart(self.get_card().copy())
-        current_new = new_head
-        current_old = self.next
-        while current_old is not None:
-            current_new.next = PilePart(current_old.get_card().copy())
-            current_new = current_new.next
-            current_old = current_old.next
-        return new_head
-
-def create_pile(*args: Card) -> PilePart:
+        """
+        Sprawdza czy w stosie jest zakryta karta.
+
+        Returns:
+            bool: True jeśli choć jedna karta jest zakryta
+        """
+        return self._first_face_up > 0
+
+    def copy(self) -> 'Pile':
+        """
+        Tworzy kopię stosu w czasie stałym.
+
+        Kopia i oryginał współdzielą listę kart, dopóki któryś z nich się
+        nie zmieni.
+
+        Returns:
+            Pile: Nowy stos z tymi samymi kartami
+        """
+        part = Pile.__new__(Pile)
+        part._cards = self._cards
+        part._first_face_up = self._first_face_up
+        part._shared = self._shared = True
+        return part
+
+def create_pile(*args: Card, hidden: int = 0) -> Optional[Pile]:
+    """
+    Tworzy stos z podanych kart.
+
+    Args:
+        *args (Card): Karty od spodu do wierzchu
+        hidden (int): Liczba zakrytych kart na spodzie stosu
+
+    Returns:
+        Pile | None: Nowy stos lub None, gdy nie podano kart
+    """
     if not args:
         return None
-    head = PilePart(args[0])
-    current = head
-    for card in args[1:]:
-        current.next = PilePart(card)
-        current = current.next
-    return head
\ No newline at end of file
+    return Pile(args, hidden)
@@ -0,0 +1,501 @@
+"""
+Powtórki rozgrywek: format pliku, nagrywanie i weryfikacja.
+
+Powtórka to numer rozdania, poziom trudności i uporządkowana lista kroków
+(ruch, cofnięcie albo ponowienie) z czasem od początku partii. Z samego
+numeru rozdania da się odtworzyć układ kart, więc plik zawiera tylko
+kroki - po 9 bajtów na krok, za nagłówkiem takim jak w save_codec
+(znacznik, wersja, wersja zgodności, długość nagłówka).
+
+Weryfikacja odtwarza powtórkę na CompactState i sprawdza każdy ruch przez
+CompactState.is_legal(), bez obiektów Card, Pile i SolitareGame, dzięki
+czemu jeden proces sprawdza tysiące powtórek na sekundę. CompactState.is_legal()
+i SolitareGame.can_apply_move() dzielą sprawdzenie postaci ruchu
+(Move.is_well_formed()) i tablice zasad z core.rules, więc powtórka przyjęta
+przez weryfikator daje się odtworzyć w grze, a odrzucona - nie.
+
+ReplaySaver zapisuje nagrywaną powtórkę w tle, ale nie po każdym ruchu:
+plik jest przepisywany co CHECKPOINT_INTERVAL kroków (tak jak punkty
+kontrolne zapisu gry), przed odczytem i przy zamknięciu.
+"""
+
+import os
+import struct
+import time
+from bisect import bisect_right
+from multiprocessing import Pool
+from typing import Callable, NamedTuple, Optional
+
+from core.autosave import AutosaveWriter
+from core.deal import deal_compact
+from core.enums import Difficulty, ReplayAction, Time
+from core.game import SolitareGame
+from core.journal import JournalEntry
+from core.move import Move
+from core.save_codec import (DIFFICULTIES, SaveFormatError, difficulty_code, encode_entry, decode_entry,
+                             ENTRY_SIZE)
+from core.save_journal import journal_steps, CHECKPOINT_INTERVAL, UNDO, REDO, MOVE
+
+REPLAY_MAGIC = b"PSJR"
+REPLAY_VERSION = 1  # Wersja zapisywanego formatu
+REPLAY_COMPAT = 1  # Najstarsza wersja czytnika, która odczyta zapisany plik
+
+# Znacznik, wersja, wersja zgodności, długość nagłówka, poziom trudności, numer rozdania, liczba kroków
+_HEADER = struct.Struct("<4sBBBBQI")
+# Rodzaj kroku, zakodowany ruch (encode_entry), czas w milisekundach
+_STEP = struct.Struct(f"<B{ENTRY_SIZE}sI")
+_NO_MOVE = bytes(ENTRY_SIZE)
+
+_ACTIONS = tuple(ReplayAction)  # Rodzaje kroków według kodu zapisanego w pliku
+_JOURNAL_ACTIONS = {MOVE: ReplayAction.MOVE, UNDO: ReplayAction.UNDO, REDO: ReplayAction.REDO}
+
+class ReplayStep(NamedTuple):
+    """
+    Pojedynczy krok powtórki.
+
+    Attributes:
+        time (float): Czas od początku partii w sekundach
+        action (ReplayAction): Rodzaj kroku
+        move (Move | None): Wykonany ruch (tylko dla ReplayAction.MOVE)
+    """
+    time: float
+    action: ReplayAction
+    move: Optional[Move] = None
+
+class Replay:
+    """
+    Zapis przebiegu jednej partii.
+
+    Attributes:
+        deal_number (int): Numer rozdania
+        difficulty (Difficulty): Poziom trudności
+        steps (list[ReplayStep]): Kroki w kolejności wykonania
+    """
+
+    def __init__(self, deal_number: int, difficulty: Difficulty, steps: Optional[list[ReplayStep]] = None):
+        """
+        Tworzy powtórkę.
+
+        Args:
+            deal_number (int): Numer rozdania
+            difficulty (Difficulty): Poziom trudności
+            steps (list[ReplayStep], optional): Kroki powtórki
+        """
+        self.deal_number = deal_number
+        self.difficulty = difficulty
+        self.steps = steps if steps is not None else []
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def duration(self) -> float:
+        """
+        Zwraca czas trwania partii.
+
+        Returns:
+            float: Czas ostatniego kroku w sekundach
+        """
+        return self.steps[-1].time if self.steps else 0.0
+
+    def steps_until(self, seconds: float) -> int:
+        """
+        Zwraca liczbę kroków wykonanych do podanej chwili.
+
+        Args:
+            seconds (float): Czas od początku partii
+
+        Returns:
+            int: Liczba kroków o czasie nie większym niż seconds
+        """
+        return bisect_right(self.steps, seconds, key=lambda step: step.time)
+
+    @staticmethod
+    def apply_step(game, step: ReplayStep) -> bool:
+        """
+        Wykonuje krok powtórki na grze.
+
+        Args:
+            game (SolitareGame): Gra, na której wykonywany jest krok
+            step (ReplayStep): Krok do wykonania
+
+        Returns:
+            bool: True jeśli krok udało się wykonać
+        """
+        if step.action == ReplayAction.UNDO:
+            return game.undo()
+        if step.action == ReplayAction.REDO:
+            return game.redo()
+        return game.apply_move(step.move)
+
+    def game(self, position: Optional[int] = None,
+             transfer_listener: Optional[Callable[[Time], None]] = None) -> SolitareGame:
+        """
+        Odtwarza grę po podanej liczbie kroków.
+
+        Args:
+            position (int, optional): Liczba kroków do wykonania; None oznacza wszystkie
+            transfer_listener (Callable[[Time], None], optional): Nasłuchiwacz transferów gry
+
+        Returns:
+            SolitareGame: Gra w stanie po wykonaniu kroków
+
+        Raises:
+            ValueError: Jeśli któregoś kroku nie da się wykonać
+        """
+        game = SolitareGame(self.difficulty, None, self.deal_number)
+        for index, step in enumerate(self.steps[:position]):
+            if not self.apply_step(game, step):
+                raise ValueError(f"Replay step {index} ({step.action.name}) cannot be applied")
+        game.transfer_listener = transfer_listener
+        return game
+
+class ReplayCheck(NamedTuple):
+    """
+    Wynik weryfikacji powtórki.
+
+    Attributes:
+        valid (bool): Czy wszystkie kroki były dozwolone
+        steps (int): Liczba poprawnie wykonanych kroków
+        won (bool): Czy powtórka kończy się wygraną
+    """
+    valid: bool
+    steps: int
+    won: bool
+
+def encode_replay(replay: Replay) -> bytes:
+    """
+    Koduje powtórkę do formatu binarnego.
+
+    Args:
+        replay (Replay): Powtórka do zapisania
+
+    Returns:
+        bytes: Zapis powtórki
+    """
+    data = bytearray(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, REPLAY_COMPAT, _HEADER.size,
+                                  difficulty_code(replay.difficulty), replay.deal_number, len(replay.steps)))
+    for step in replay.steps:
+        move = encode_entry(JournalEntry(step.move)) if step.move is not None else _NO_MOVE
+        data += _STEP.pack(step.action.value, move, round(step.time * 1000))
+    return bytes(data)
+
+def decode_replay(data: bytes) -> Replay:
+    """
+    Odczytuje powtórkę zapisaną przez encode_replay().
+
+    Args:
+        data (bytes): Zapis powtórki
+
+    Returns:
+        Replay: Odczytana powtórka
+
+    Raises:
+        SaveFormatError: Jeśli dane są uszkodzone albo zapisane w niezrozumiałej wersji formatu
+    """
+    try:
+        magic, version, compat, header_size, difficulty, deal_number, count = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise SaveFormatError("Not a solitaire replay file")
+        if compat > REPLAY_VERSION:
+            raise SaveFormatError(f"Replay format version {version} is too new (supported: {REPLAY_VERSION})")
+        body = data[header_size:header_size + count * _STEP.size]
+        if len(body) != count * _STEP.size:
+            raise SaveFormatError("Truncated replay file")
+        steps = []
+        moves = {}  # Partia powtarza te same ruchy (np. dobranie z talii), więc każdy dekodowany jest raz
+        for action, move, milliseconds in _STEP.iter_unpack(body):
+            action = _ACTIONS[action]
+            if action is ReplayAction.MOVE:
+                if move not in moves:
+                    moves[move] = decode_entry(move).move
+                move = moves[move]
+            else:
+                move = None
+            steps.append(ReplayStep(milliseconds / 1000, action, move))
+        return Replay(deal_number, DIFFICULTIES[difficulty], steps)
+    except (struct.error, IndexError, ValueError) as error:
+        if isinstance(error, SaveFormatError):
+            raise
+        raise SaveFormatError("Corrupted replay file") from error
+
+def _undone_moves(steps: list[ReplayStep]) -> set[int]:
+    """
+    Wyznacza indeksy ruchów, które powtórka kiedykolwiek cofa.
+
+    Args:
+        steps (list[ReplayStep]): Kroki powtórki
+
+    Returns:
+        set[int]: Indeksy kroków ReplayAction.MOVE cofanych przez późniejsze kroki
+    """
+    undone = set()
+    history, future = [], []
+    for index, step in enumerate(steps):
+        if step.action is ReplayAction.MOVE:
+            history.append(index)
+            future.clear()
+        elif step.action is ReplayAction.UNDO:
+            if not history:
+                break
+            future.append(history.pop())
+            undone.add(future[-1])
+        elif future:
+            history.append(future.pop())
+        else:
+            break
+    return undone
+
+def verify_replay(replay: Replay) -> ReplayCheck:
+    """
+    Sprawdza czy powtórka jest zgodna z zasadami gry.
+
+    Krok jest dozwolony wtedy i tylko wtedy, gdy Replay.game() potrafi go
+    wykonać na SolitareGame. Kopia stanu sprzed ruchu jest potrzebna tylko dla ruchów, które
+    powtórka później cofa; pozostałe ruchy są wykonywane bez kopiowania.
+
+    Args:
+        replay (Replay): Powtórka do sprawdzenia
+
+    Returns:
+        ReplayCheck: Wynik weryfikacji
+    """
+    state = deal_compact(replay.deal_number, replay.difficulty)
+    undone = _undone_moves(replay.steps)
+    history = []  # Stany przed wykonanymi ruchami (None dla ruchów, których nikt nie cofa)
+    future = []   # Stany cofniętych ruchów do ponowienia
+    for index, step in enumerate(replay.steps):
+        if step.action is ReplayAction.MOVE:
+            if not state.is_legal(step.move):
+                return ReplayCheck(False, index, state.is_won())
+            history.append(state.copy() if index in undone else None)
+            future.clear()
+            state.apply_move(step.move)
+        elif step.action is ReplayAction.UNDO:
+            if not history:
+                return ReplayCheck(False, index, state.is_won())
+            future.append(state)
+            state = history.pop()
+        else:
+            if not future:
+                return ReplayCheck(False, index, state.is_won())
+            history.append(state)
+            state = future.pop()
+    return ReplayCheck(True, len(replay.steps), state.is_won())
+
+def verify_replay_data(data: bytes) -> ReplayCheck:
+    """
+    Odczytuje i sprawdza powtórkę; uszkodzony plik jest niepoprawną powtórką.
+
+    Args:
+        data (bytes): Zapis powtórki
+
+    Returns:
+        ReplayCheck: Wynik weryfikacji
+    """
+    try:
+        replay = decode_replay(data)
+    except SaveFormatError:
+        return ReplayCheck(False, 0, False)
+    return verify_replay(replay)
+
+def verify_replay_file(path: str) -> ReplayCheck:
+    """
+    Sprawdza powtórkę zapisaną w pliku (funkcja wykonywana w procesie puli).
+
+    Args:
+        path (str): Ścieżka pliku powtórki
+
+    Returns:
+        ReplayCheck: Wynik weryfikacji
+    """
+    with open(path, "rb") as file:
+        return verify_replay_data(file.read())
+
+def verify_replay_files(paths: list[str], workers: int = 1) -> list[ReplayCheck]:
+    """
+    Sprawdza wiele plików powtórek, opcjonalnie na wielu procesach.
+
+    Args:
+        paths (list[str]): Ścieżki plików powtórek
+        workers (int): Liczba procesów (1 = bez puli procesów)
+
+    Returns:
+        list[ReplayCheck]: Wyniki w kolejności ścieżek
+    """
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        return [verify_replay_file(path) for path in paths]
+    with Pool(workers) as pool:
+        return pool.map(verify_replay_file, paths, chunksize=max(1, len(paths) // (workers * 8)))
+
+class ReplayRecorder:
+    """
+    Nagrywa powtórkę grającej partii na podstawie dziennika gry.
+
+    Przy każdym wywołaniu record() porównuje dziennik gry z poprzednim
+    stanem i dopisuje brakujące kroki z bieżącym czasem. Gdy gra zostanie
+    zastąpiona inną (nowe rozdanie, wczytanie zapisu), zaczyna nową powtórkę
+    od ruchów, które ta gra ma już w dzienniku.
+
+    Attributes:
+        replay (Replay | None): Nagrywana powtórka
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Tworzy nagrywającego.
+
+        Args:
+            clock (Callable[[], float]): Źródło czasu w sekundach
+        """
+        self.replay: Optional[Replay] = None
+        self._clock = clock
+        self._start = 0.0
+        self._game = None
+        self._done: list[JournalEntry] = []
+        self._undone: list[JournalEntry] = []
+
+    def record(self, game) -> Replay:
+        """
+        Dopisuje do powtórki kroki wykonane od poprzedniego wywołania.
+
+        Args:
+            game (SolitareGame): Nagrywana gra
+
+        Returns:
+            Replay: Aktualna powtórka
+        """
+        done = game.journal.entries()
+        undone = game.journal.undone_entries()
+        steps = None
+        if game is self._game:
+            steps = journal_steps(self._done, self._undone, done, undone)
+        if steps is None:
+            self._start = self._clock()
+            self.replay = Replay(game.deal_number, game.difficulty)
+            # Cofnięte ruchy wykonuje się w kolejności gry, a potem cofa
+            steps = [(MOVE, entry) for entry in done + undone[::-1]] + [(UNDO, None)] * len(undone)
+            now = 0.0
+        else:
+            now = self._clock() - self._start
+        for kind, entry in steps:
+            action = _JOURNAL_ACTIONS[kind]
+            move = entry.move if action == ReplayAction.MOVE else None
+            self.replay.steps.append(ReplayStep(now, action, move))
+        self._game, self._done, self._undone = game, done, undone
+        return self.replay
+
+class ReplaySaver:
+    """
+    Nagrywa powtórkę partii i zapisuje ją w tle do pliku.
+
+    Plik jest przepisywany w całości, więc zapisywanie go po każdym ruchu
+    kosztowałoby tym więcej, im dłuższa partia. Zamiast tego powtórka trafia
+    na dysk, gdy od poprzedniego zapisu przybyło checkpoint_interval kroków,
+    a także przed odczytem (exists(), load()) i przy zamknięciu (close()).
+    Po awarii plik może więc nie zawierać ostatnich kroków partii.
+
+    Attributes:
+        path (str): Ścieżka pliku powtórki
+        checkpoint_interval (int): Liczba kroków między zapisami
+        recorder (ReplayRecorder): Nagrywający powtórkę
+        writer (AutosaveWriter): Wątek zapisujący plik
+        writes (int): Liczba zapisów przekazanych do zapisania
+    """
+
+    def __init__(self, path: str, checkpoint_interval: int = CHECKPOINT_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Tworzy zapisującego powtórkę.
+
+        Args:
+            path (str): Ścieżka pliku powtórki
+            checkpoint_interval (int): Liczba kroków między zapisami
+            clock (Callable[[], float]): Źródło czasu w sekundach
+        """
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.recorder = ReplayRecorder(clock)
+        self.writer = AutosaveWriter(path)
+        self.writes = 0
+        self._written: Optional[Replay] = None
+        self._written_steps = 0
+
+    def record(self, game) -> Replay:
+        """
+        Nagrywa kroki gry bez zapisywania pliku.
+
+        Args:
+            game (SolitareGame): Nagrywana gra
+
+        Returns:
+            Replay: Aktualna powtórka
+        """
+        return self.recorder.record(game)
+
+    def save(self, game) -> None:
+        """
+        Nagrywa kroki gry i zapisuje powtórkę, jeśli od poprzedniego zapisu
+        przybyło co najmniej checkpoint_interval kroków.
+
+        Args:
+            game (SolitareGame): Nagrywana gra
+        """
+        replay = self.recorder.record(game)
+        written = self._written_steps if replay is self._written else 0
+        if len(replay) - written >= self.checkpoint_interval:
+            self.write()
+
+    def write(self) -> None:
+        """
+        Przekazuje do zapisania powtórkę z krokami nagranymi od poprzedniego zapisu.
+
+        Powtórka, do której nic nie przybyło od rozpoczęcia partii, nie jest
+        zapisywana, więc nie zastępuje na dysku powtórki poprzedniej partii.
+        """
+        replay = self.recorder.replay
+        if replay is None:
+            return
+        written = self._written_steps if replay is self._written else 0
+        if len(replay) == written:
+            return
+        self.writer.submit(encode_replay(replay))
+        self.writes += 1
+        self._written, self._written_steps = replay, len(replay)
+
+    def exists(self) -> bool:
+        """
+        Sprawdza czy na dysku jest powtórka.
+
+        Returns:
+            bool: True jeśli plik powtórki istnieje
+        """
+        self.write()
+        self.writer.flush()
+        return os.path.exists(self.path)
+
+    def load(self) -> Replay:
+        """
+        Wczytuje powtórkę z pliku.
+
+        Returns:
+            Replay: Wczytana powtórka
+
+        Raises:
+            FileNotFoundError: Jeśli plik powtórki nie istnieje
+            SaveFormatError: Jeśli plik jest uszkodzony lub zapisany w nieznanym formacie
+        """
+        self.write()
+        self.writer.flush()
+        with open(self.path, "rb") as file:
+            return decode_replay(file.read())
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Zapisuje nienagrane na dysku kroki i zatrzymuje wątek zapisu.
+
+        Args:
+            timeout (float, optional): Maksymalny czas oczekiwania w sekundach
+        """
+        self.write()
+        self.writer.close(timeout)
@@ -0,0 +1,35 @@
+"""
+Zasady układania kart wyliczone raz dla wszystkich 52 kart.
+
+Sprawdzenie, czy kartę można położyć na innej w tableau albo na
+fundamencie, sprowadza się do odczytu z tablicy indeksowanej numerami kart
+(Card.index), bez arytmetyki na wartościach enumeracji. Z tablic korzystają
+Tableau, Foundations (a przez nie transfery i SolitareGame), CompactState
+i silnik wsadowy.
+"""
+
+from core.card import SUITS, RANKS, CARD_COUNT, CARD_SUIT, CARD_RANK, CARD_RED
+from core.enums import Rank
+
+KING = Rank.KING.value
+NO_CARD = -1  # Brak następnej karty (fundament jest pełny)
+
+# CAN_STACK[wierzch][karta]: czy kartę można położyć na wierzchu kolumny (ranga niżej, przeciwny kolor)
+CAN_STACK = tuple(tuple(CARD_RANK[top] == CARD_RANK[card] + 1 and CARD_RED[top] != CARD_RED[card]
+                        for card in range(CARD_COUNT))
+                  for top in range(CARD_COUNT))
+# CAN_START_COLUMN[karta]: czy karta może zająć pustą kolumnę
+CAN_START_COLUMN = tuple(CARD_RANK[card] == KING for card in range(CARD_COUNT))
+
+# Karty, które można położyć na danej karcie w tableau
+STACKABLE_ON = [[card for card in range(CARD_COUNT) if CAN_STACK[top][card]] for top in range(CARD_COUNT)]
+KINGS = [card for card in range(CARD_COUNT) if CAN_START_COLUMN[card]]
+
+# NEXT_FOUNDATION[kolor][liczba kart]: numer karty, która trafia na fundament jako następna
+NEXT_FOUNDATION = tuple(tuple(suit * len(RANKS) + count if count < len(RANKS) else NO_CARD
+                              for count in range(len(RANKS) + 1))
+                        for suit in range(len(SUITS)))
+
+# Kolory przeciwnego koloru (czerwony/czarny) dla każdego koloru karty
+OPPOSITE_SUITS = [[other for other in range(len(SUITS)) if CARD_RED[other * len(RANKS)] != CARD_RED[suit * len(RANKS)]]
+                  for suit in range(len(SUITS))]
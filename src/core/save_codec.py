@@ -0,0 +1,249 @@
+"""
+Zwarty binarny format zapisu gry.
+
+Plik zaczyna się stałym nagłówkiem (znacznik, wersja formatu, poziom
+trudności, numer rozdania i liczba ruchów w dzienniku), po którym
+następuje układ kart - po jednym bajcie na kartę - oraz rekordy dziennika
+po 4 bajty na ruch. Zapis świeżo rozdanej gry zajmuje około 100 bajtów,
+a kodowanie i dekodowanie nie tworzy żadnych obiektów poza samą grą.
+
+Zgodność w przód: nagłówek zawiera swoją długość oraz najstarszą wersję
+czytnika, która rozumie plik. Nowsze wersje mogą dopisywać pola na końcu
+nagłówka i sekcje na końcu pliku - starszy czytnik je pomija - a zmiana,
+której starszy czytnik nie zrozumie, podnosi wersję zgodności. Wersja 2
+poszerzyła liczby ruchów w nagłówku z 2 do 4 bajtów; pliki wersji 1 są
+nadal odczytywane.
+"""
+
+import struct
+from typing import Callable, Optional
+
+from core.card import SUITS, RANKS, CARD_COUNT, index_card
+from core.difficulty import get_draw_amount
+from core.enums import Difficulty, Time, TransferType
+from core.foundations import Foundations
+from core.journal import Journal, JournalEntry
+from core.move import Move
+from core.pile_part import create_pile
+from core.stock import Stock
+from core.tableau import Tableau
+
+MAGIC = b"PSJS"
+SAVE_VERSION = 2  # Wersja zapisywanego formatu
+SAVE_COMPAT = 2  # Najstarsza wersja czytnika, która odczyta zapisany plik
+
+# Znacznik, wersja, wersja zgodności, długość nagłówka, poziom trudności,
+# numer rozdania, liczba wykonanych i cofniętych ruchów
+_HEADER = struct.Struct("<4sBBBBQII")
+# Nagłówek wersji 1, w której liczby ruchów miały po 2 bajty
+_HEADER_V1 = struct.Struct("<4sBBBBQHH")
+_ENTRY = struct.Struct("<BBBB")
+ENTRY_SIZE = _ENTRY.size
+
+DIFFICULTIES = (Difficulty.EASY, Difficulty.HARD)  # Kody poziomów trudności w zapisie
+_TRANSFER_TYPES = (TransferType.TABLEAU, TransferType.STOCK, TransferType.FOUNDATION)
+_TRANSFER_CODES = {transfer_type: code for code, transfer_type in enumerate(_TRANSFER_TYPES)}
+MAX_DRAW = get_draw_amount(Difficulty.HARD)  # Największa liczba kart dobieranych naraz
+
+class SaveFormatError(ValueError):
+    """
+    Błąd zgłaszany, gdy dane nie są poprawnym zapisem gry.
+    """
+
+def difficulty_code(difficulty) -> int:
+    """
+    Zwraca kod poziomu trudności zapisywany w pliku.
+
+    Liczba dobieranych kart zależy tylko od tego, czy poziom jest trudny,
+    więc każda inna wartość jest zapisywana jako poziom łatwy.
+
+    Args:
+        difficulty (Difficulty): Poziom trudności gry
+
+    Returns:
+        int: Indeks poziomu w DIFFICULTIES
+    """
+    return DIFFICULTIES.index(Difficulty.HARD if difficulty == Difficulty.HARD else Difficulty.EASY)
+
+def encode_entry(entry: JournalEntry) -> bytes:
+    """
+    Pakuje rekord dziennika do 4 bajtów.
+
+    Pierwszy bajt zawiera rodzaje obszarów i flagi, drugi indeksy stosów,
+    a kolejne głębokość i liczbę kart.
+
+    Args:
+        entry (JournalEntry): Rekord ruchu
+
+    Returns:
+        bytes: Zakodowany rekord
+    """
+    move = entry.move
+    kinds = (_TRANSFER_CODES[move.source] | _TRANSFER_CODES[move.target] << 2
+             | entry.revealed << 4 | entry.recycled << 5)
+    return _ENTRY.pack(kinds, move.source_index | move.target_index << 4, move.depth, entry.count)
+
+def _decode_entry(kinds: int, indices: int, depth: int, count: int) -> JournalEntry:
+    """
+    Składa rekord dziennika z pól zapisanych przez encode_entry().
+
+    Args:
+        kinds (int): Rodzaje obszarów i flagi
+        indices (int): Indeksy stosu źródłowego i docelowego
+        depth (int): Głębokość pierwszej przenoszonej karty
+        count (int): Liczba przeniesionych kart
+
+    Returns:
+        JournalEntry: Odczytany rekord
+    """
+    move = Move(_TRANSFER_TYPES[kinds & 3], indices & 15, depth, _TRANSFER_TYPES[kinds >> 2 & 3], indices >> 4)
+    return JournalEntry(move, count, bool(kinds & 16), bool(kinds & 32))
+
+def _valid_entry(entry: JournalEntry) -> bool:
+    """
+    Sprawdza czy odczytany rekord dziennika mógł powstać w grze.
+
+    Cofanie i ponawianie ufa rekordom dziennika, więc rekord o złej postaci
+    musi zostać odrzucony przy wczytywaniu, a nie dopiero przy cofaniu.
+
+    Args:
+        entry (JournalEntry): Odczytany rekord
+
+    Returns:
+        bool: True jeśli ruch jest poprawnie zbudowany, a liczba kart i flagi pasują do ruchu
+    """
+    move = entry.move
+    if not move.is_well_formed():
+        return False
+    if move.is_draw:
+        return entry.count <= MAX_DRAW and not entry.revealed
+    if entry.recycled or entry.revealed and not (move.source == TransferType.TABLEAU and move.depth > 0):
+        return False
+    if move.source == TransferType.TABLEAU and move.target == TransferType.TABLEAU:
+        return 1 <= entry.count <= len(RANKS) and move.depth < CARD_COUNT
+    return entry.count == 1
+
+def decode_entry(record: bytes, offset: int = 0) -> JournalEntry:
+    """
+    Odczytuje rekord dziennika zapisany przez encode_entry().
+
+    Args:
+        record (bytes): Dane zawierające rekord
+        offset (int): Położenie rekordu w danych
+
+    Returns:
+        JournalEntry: Odczytany rekord
+    """
+    return _decode_entry(*_ENTRY.unpack_from(record, offset))
+
+def encode_game(game) -> bytes:
+    """
+    Koduje grę do zwartego formatu binarnego.
+
+    Args:
+        game (SolitareGame): Gra do zapisania
+
+    Returns:
+        bytes: Zapis gry
+    """
+    done = game.journal.entries()
+    undone = game.journal.undone_entries()
+    data = bytearray(_HEADER.pack(MAGIC, SAVE_VERSION, SAVE_COMPAT, _HEADER.size, difficulty_code(game.difficulty),
+                                  game.deal_number, len(done), len(undone)))
+
+    for pile in game.tableau.piles:
+        cards = list(pile) if pile is not None else []
+        data.append(len(cards))
+        data.append(pile.first_face_up() if cards else 0)
+        data.extend(card.index for card in cards)
+    for cards in (game.stock.stock_cards(), game.stock.waste_cards()):
+        data.append(len(cards))
+        data.extend(card.index for card in cards)
+    data.extend(len(game.foundations.foundations[suit].as_list()) for suit in SUITS)
+
+    data += b"".join(map(encode_entry, done + undone))
+    return bytes(data)
+
+def decode_game(data: bytes, transfer_listener: Optional[Callable[[Time], None]] = None):
+    """
+    Odtwarza grę zapisaną przez encode_game().
+
+    Args:
+        data (bytes): Zapis gry
+        transfer_listener (Callable[[Time], None], optional): Nasłuchiwacz transferów odtworzonej gry
+
+    Returns:
+        SolitareGame: Odtworzona gra
+
+    Raises:
+        SaveFormatError: Jeśli dane są uszkodzone albo zapisane w niezrozumiałej wersji formatu
+    """
+    from core.game import SolitareGame  # game importuje moduły, z których korzysta ten kodek
+
+    try:
+        header = _HEADER_V1 if data[4:5] == b"\x01" else _HEADER
+        magic, version, compat, header_size, difficulty, deal_number, done_count, undone_count = \
+            header.unpack_from(data)
+        if magic != MAGIC:
+            raise SaveFormatError("Not a solitaire save file")
+        if compat > SAVE_VERSION:
+            raise SaveFormatError(f"Save format version {version} is too new (supported: {SAVE_VERSION})")
+
+        offset = header_size
+        game = SolitareGame.__new__(SolitareGame)
+        game.difficulty = DIFFICULTIES[difficulty]
+        game.transfer_listener = transfer_listener
+        game.deal_number = deal_number
+        seen = set()
+        total = 0
+
+        def read_byte() -> int:
+            nonlocal offset
+            offset += 1
+            return data[offset - 1]
+
+        def read_cards(count: int) -> list:
+            nonlocal offset, total
+            indices = data[offset:offset + count]
+            if len(indices) != count or any(index >= CARD_COUNT for index in indices):
+                raise SaveFormatError("Corrupted card layout")
+            seen.update(indices)
+            total += count
+            offset += count
+            return [index_card(index) for index in indices]
+
+        game.tableau = Tableau()
+        for i in range(Tableau.PILE_COUNT):
+            length, hidden = read_byte(), read_byte()
+            game.tableau.piles[i] = create_pile(*read_cards(length), hidden=hidden)
+
+        game.stock = Stock([])
+        stock_cards = read_cards(read_byte())
+        game.stock.set_piles(stock_cards, read_cards(read_byte()))
+
+        game.foundations = Foundations()
+        for suit_index, suit in enumerate(SUITS):
+            count = read_byte()
+            if count > len(RANKS):
+                raise SaveFormatError("Corrupted foundation")
+            indices = range(suit_index * len(RANKS), suit_index * len(RANKS) + count)
+            seen.update(indices)
+            total += count
+            game.foundations.foundations[suit].pile = create_pile(*[index_card(index) for index in indices])
+        if total != CARD_COUNT or len(seen) != CARD_COUNT:
+            raise SaveFormatError("Save file does not hold every card exactly once")
+
+        size = (done_count + undone_count) * _ENTRY.size
+        if len(data) < offset + size:
+            raise SaveFormatError("Truncated move journal")
+        entries = [_decode_entry(*fields) for fields in _ENTRY.iter_unpack(data[offset:offset + size])]
+        if not all(map(_valid_entry, entries)):
+            raise SaveFormatError("Corrupted move journal")
+        game.journal = Journal.from_entries(entries[:done_count], entries[done_count:])
+    except (struct.error, IndexError) as error:
+        raise SaveFormatError("Truncated save file") from error
+
+    # Talia policzyła już swój hash w set_piles()
+    game.tableau.rehash()
+    game.foundations.rehash()
+    return game
@@ -0,0 +1,251 @@
+"""
+Zapis gry jako pełne punkty kontrolne i dopisywany dziennik ruchów.
+
+Plik zapisu (save_codec) jest pełnym punktem kontrolnym, a obok niego
+leży dziennik: nagłówek z sumą kontrolną CRC32 punktu kontrolnego,
+po którym następują rekordy - cofnięcie, ponowienie (po 1 bajcie) albo
+nowy ruch (1 bajt + 4 bajty rekordu dziennika gry). Po ruchu na dysk
+trafia tylko kilka bajtów dopisanych do dziennika; co CHECKPOINT_INTERVAL
+rekordów zapisywany jest nowy punkt kontrolny i pusty dziennik.
+
+Odtworzenie wczytuje punkt kontrolny i powtarza rekordy dziennika. Dziennik
+z inną sumą kontrolną (np. po awarii między zapisem punktu kontrolnego
+a dziennika) jest pomijany, a niepełny ostatni rekord - ignorowany.
+"""
+
+import os
+import struct
+import zlib
+from typing import Callable, Optional
+
+from core.autosave import AutosaveWriter
+from core.enums import Time
+from core.journal import JournalEntry
+from core.save_codec import encode_game, decode_game, encode_entry, decode_entry, ENTRY_SIZE, SaveFormatError
+
+CHECKPOINT_INTERVAL = 50  # Liczba rekordów dziennika między punktami kontrolnymi
+
+LOG_MAGIC = b"PSJL"
+_LOG_HEADER = struct.Struct("<4sI")  # Znacznik, CRC32 punktu kontrolnego
+
+UNDO = b"\x01"
+REDO = b"\x02"
+MOVE = b"\x03"
+
+def log_header(checkpoint: bytes) -> bytes:
+    """
+    Zwraca nagłówek dziennika należącego do punktu kontrolnego.
+
+    Args:
+        checkpoint (bytes): Zapis punktu kontrolnego
+
+    Returns:
+        bytes: Nagłówek dziennika
+    """
+    return _LOG_HEADER.pack(LOG_MAGIC, zlib.crc32(checkpoint))
+
+def journal_steps(old_done: list[JournalEntry], old_undone: list[JournalEntry],
+                  done: list[JournalEntry], undone: list[JournalEntry]) -> Optional[list[tuple]]:
+    """
+    Wyznacza kroki (cofnięcia, ponowienia i nowe ruchy), które zamieniają
+    jeden stan dziennika gry w drugi.
+
+    Rekordy dziennika gry są niezmienne, a cofanie i ponawianie przenosi
+    te same obiekty między stosami, więc porównywane są tożsamości.
+
+    Args:
+        old_done (list[JournalEntry]): Wykonane ruchy w zapisanym stanie
+        old_undone (list[JournalEntry]): Cofnięte ruchy w zapisanym stanie
+        done (list[JournalEntry]): Wykonane ruchy w bieżącym stanie
+        undone (list[JournalEntry]): Cofnięte ruchy w bieżącym stanie
+
+    Returns:
+        list[tuple[bytes, JournalEntry | None]] | None: Pary (UNDO, REDO lub MOVE, rekord ruchu)
+            lub None, gdy stanu nie da się tak opisać
+    """
+    common = min(len(old_done), len(done))
+    while common and old_done[common - 1] is not done[common - 1]:
+        common -= 1
+
+    steps = [(UNDO, None)] * (len(old_done) - common)
+    stack = old_undone + old_done[common:][::-1]
+    for entry in done[common:]:
+        if stack and stack[-1] is entry:
+            stack.pop()
+            steps.append((REDO, entry))
+        else:
+            stack = []
+            steps.append((MOVE, entry))
+
+    if len(stack) != len(undone) or any(mine is not theirs for mine, theirs in zip(stack, undone)):
+        return None
+    return steps
+
+def journal_delta(old_done: list[JournalEntry], old_undone: list[JournalEntry],
+                  done: list[JournalEntry], undone: list[JournalEntry]) -> Optional[list[bytes]]:
+    """
+    Wyznacza rekordy dziennika zapisu, które zamieniają jeden stan dziennika gry w drugi.
+
+    Args:
+        old_done (list[JournalEntry]): Wykonane ruchy w zapisanym stanie
+        old_undone (list[JournalEntry]): Cofnięte ruchy w zapisanym stanie
+        done (list[JournalEntry]): Wykonane ruchy w bieżącym stanie
+        undone (list[JournalEntry]): Cofnięte ruchy w bieżącym stanie
+
+    Returns:
+        list[bytes] | None: Rekordy do dopisania lub None, gdy stanu nie da się tak opisać
+    """
+    steps = journal_steps(old_done, old_undone, done, undone)
+    if steps is None:
+        return None
+    return [MOVE + encode_entry(entry) if kind == MOVE else kind for kind, entry in steps]
+
+def recover_game(checkpoint: bytes, log: bytes = b"",
+                 transfer_listener: Optional[Callable[[Time], None]] = None):
+    """
+    Odtwarza grę z punktu kontrolnego i dziennika.
+
+    Args:
+        checkpoint (bytes): Zapis punktu kontrolnego
+        log (bytes): Zawartość dziennika
+        transfer_listener (Callable[[Time], None], optional): Nasłuchiwacz transferów odtworzonej gry
+
+    Returns:
+        tuple[SolitareGame, int, bool]: Odtworzona gra, liczba powtórzonych rekordów
+            oraz czy dziennik należał do punktu kontrolnego i został powtórzony w całości
+
+    Raises:
+        SaveFormatError: Jeśli punkt kontrolny jest uszkodzony
+    """
+    game = decode_game(checkpoint)
+    replayed = 0
+    complete = log[:_LOG_HEADER.size] == log_header(checkpoint)
+    if complete:
+        offset = _LOG_HEADER.size
+        while offset < len(log):
+            record = log[offset:offset + 1]
+            if record == UNDO:
+                applied, offset = game.undo(), offset + 1
+            elif record == REDO:
+                applied, offset = game.redo(), offset + 1
+            elif record == MOVE and offset + 1 + ENTRY_SIZE <= len(log):
+                applied = game.apply_move(decode_entry(log, offset + 1).move)
+                offset += 1 + ENTRY_SIZE
+            else:
+                applied = False  # Niepełny ostatni rekord po przerwanym dopisywaniu
+            if not applied:
+                complete = False
+                break
+            replayed += 1
+    game.transfer_listener = transfer_listener
+    return game, replayed, complete
+
+class GameSaver:
+    """
+    Zapisuje grę w tle jako punkty kontrolne i dopisywany dziennik ruchów.
+
+    Attributes:
+        path (str): Ścieżka pliku punktu kontrolnego
+        log_path (str): Ścieżka pliku dziennika
+        checkpoint_interval (int): Liczba rekordów dziennika między punktami kontrolnymi
+        writer (AutosaveWriter): Wątek zapisujący pliki
+        checkpoints (int): Liczba zapisanych punktów kontrolnych
+    """
+
+    def __init__(self, path: str, log_path: str, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        """
+        Tworzy zapisującego grę.
+
+        Args:
+            path (str): Ścieżka pliku punktu kontrolnego
+            log_path (str): Ścieżka pliku dziennika
+            checkpoint_interval (int): Liczba rekordów dziennika między punktami kontrolnymi
+        """
+        self.path = path
+        self.log_path = log_path
+        self.checkpoint_interval = checkpoint_interval
+        self.writer = AutosaveWriter(path, log_path)
+        self.checkpoints = 0
+        self._game = None
+        self._done: list[JournalEntry] = []
+        self._undone: list[JournalEntry] = []
+        self._since_checkpoint = 0
+        self._failed = 0
+
+    def save(self, game) -> None:
+        """
+        Zapisuje zmiany gry od poprzedniego zapisu.
+
+        Jeśli któryś z wcześniejszych zapisów się nie powiódł, zapisywany jest
+        pełny punkt kontrolny - dziennik na dysku nie zawiera wtedy wszystkich
+        zmian, więc nie można do niego dopisywać.
+
+        Args:
+            game (SolitareGame): Gra do zapisania
+        """
+        done = game.journal.entries()
+        undone = game.journal.undone_entries()
+        records = None
+        failed, self._failed = self._failed, self.writer.failed
+        if game is self._game and failed == self._failed:
+            records = journal_delta(self._done, self._undone, done, undone)
+        if records is None or self._since_checkpoint + len(records) >= self.checkpoint_interval:
+            checkpoint = encode_game(game)
+            self.writer.submit(checkpoint, log_header(checkpoint))
+            self.checkpoints += 1
+            self._since_checkpoint = 0
+        else:
+            for record in records:
+                self.writer.append(record)
+            self._since_checkpoint += len(records)
+        self._game, self._done, self._undone = game, done, undone
+
+    def exists(self) -> bool:
+        """
+        Sprawdza czy na dysku jest zapis gry.
+
+        Returns:
+            bool: True jeśli plik punktu kontrolnego istnieje
+        """
+        self.writer.flush()
+        return os.path.exists(self.path)
+
+    def load(self, transfer_listener: Optional[Callable[[Time], None]] = None):
+        """
+        Wczytuje grę z punktu kontrolnego i dziennika.
+
+        Kolejne zapisy wczytanej gry są dopisywane do tego samego dziennika.
+
+        Args:
+            transfer_listener (Callable[[Time], None], optional): Nasłuchiwacz transferów wczytanej gry
+
+        Returns:
+            SolitareGame: Wczytana gra
+
+        Raises:
+            FileNotFoundError: Jeśli plik punktu kontrolnego nie istnieje
+            SaveFormatError: Jeśli punkt kontrolny jest uszkodzony
+        """
+        self.writer.flush()
+        with open(self.path, "rb") as file:
+            checkpoint = file.read()
+        log = b""
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as file:
+                log = file.read()
+        game, replayed, complete = recover_game(checkpoint, log, transfer_listener)
+        # Do dziennika z nieużytymi rekordami nie można dopisywać - następny zapis będzie punktem kontrolnym
+        self._game = game if complete else None
+        self._done = game.journal.entries()
+        self._undone = game.journal.undone_entries()
+        self._since_checkpoint = replayed
+        return game
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Zapisuje oczekujące zmiany i zatrzymuje wątek zapisu.
+
+        Args:
+            timeout (float, optional): Maksymalny czas oczekiwania w sekundach
+        """
+        self.writer.close(timeout)
@@ -0,0 +1,197 @@
+"""
+Symulacja wielu rozgrywek bez interfejsu.
+
+Rozgrywki są prowadzone na CompactState, bez nasłuchiwaczy i obiektów
+Transfer, więc pętla ruchów robi tylko to, co konieczne. Każdy proces
+roboczy dostaje własne ziarno, z którego losuje numery rozdań i wybory
+ruchów, a statystyki procesów są na końcu łączone.
+"""
+
+import random
+from multiprocessing import Pool
+from time import perf_counter
+from core.compact import CompactState
+from core.deal import deal_compact, DEAL_NUMBER_BITS
+from core.enums import Difficulty
+from core.solver import ordered_moves
+
+POLICIES = ("random", "greedy")
+DEFAULT_MAX_MOVES = 1000  # Limit ruchów jednej rozgrywki (dobieranie może trwać w nieskończoność)
+
+class SimulationStats:
+    """
+    Zbiorcze statystyki rozgrywek.
+
+    Attributes:
+        playouts (int): Liczba rozegranych partii
+        wins (int): Liczba wygranych partii
+        moves (int): Łączna liczba wykonanych ruchów
+        foundation_cards (int): Łączna liczba kart położonych na fundamentach
+        elapsed (float): Czas symulacji w sekundach
+    """
+
+    def __init__(self, playouts: int = 0, wins: int = 0, moves: int = 0, foundation_cards: int = 0,
+                 elapsed: float = 0.0):
+        self.playouts = playouts
+        self.wins = wins
+        self.moves = moves
+        self.foundation_cards = foundation_cards
+        self.elapsed = elapsed
+
+    def add_playout(self, won: bool, moves: int, foundation_cards: int) -> None:
+        """
+        Dolicza wynik jednej partii.
+
+        Args:
+            won (bool): Czy partia została wygrana
+            moves (int): Liczba wykonanych ruchów
+            foundation_cards (int): Liczba kart na fundamentach na końcu partii
+        """
+        self.playouts += 1
+        self.wins += won
+        self.moves += moves
+        self.foundation_cards += foundation_cards
+
+    def merge(self, other: 'SimulationStats') -> None:
+        """
+        Dolicza statystyki innego procesu (czasy nie są sumowane).
+
+        Args:
+            other (SimulationStats): Statystyki do dołączenia
+        """
+        self.playouts += other.playouts
+        self.wins += other.wins
+        self.moves += other.moves
+        self.foundation_cards += other.foundation_cards
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.playouts if self.playouts else 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"SimulationStats(playouts={self.playouts}, wins={self.wins}, moves={self.moves}, "
+                f"foundation_cards={self.foundation_cards}, elapsed={self.elapsed:.3f}s)")
+
+def playout(state: CompactState, rng: random.Random, policy: str = "random",
+            max_moves: int = DEFAULT_MAX_MOVES) -> tuple[CompactState, int]:
+    """
+    Rozgrywa partię do wygranej, braku ruchów albo limitu ruchów.
+
+    Polityka "random" wybiera losowy dozwolony ruch. Polityka "greedy"
+    wybiera najlepiej oceniony ruch (w kolejności solvera), który nie
+    prowadzi do pozycji odwiedzonej już w tej partii.
+
+    Args:
+        state (CompactState): Stan początkowy (może zostać zmodyfikowany)
+        rng (random.Random): Generator do losowania ruchów
+        policy (str): "random" lub "greedy"
+        max_moves (int): Maksymalna liczba ruchów
+
+    Returns:
+        tuple[CompactState, int]: Stan końcowy i liczba wykonanych ruchów
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}.")
+
+    seen = {state.key()} if policy == "greedy" else None
+    for moves in range(max_moves):
+        if state.is_won():
+            return state, moves
+
+        if policy == "random":
+            candidates = state.legal_moves()
+            if not candidates:
+                return state, moves
+            state.apply_move(rng.choice(candidates))
+            continue
+
+        for move in ordered_moves(state):
+            child = state.copy()
+            child.apply_move(move)
+            key = child.key()
+            if key not in seen:
+                seen.add(key)
+                state = child
+                break
+        else:
+            return state, moves
+    return state, max_moves
+
+def run_batch(task: tuple) -> SimulationStats:
+    """
+    Rozgrywa serię partii z jednego ziarna (funkcja wykonywana w procesie puli).
+
+    Args:
+        task (tuple): (ziarno, liczba partii, polityka, nazwa trudności, limit ruchów)
+
+    Returns:
+        SimulationStats: Statystyki serii
+    """
+    seed, playouts, policy, difficulty, max_moves = task
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    start = perf_counter()
+    for _ in range(playouts):
+        state = deal_compact(rng.getrandbits(DEAL_NUMBER_BITS), Difficulty[difficulty])
+        state, moves = playout(state, rng, policy, max_moves)
+        stats.add_playout(state.is_won(), moves, sum(state.foundations))
+    stats.elapsed = perf_counter() - start
+    return stats
+
+def worker_seeds(seed: int, workers: int) -> list[int]:
+    """
+    Wyprowadza niezależne ziarna procesów roboczych z jednego ziarna.
+
+    Args:
+        seed (int): Ziarno całej symulacji
+        workers (int): Liczba procesów
+
+    Returns:
+        list[int]: Ziarno dla każdego procesu
+    """
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(workers)]
+
+def simulate(playouts: int, policy: str = "random", difficulty: Difficulty = Difficulty.HARD, seed: int = 0,
+             workers: int = 1, max_moves: int = DEFAULT_MAX_MOVES) -> SimulationStats:
+    """
+    Rozgrywa podaną liczbę partii, opcjonalnie na wielu procesach.
+
+    Partie są dzielone równo między procesy, każdy z własnym ziarnem
+    wyprowadzonym z seed, więc wynik zależy tylko od argumentów, a nie od
+    kolejności zakończenia procesów.
+
+    Args:
+        playouts (int): Liczba partii
+        policy (str): "random" lub "greedy"
+        difficulty (Difficulty): Poziom trudności rozdań
+        seed (int): Ziarno symulacji
+        workers (int): Liczba procesów (1 = bez puli procesów)
+        max_moves (int): Limit ruchów jednej partii
+
+    Returns:
+        SimulationStats: Połączone statystyki, elapsed to czas całej symulacji
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}.")
+
+    workers = max(1, min(workers, playouts))
+    tasks = [(worker_seed, playouts // workers + (i < playouts % workers), policy, difficulty.name, max_moves)
+             for i, worker_seed in enumerate(worker_seeds(seed, workers))]
+
+    start = perf_counter()
+    if workers == 1:
+        results = [run_batch(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(run_batch, tasks)
+
+    stats = SimulationStats()
+    for result in results:
+        stats.merge(result)
+    stats.elapsed = perf_counter() - start
+    return stats
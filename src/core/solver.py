@@ -0,0 +1,152 @@
+"""
+Solver pasjansa oparty na przeszukiwaniu w głąb z tablicą transpozycji.
+
+Solver pracuje na CompactState, więc przyjmuje zarówno SolitareGame,
+jak i gotowy zwarty stan. Przeszukiwanie jest ograniczone liczbą węzłów
+i czasem, dzięki czemu pamięć tablicy transpozycji i czas pracy są
+zawsze skończone.
+"""
+
+from time import perf_counter
+from typing import Optional
+from core.compact import CompactState
+from core.enums import SolveStatus, TransferType
+from core.move import Move
+
+DEFAULT_MAX_NODES = 200_000   # Domyślny limit odwiedzonych pozycji
+DEFAULT_MAX_SECONDS = 10.0    # Domyślny limit czasu w sekundach
+_TIME_CHECK_INTERVAL = 1024   # Co ile węzłów sprawdzany jest zegar
+
+class SolveResult:
+    """
+    Wynik działania solvera.
+
+    Attributes:
+        status (SolveStatus): Wygrana, brak wygranej lub wynik nieznany
+        moves (list[Move]): Wygrywająca sekwencja ruchów (pusta gdy jej brak)
+        nodes (int): Liczba odwiedzonych pozycji
+        elapsed (float): Czas przeszukiwania w sekundach
+    """
+
+    def __init__(self, status: SolveStatus, moves: list[Move], nodes: int, elapsed: float):
+        self.status = status
+        self.moves = moves
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"SolveResult({self.status.value}, moves={len(self.moves)}, nodes={self.nodes}, elapsed={self.elapsed:.3f}s)"
+
+def _move_priority(state: CompactState, move: Move) -> int:
+    """
+    Ocenia ruch na potrzeby kolejności przeszukiwania (wyżej = wcześniej).
+
+    Args:
+        state (CompactState): Stan przed ruchem
+        move (Move): Oceniany ruch
+
+    Returns:
+        int: Priorytet ruchu
+    """
+    source, source_index, depth, target, _ = move
+    if target == TransferType.FOUNDATION:
+        return 100
+    if source == TransferType.TABLEAU:
+        if depth > 0 and depth == state.hidden[source_index]:
+            return 80  # Odkrywa zakrytą kartę
+        if depth == 0:
+            return 40  # Opróżnia kolumnę
+        return 8       # Przenosi tylko część sekwencji
+    if source == TransferType.STOCK and target == TransferType.TABLEAU:
+        return 60
+    if move.is_draw:
+        return 10
+    return 5
+
+def ordered_moves(state: CompactState) -> list[Move]:
+    """
+    Zwraca ruchy do przeszukania w kolejności od najbardziej obiecujących.
+
+    Jeśli istnieje bezpieczny ruch na fundament, zwracany jest tylko on -
+    taki ruch nigdy nie pogarsza pozycji, więc nie trzeba rozważać innych.
+
+    Args:
+        state (CompactState): Aktualny stan
+
+    Returns:
+        list[Move]: Ruchy do sprawdzenia
+    """
+    moves = state.legal_moves()
+    for move in moves:
+        if move.target != TransferType.FOUNDATION:
+            break
+        if move.source == TransferType.TABLEAU:
+            card = state.tableau[move.source_index][-1]
+        else:
+            card = state.waste[-1]
+        if state.is_safe_to_found(card):
+            return [move]
+    moves.sort(key=lambda move: _move_priority(state, move), reverse=True)
+    return moves
+
+def solve(game, max_nodes: int = DEFAULT_MAX_NODES, max_seconds: Optional[float] = DEFAULT_MAX_SECONDS) -> SolveResult:
+    """
+    Szuka wygrywającej sekwencji ruchów dla podanej pozycji.
+
+    Przeszukuje pozycje w głąb, zaczynając od najlepiej ocenionych ruchów.
+    Każda odwiedzona pozycja trafia do tablicy transpozycji (kluczem jest
+    CompactState.key(), niezależny od kolejności kolumn), więc ta sama
+    pozycja nie jest rozwijana dwa razy. Liczba pozycji w tablicy nie
+    przekracza max_nodes.
+
+    Args:
+        game (SolitareGame | CompactState): Pozycja do rozwiązania
+        max_nodes (int): Maksymalna liczba odwiedzonych pozycji
+        max_seconds (float, optional): Maksymalny czas przeszukiwania; None wyłącza limit
+
+    Returns:
+        SolveResult: WON z ruchami, UNWINNABLE gdy przeszukano całą
+            przestrzeń pozycji, UNKNOWN gdy skończył się budżet
+    """
+    start = perf_counter()
+    state = game.copy() if isinstance(game, CompactState) else CompactState.from_game(game)
+
+    if state.is_won():
+        return SolveResult(SolveStatus.WON, [], 1, perf_counter() - start)
+
+    deadline = None if max_seconds is None else start + max_seconds
+    seen = {state.key()}
+    stack = [(state, iter(ordered_moves(state)))]
+    path = []
+    nodes = 1
+
+    while stack:
+        current, moves = stack[-1]
+        move = next(moves, None)
+        if move is None:
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+
+        child = current.copy()
+        child.apply_move(move)
+        key = child.key()
+        if key in seen:
+            continue
+        seen.add(key)
+        nodes += 1
+        path.append(move)
+
+        if child.is_won():
+            return SolveResult(SolveStatus.WON, path, nodes, perf_counter() - start)
+        if nodes >= max_nodes:
+            break
+        if deadline is not None and nodes % _TIME_CHECK_INTERVAL == 0 and perf_counter() > deadline:
+            break
+
+        stack.append((child, iter(ordered_moves(child))))
+    else:
+        return SolveResult(SolveStatus.UNWINNABLE, [], nodes, perf_counter() - start)
+
+    return SolveResult(SolveStatus.UNKNOWN, [], nodes, perf_counter() - start)
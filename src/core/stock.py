@@ -1,47 +1,247 @@
 # filepath: c:\Users\rogal\Desktop\Dev\pasjans\src\core\stock.py
 import random
-from core.card import Card
+from typing import Optional
+from core.card import Card, CARDS, CARD_COUNT, card_index
 from core.enums import Suit, Rank, Difficulty, TransferType
 from core.difficulty import get_draw_amount
+from core import zobrist
+
+class StockCycle:
+    """
+    Index of the top waste card after any number of draws of one size.
+
+    Built by simulating draws (with the same recycling as Stock.draw_cards)
+    until the stock and waste repeat; from draw `start` on the tops repeat
+    every `period` draws. advance() follows one real draw without rebuilding.
+    """
+
+    __slots__ = ("_tops", "_start", "_period", "_position", "_reachable")
+
+    def __init__(self, cards: list, waste: list, draw_amount: int):
+        cards, waste = list(cards), list(waste)
+        seen = {}
+        tops = []
+        while True:
+            state = (tuple(cards), tuple(waste))
+            if state in seen:
+                break
+            seen[state] = len(tops)
+            tops.append(waste[-1] if waste else None)
+            if not cards:
+                if not waste:
+                    break
+                cards, waste = waste, []
+            for _ in range(draw_amount):
+                if not cards:
+                    break
+                waste.append(cards.pop())
+        self._tops = tuple(tops)
+        self._start = seen.get(state, 0)
+        self._period = len(tops) - self._start
+        self._position = 0
+        self._reachable = None
+
+    def top_after(self, draws: int) -> Optional[Card]:
+        """Returns the top waste card after the given number of draws (None for an empty waste)"""
+        draws += self._position
+        if draws >= self._start:
+            draws = self._start + (draws - self._start) % self._period
+        return self._tops[draws]
+
+    def reachable(self) -> dict:
+        """Maps every card that can become the top of the waste to the fewest draws needed"""
+        if self._reachable is None:
+            reachable = {}
+            for draws in range(max(self._start - self._position, 0) + self._period):
+                card = self.top_after(draws)
+                if card is not None and card not in reachable:
+                    reachable[card] = draws
+            self._reachable = reachable
+        return self._reachable
+
+    def period(self) -> int:
+        """Number of draws after which the stock and waste come back to the same order"""
+        return self._period
+
+    def advance(self):
+        """Moves the index forward by one draw"""
+        self._position += 1
+        if self._position >= self._start + self._period:
+            self._position -= self._period
+        self._reachable = None
+
+    def copy(self) -> 'StockCycle':
+        cycle = StockCycle.__new__(StockCycle)
+        cycle._tops = self._tops
+        cycle._start = self._start
+        cycle._period = self._period
+        cycle._position = self._position
+        cycle._reachable = self._reachable
+        return cycle
+
+class WasteView:
+    """
+    Read-only view of the visible top of the waste pile, from the lowest visible
+    card to the playable one. It reads the stock directly, so it stays current
+    after draws and never copies cards.
+    """
+
+    __slots__ = ("_stock", "_limit")
+
+    def __init__(self, stock: 'Stock', limit: int):
+        self._stock = stock
+        self._limit = limit
+
+    def __len__(self):
+        return min(self._limit, self._stock.get_waste_count())
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        length = len(self)
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError("waste view index out of range")
+        stock = self._stock
+        return stock._waste_card(stock.get_waste_count() - length + position)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, WasteView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"WasteView({list(self)})"
 
 class Stock:
-    def __init__(self):
-        self._cards = []
-        self._waste = []
+    """
+    Stock and waste kept in one buffer of slots, one slot per card.
+
+    The stock grows from the front of the buffer (its top card is the last one)
+    and the waste from the back (its top card is the first one), so drawing
+    only moves the two boundaries. When the stock runs out, recycling the waste
+    just flips which end of the buffer is the front - no cards are copied.
+    Taking the waste top leaves a free slot between the piles, which the next
+    draws fill. Copies share the buffer until one of them writes to a slot.
+    """
+
+    def __init__(self, cards: Optional[list[Card]] = None):
+        """
+        Creates a shuffled full deck, or a stock holding exactly the given cards
+        (already dealt from a full deck, so no deck is built or shuffled).
+        """
+        self._slots = []
+        self._shared = False
+        self._forward = True
+        self._stock_end = 0
+        self._waste_start = 0
         self.initial_card_amount = 0
-        self.create_deck()
-        self.shuffle_deck()
+        self._hash = 0
+        self._cycles = {}
+        self._views = {}
+        if cards is None:
+            self.create_deck()
+            self.shuffle_deck()
+        else:
+            self.set_piles(cards, [])
+            self.initial_card_amount = CARD_COUNT
+
+    def _at(self, position: int) -> Card:
+        return self._slots[position if self._forward else len(self._slots) - 1 - position]
+
+    def _put(self, position: int, card: Card):
+        if self._shared:
+            self._slots = self._slots.copy()
+            self._shared = False
+        self._slots[position if self._forward else len(self._slots) - 1 - position] = card
+
+    def _waste_card(self, depth: int) -> Card:
+        """Returns the waste card at the given position, counting from the bottom of the waste"""
+        return self._at(len(self._slots) - 1 - depth)
+
+    def _flip(self):
+        """Turns the buffer around, so the stock becomes the waste and the other way round"""
+        size = len(self._slots)
+        self._forward = not self._forward
+        self._stock_end, self._waste_start = size - self._waste_start, size - self._stock_end
+
+    def set_piles(self, cards: list[Card], waste: list[Card]):
+        """Replaces the stock and waste (both listed from bottom to top)"""
+        self._slots = list(cards) + list(reversed(waste))
+        self._shared = False
+        self._forward = True
+        self._stock_end = self._waste_start = len(cards)
+        self.rehash()
+
+    def stock_cards(self) -> list[Card]:
+        """Returns a copy of the stock, from the bottom to the next card to draw"""
+        if self._forward:
+            return self._slots[:self._stock_end]
+        return self._slots[len(self._slots) - self._stock_end:][::-1]
+
+    def waste_cards(self) -> list[Card]:
+        """Returns a copy of the waste, from the bottom to the playable card"""
+        if self._forward:
+            return self._slots[self._waste_start:][::-1]
+        return self._slots[:len(self._slots) - self._waste_start]
 
     def create_deck(self):
-        self._cards = [Card(suit, rank) for suit in Suit for rank in Rank]
-        self._waste.clear()
-        self.initial_card_amount = len(self._cards)
+        self.set_piles(list(CARDS), [])
+        self.initial_card_amount = CARD_COUNT
 
     def shuffle_deck(self):
-        random.shuffle(self._cards)
+        cards = self.stock_cards()
+        random.shuffle(cards)
+        self.set_piles(cards, self.waste_cards())
+
+    def rehash(self):
+        """Recomputes the Zobrist hash after the piles were changed directly."""
+        self._hash = zobrist.stock_hash([card_index(card) for card in self.stock_cards()],
+                                        [card_index(card) for card in self.waste_cards()])
+        self._cycles = {}
+
+    def zobrist_hash(self) -> int:
+        return self._hash
 
     def draw_cards(self, difficulty: Difficulty = Difficulty.HARD):
         """
         Draws cards from the stock pile to the waste pile.
         If stock is empty, moves all waste cards back to stock.
         """
-        if len(self._cards) == 0:
-            if self._waste:
-                self._cards = self._waste.copy()
-                self._waste.clear()
+        draw_amount = get_draw_amount(difficulty)
+        # Only the index for this draw size still describes the piles after the draw
+        cycle = self._cycles.get(draw_amount)
+        if self._stock_end == 0:
+            if self._waste_start < len(self._slots):
+                self._flip()
+                self.rehash()
             else:
                 return []
 
-        draw_amount = get_draw_amount(difficulty)
         drawn_cards = []
-
+        size = len(self._slots)
         for _ in range(draw_amount):
-            if self._cards:
-                drawn_cards.append(self._cards.pop())
-            else:
+            if not self._stock_end:
                 break
+            self._stock_end -= 1
+            card = self._at(self._stock_end)
+            self._waste_start -= 1
+            if self._waste_start != self._stock_end:
+                self._put(self._waste_start, card)
+            index = card_index(card)
+            self._hash ^= zobrist.STOCK_KEYS[self._stock_end][index]
+            self._hash ^= zobrist.WASTE_KEYS[size - 1 - self._waste_start][index]
+            drawn_cards.append(card)
 
-        self._waste.extend(drawn_cards)
+        self._cycles = {}
+        if cycle is not None:
+            cycle.advance()
+            self._cycles[draw_amount] = cycle
         return drawn_cards
     
     def remove_card_from_waste(self, card: Card):
@@ -49,80 +249,159 @@ class Stock:
         Removes a specific card from the waste pile.
         Used when a card is moved to foundations or tableau.
         """
-        if card in self._waste:
-            self._waste.remove(card)
+        if card is self.get_top_waste_card():
+            self.draw_top_card_from_waste()
+            return True
+        waste = self.waste_cards()
+        if card in waste:
+            waste.remove(card)
+            self.set_piles(self.stock_cards(), waste)
             return True
         return False
     
-    def get_waste(self, difficulty: Difficulty = Difficulty.HARD):
+    def get_waste(self, difficulty: Difficulty = Difficulty.HARD) -> WasteView:
         """
         Returns the visible cards in the waste pile based on difficulty.
         
         In easy mode (draw 1): show only the last card
         In hard mode (draw 3): show up to the last 3 cards
+        The result is a read-only view that follows later draws.
         """
-        if not self._waste:
-            return []
-        
         draw_amount = get_draw_amount(difficulty)
-        # Show the last 'draw_amount' cards, or all cards if fewer exist
-        return self._waste[-draw_amount:] if len(self._waste) >= draw_amount else self._waste.copy()
+        view = self._views.get(draw_amount)
+        if view is None:
+            view = self._views[draw_amount] = WasteView(self, draw_amount)
+        return view
     
     def get_top_waste_card(self):
         """Returns the topmost (playable) card from waste, or None if waste is empty"""
-        return self._waste[-1] if self._waste else None
+        return self._at(self._waste_start) if self._waste_start < len(self._slots) else None
     
     def get_remaining_cards(self):
-        return len(self._cards)
+        return self._stock_end
+
+    def get_waste_count(self):
+        """Number of cards in the waste pile"""
+        return len(self._slots) - self._waste_start
     
+    def get_card_count(self):
+        """Number of cards left in the stock and waste together"""
+        return self._stock_end + len(self._slots) - self._waste_start
+
+    def stock_cycle(self, difficulty: Difficulty = Difficulty.HARD) -> StockCycle:
+        """Returns the draw index for the current stock and waste, building it on first use"""
+        draw_amount = get_draw_amount(difficulty)
+        cycle = self._cycles.get(draw_amount)
+        if cycle is None:
+            cycle = self._cycles[draw_amount] = StockCycle(self.stock_cards(), self.waste_cards(), draw_amount)
+        return cycle
+
+    def reachable_cards(self, difficulty: Difficulty = Difficulty.HARD) -> dict[Card, int]:
+        """Maps every card that draws can bring to the top of the waste to the fewest draws needed"""
+        return self.stock_cycle(difficulty).reachable()
+
+    def draws_until(self, card: Card, difficulty: Difficulty = Difficulty.HARD) -> Optional[int]:
+        """Number of draws until the card is the top of the waste, or None if it never gets there"""
+        return self.reachable_cards(difficulty).get(card)
+
+    def top_after(self, draws: int, difficulty: Difficulty = Difficulty.HARD) -> Optional[Card]:
+        """Returns the top waste card after the given number of draws"""
+        return self.stock_cycle(difficulty).top_after(draws)
+
     def is_empty(self):
-        return not self._cards and not self._waste
+        return self.get_card_count() == 0
     
     def reset(self):
         """Reset all waste cards back to stock pile"""
-        self._cards = self._waste.copy()
-        self._waste.clear()
+        self.set_piles(self.waste_cards(), [])
 
     def remove_random_card(self):
         """Remove a random card from stock (used during game setup)"""
-        if self._cards:
-            return self._cards.pop(random.randint(0, len(self._cards) - 1))
+        if self._stock_end:
+            cards = self.stock_cards()
+            card = cards.pop(random.randint(0, len(cards) - 1))
+            self.set_piles(cards, self.waste_cards())
+            return card
         return None
 
     def get_type():
         return TransferType.STOCK
     
     def is_waste_empty(self):
-        return not self._waste
+        return self._waste_start == len(self._slots)
 
     def draw_top_card_from_waste(self) -> Card:
         """
         Removes and returns the topmost card from the waste pile.
         This is the card that would be played when moving from stock.
         """
-        if self._waste:
-            return self._waste.pop()
-        return None
+        card = self.get_top_waste_card()
+        if card is not None:
+            self._waste_start += 1
+            self._hash ^= zobrist.WASTE_KEYS[self.get_waste_count()][card_index(card)]
+            self._cycles = {}
+        return card
+    
+    def return_to_waste(self, card: Card):
+        """
+        Puts a card back on top of the waste pile.
+        Used when undoing a move that took the card from the waste.
+        """
+        if self._waste_start == self._stock_end:
+            # No free slot between the piles - the card was not taken from this stock
+            self.set_piles(self.stock_cards(), self.waste_cards() + [card])
+            return
+        self._hash ^= zobrist.WASTE_KEYS[self.get_waste_count()][card_index(card)]
+        self._waste_start -= 1
+        self._put(self._waste_start, card)
+        self._cycles = {}
+
+    def undraw_cards(self, count: int, recycled: bool = False):
+        """
+        Reverts draw_cards: moves the last count waste cards back to the stock.
+        If the draw recycled the waste, the stock is turned back into waste.
+        """
+        size = len(self._slots)
+        for _ in range(count):
+            card = self._at(self._waste_start)
+            index = card_index(card)
+            self._hash ^= zobrist.WASTE_KEYS[size - 1 - self._waste_start][index]
+            self._hash ^= zobrist.STOCK_KEYS[self._stock_end][index]
+            if self._waste_start != self._stock_end:
+                self._put(self._stock_end, card)
+            self._waste_start += 1
+            self._stock_end += 1
+        self._cycles = {}
+
+        if recycled:
+            self._flip()
+            self.rehash()
     
     def can_draw_from_waste(self, difficulty: Difficulty = Difficulty.HARD) -> bool:
         """
         Checks if there are cards available to draw from the waste pile.
         """
-        return len(self._waste) > 0
+        return not self.is_waste_empty()
     
     def can_draw(self) -> bool:
         """Check if we can draw cards from the stock pile"""
-        return len(self._cards) > 0 or len(self._waste) > 0
+        return self.get_card_count() > 0
     
     def get_card_percent(self) -> float:
         total_cards = self.initial_card_amount
         if total_cards == 0:
             return 0.0
-        return (len(self._cards) + len(self._waste)) / total_cards
+        return self.get_card_count() / total_cards
     
     def copy(self) -> 'Stock':
-        new_stock = Stock()
-        new_stock._cards = self._cards.copy()
-        new_stock._waste = self._waste.copy()
+        new_stock = Stock.__new__(Stock)
+        new_stock._slots = self._slots
+        new_stock._shared = self._shared = True
+        new_stock._forward = self._forward
+        new_stock._stock_end = self._stock_end
+        new_stock._waste_start = self._waste_start
         new_stock.initial_card_amount = self.initial_card_amount
+        new_stock._hash = self._hash
+        new_stock._cycles = {amount: cycle.copy() for amount, cycle in self._cycles.items()}
+        new_stock._views = {}
         return new_stock
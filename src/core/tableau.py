@@ -1,6 +1,8 @@
-from core.pile_part import PilePart, create_pile
-from core.card import Card
+from core.pile_part import Pile, create_pile
+from core.card import Card, card_index
 from core.enums import Rank, TransferType
+from core import zobrist
+from core.rules import CAN_STACK, CAN_START_COLUMN
 from typing import Optional, List, Union
 
 class Tableau:
@@ -8,18 +10,19 @@ class Tableau:
     
     def __init__(self):
         self.piles = [None] * self.PILE_COUNT
+        self._column_hashes = [0] * self.PILE_COUNT
+        self._hidden_count = 0
 
     def _is_valid_index(self, idx: int) -> bool:
         return 0 <= idx < self.PILE_COUNT
     
-    def get_pile(self, idx: int) -> Optional[PilePart]:
+    def get_pile(self, idx: int) -> Optional[Pile]:
         if self._is_valid_index(idx):
             return self.piles[idx]
         return None
     
     def _is_valid_sequence_pair(self, card1: Card, card2: Card) -> bool:
-        return (card1.rank.value == card2.rank.value + 1 and 
-                not card1.is_same_color(card2))
+        return CAN_STACK[card1.index][card2.index]
         
     def can_place_card(self, card: Card, idx: int) -> bool:
         if not self._is_valid_index(idx):
@@ -27,32 +30,22 @@ class Tableau:
             
         pile = self.piles[idx]
         if not pile:
-            return card.rank == Rank.KING
+            return CAN_START_COLUMN[card.index]
             
-        top = pile.get_last().get_card()
-        return self._is_valid_sequence_pair(top, card)
-        
-    def _get_card_at_depth(self, idx: int, depth: int) -> Optional[PilePart]:
-        pile = self.get_pile(idx)
-        if not pile:
-            return None
-        return pile.get_at_depth(depth)
+        return CAN_STACK[pile.top().index][card.index]
         
     def can_move_sequence(self, idx: int, depth: int) -> bool:
-        current = self._get_card_at_depth(idx, depth)
-        if not current:
+        pile = self.get_pile(idx)
+        if not pile or not 0 <= depth < len(pile):
             return False
             
-        if not current.next:
-            return True
-            
-        return self._is_valid_sequence(current)
+        return self._is_valid_sequence(pile, depth)
     
-    def can_place_sequence(self, start_part: PilePart, to_idx: int) -> bool:
+    def can_place_sequence(self, start_part: Pile, to_idx: int) -> bool:
         if not self._is_valid_index(to_idx):
             return False
             
-        if not start_part or not start_part.next:
+        if not start_part or len(start_part) < 2:
             return False
             
         if not self._is_valid_sequence(start_part):
@@ -60,16 +53,10 @@ class Tableau:
             
         return self._can_place_on_destination(start_part.get_card(), to_idx)
     
-    def _is_valid_sequence(self, start_part: PilePart) -> bool:
-        current = start_part
-        while current.next:
-            card1 = current.get_card()
-            card2 = current.next.get_card()
-            
-            if not self._is_valid_sequence_pair(card1, card2):
+    def _is_valid_sequence(self, pile: Pile, depth: int = 0) -> bool:
+        for i in range(depth, len(pile) - 1):
+            if not CAN_STACK[pile.card_at(i).index][pile.card_at(i + 1).index]:
                 return False
-                
-            current = current.next
             
         return True
 
@@ -77,24 +64,36 @@ class Tableau:
         to_pile = self.piles[to_idx]
         
         if not to_pile:
-            return card.rank == Rank.KING
+            return CAN_START_COLUMN[card.index]
         else:
-            destination_card = to_pile.get_last().get_card()
-            return self._is_valid_sequence_pair(destination_card, card)
+            return CAN_STACK[to_pile.top().index][card.index]
     
-    def _detach_from_source(self, from_idx: int, depth: int) -> None:
-        if depth == 0:
+    def _part_hash(self, part: Optional[Pile], depth: int) -> int:
+        result = 0
+        for i, card in enumerate(part or ()):
+            result ^= zobrist.tableau_key(depth + i, card_index(card), part.is_face_down(i))
+        return result
+
+    def detach_pile(self, from_idx: int, depth: int) -> Pile:
+        """Cuts the pile at the given depth and returns the cut part."""
+        pile = self.piles[from_idx]
+        part = pile.split(depth)
+        self._column_hashes[from_idx] ^= self._part_hash(part, depth)
+        self._hidden_count -= part.first_face_up()
+        if not pile:
             self.piles[from_idx] = None
-        else:
-            self.piles[from_idx].get_at_depth(depth - 1).next = None
+        return part
     
-    def _attach_to_destination(self, cards_to_move: PilePart, to_idx: int) -> None:
+    def attach_pile(self, cards_to_move: Pile, to_idx: int) -> None:
+        """Puts a detached part on top of the pile without checking the rules."""
         to_pile = self.piles[to_idx]
+        self._column_hashes[to_idx] ^= self._part_hash(cards_to_move, self.get_pile_size(to_idx))
+        self._hidden_count += cards_to_move.first_face_up()
         
         if not to_pile:
             self.piles[to_idx] = cards_to_move
         else:
-            to_pile.get_last().next = cards_to_move
+            to_pile.extend(cards_to_move)
 
     def move_pile(self, from_idx: int, to_idx: int, depth: int) -> bool:
         if not self._is_valid_index(from_idx) or not self._is_valid_index(to_idx):
@@ -103,15 +102,13 @@ class Tableau:
         if from_idx == to_idx or not self.piles[from_idx]:
             return False
         
-        cards_to_move = self._get_card_at_depth(from_idx, depth)
-        if not cards_to_move or not self.can_move_sequence(from_idx, depth):
+        if not self.can_move_sequence(from_idx, depth):
             return False
         
-        if not self._can_place_on_destination(cards_to_move.get_card(), to_idx):
+        if not self._can_place_on_destination(self.piles[from_idx].card_at(depth), to_idx):
             return False
         
-        self._detach_from_source(from_idx, depth)
-        self._attach_to_destination(cards_to_move, to_idx)
+        self.attach_pile(self.detach_pile(from_idx, depth), to_idx)
         
         # Reveal the new top card in the source pile if it exists and is hidden
         self._reveal_top_card(from_idx)
@@ -122,6 +119,7 @@ class Tableau:
         if not self.can_place_card(card, idx):
             return False
             
+        self._column_hashes[idx] ^= zobrist.tableau_key(self.get_pile_size(idx), card_index(card), False)
         if not self.piles[idx]:
             self.piles[idx] = create_pile(card)
         else:
@@ -129,31 +127,19 @@ class Tableau:
             
         return True
 
-    def _get_second_to_last(self, pile: PilePart) -> Optional[PilePart]:
-        if not pile.next:
-            return None
-            
-        current = pile
-        while current.next.next:
-            current = current.next
-            
-        return current
-
     def remove_top_card(self, idx: int) -> Optional[Card]:
         if not self._is_valid_index(idx) or not self.piles[idx]:
             return None
             
         pile = self.piles[idx]
-        
-        if not pile.next:
-            card = pile.get_card()
+        hidden = pile.is_face_down(len(pile) - 1)
+        card = pile.pop()
+        self._column_hashes[idx] ^= zobrist.tableau_key(len(pile), card_index(card), hidden)
+        self._hidden_count -= hidden
+        if not pile:
             self.piles[idx] = None
             return card
         
-        second_to_last = self._get_second_to_last(pile)
-        card = second_to_last.next.get_card()
-        second_to_last.next = None
-        
         self._reveal_top_card(idx)
         
         return card
@@ -161,7 +147,7 @@ class Tableau:
     def get_top_card(self, idx: int) -> Optional[Card]:
         pile = self.get_pile(idx)
         if pile:
-            return pile.get_last().get_card()
+            return pile.top()
         return None
 
     def is_pile_empty(self, idx: int) -> bool:
@@ -172,29 +158,31 @@ class Tableau:
         if not pile:
             return 0
             
-        return self._count_cards_in_pile(pile)
+        return len(pile)
     
-    def _count_cards_in_pile(self, pile: PilePart) -> int:
-        count = 1
-        current = pile
-        while current.next:
-            count += 1
-            current = current.next
-            
-        return count
-    
-    def _reveal_top_card(self, idx: int) -> None:
+    def _set_top_card_hidden(self, idx: int, hidden: bool) -> bool:
         if not self._is_valid_index(idx):
-            return
+            return False
             
         pile = self.get_pile(idx)
         if pile:
-            top_card = pile.get_last().get_card()
-            if top_card.hidden:
-                top_card.hidden = False
+            if pile.set_top_hidden(hidden):
+                depth, card = len(pile) - 1, card_index(pile.top())
+                self._column_hashes[idx] ^= zobrist.tableau_key(depth, card, True) ^ zobrist.tableau_key(depth, card, False)
+                self._hidden_count += 1 if hidden else -1
+                return True
+        return False
+
+    def _reveal_top_card(self, idx: int) -> bool:
+        return self._set_top_card_hidden(idx, False)
                 
-    def reveal_top_card_if_hidden(self, idx: int) -> None:
-        self._reveal_top_card(idx)
+    def reveal_top_card_if_hidden(self, idx: int) -> bool:
+        """Reveals the top card, returns True if it was hidden."""
+        return self._reveal_top_card(idx)
+
+    def hide_top_card(self, idx: int) -> bool:
+        """Turns the top card face down again (used when undoing a reveal)."""
+        return self._set_top_card_hidden(idx, True)
     
     def get_type():
         return TransferType.TABLEAU
@@ -202,12 +190,33 @@ class Tableau:
     def remove_pile(self, idx: int) -> bool:
         if not self._is_valid_index(idx):
             return False
+        if self.piles[idx]:
+            self._hidden_count -= self.piles[idx].first_face_up()
         self.piles[idx] = None
+        self._column_hashes[idx] = 0
         return True
+
+    def rehash(self) -> None:
+        """Recomputes the column hashes and counters after the piles were changed directly."""
+        self._column_hashes = [self._part_hash(pile, 0) for pile in self.piles]
+        self._hidden_count = sum(pile.first_face_up() for pile in self.piles if pile)
+
+    def hidden_count(self) -> int:
+        """Number of face-down cards left in the tableau."""
+        return self._hidden_count
+
+    def zobrist_hash(self) -> int:
+        return zobrist.tableau_hash(self._column_hashes)
+
+    def canonical_hash(self) -> int:
+        """Hash that does not depend on the order of the piles."""
+        return zobrist.canonical_tableau_hash(self._column_hashes)
     
     def copy(self) -> 'Tableau':
         new_tableau = Tableau()
         for i in range(self.PILE_COUNT):
             if self.piles[i]:
                 new_tableau.piles[i] = self.piles[i].copy()
-        return new_tableau
\ No newline at end of file
+        new_tableau._column_hashes = self._column_hashes.copy()
+        new_tableau._hidden_count = self._hidden_count
+        return new_tableau
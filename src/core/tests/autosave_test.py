@@ -0,0 +1,98 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import os
+import threading
+
+import pytest
+
+from core.autosave import AutosaveWriter
+
+def test_writes_latest_snapshot_atomically(tmp_path):
+    path = str(tmp_path / "save.bin")
+    writer = AutosaveWriter(path)
+    for i in range(200):
+        writer.submit(bytes([i]) * 10)
+    assert writer.flush(timeout=5)
+
+    with open(path, "rb") as file:
+        assert file.read() == bytes([199]) * 10
+    assert not os.path.exists(path + ".tmp")
+    assert writer.requested == 200
+    assert writer.written + writer.coalesced == 200
+    assert writer.failed == 0
+    writer.close()
+
+def test_bursts_are_coalesced(tmp_path):
+    path = str(tmp_path / "save.bin")
+    writer = AutosaveWriter(path)
+    release = threading.Event()
+    write = writer._replace
+
+    def slow_write(path, data):
+        release.wait(5)
+        write(path, data)
+
+    writer._replace = slow_write
+    writer.submit(b"first")
+    for i in range(10):
+        writer.submit(b"burst %d" % i)
+    release.set()
+    writer.close(timeout=5)
+
+    with open(path, "rb") as file:
+        assert file.read() == b"burst 9"
+    # Pierwszy zapis mógł już trwać; z serii zapisuje się tylko ostatni
+    assert writer.written <= 2
+    assert writer.coalesced >= 9
+
+def test_close_flushes_and_rejects_new_snapshots(tmp_path):
+    path = str(tmp_path / "save.bin")
+    writer = AutosaveWriter(path)
+    writer.submit(b"last")
+    writer.close(timeout=5)
+    with open(path, "rb") as file:
+        assert file.read() == b"last"
+    with pytest.raises(RuntimeError):
+        writer.submit(b"late")
+
+def test_failed_write_is_counted(tmp_path):
+    writer = AutosaveWriter(str(tmp_path / "missing" / "save.bin"))
+    writer.submit(b"data")
+    assert writer.flush(timeout=5)
+    assert (writer.written, writer.failed) == (0, 1)
+    assert isinstance(writer.last_error, OSError)
+    writer.close()
+
+def test_log_is_not_appended_after_failed_checkpoint(tmp_path):
+    path, log_path = str(tmp_path / "save.bin"), str(tmp_path / "save.log")
+    writer = AutosaveWriter(path, log_path)
+    writer.submit(b"checkpoint 1", b"log 1:")
+    writer.append(b"a")
+    assert writer.flush(timeout=5)
+
+    write = writer._replace
+
+    def failing_write(path, data):
+        raise OSError("disk full")
+
+    writer._replace = failing_write
+    writer.submit(b"checkpoint 2", b"log 2:")
+    assert writer.flush(timeout=5)
+    writer._replace = write
+
+    # Rekordy należą do niezapisanego punktu kontrolnego, więc nie trafiają do starego dziennika
+    writer.append(b"b")
+    assert writer.flush(timeout=5)
+    with open(log_path, "rb") as file:
+        assert file.read() == b"log 1:a"
+    assert writer.failed == 2
+
+    writer.submit(b"checkpoint 3", b"log 3:")
+    writer.append(b"c")
+    writer.close(timeout=5)
+    with open(path, "rb") as file:
+        assert file.read() == b"checkpoint 3"
+    with open(log_path, "rb") as file:
+        assert file.read() == b"log 3:c"
@@ -0,0 +1,67 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+import numpy as np
+import pytest
+from core.batch import BatchState, action_for_move, ACTION_COUNT, DRAW_ACTION, NO_ACTION, COLUMN_CAPACITY
+from core.compact import CompactState
+from core.enums import Difficulty
+from core.game import SolitareGame
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def assert_same_state(batch, n, game):
+    expected = CompactState.from_game(game)
+    actual = batch.to_state(n)
+    assert actual.tableau == expected.tableau
+    assert actual.hidden == expected.hidden
+    assert actual.stock == expected.stock
+    assert actual.waste == expected.waste
+    assert actual.foundations == expected.foundations
+
+def test_batch_matches_core_rules():
+    rng = random.Random(9)
+    games = [SolitareGame(difficulty, mock_transfer_listener, deal_number=n)
+             for n in range(6) for difficulty in Difficulty]
+    batch = BatchState.from_states([CompactState.from_game(game) for game in games])
+
+    for _ in range(120):
+        mask, depths = batch.legal_actions()
+        assert mask.shape == (len(games), ACTION_COUNT)
+        actions = []
+        for n, game in enumerate(games):
+            moves = batch.moves(n, mask, depths)
+            assert sorted(map(action_for_move, moves)) == sorted(map(action_for_move, game.legal_moves()))
+            assert set(moves) == set(game.legal_moves())
+
+            move = rng.choice(moves)
+            assert game.apply_move(move)
+            actions.append(action_for_move(move))
+        batch.apply(np.array(actions), depths)
+
+        for n, game in enumerate(games):
+            assert_same_state(batch, n, game)
+
+def test_no_action_leaves_game_unchanged():
+    games = [SolitareGame(Difficulty.HARD, mock_transfer_listener, deal_number=n) for n in range(2)]
+    batch = BatchState.from_states([CompactState.from_game(game) for game in games])
+    batch.apply(np.array([NO_ACTION, DRAW_ACTION]))
+    assert_same_state(batch, 0, games[0])
+    games[1].stock.draw_cards(games[1].difficulty)
+    assert_same_state(batch, 1, games[1])
+
+def test_is_won():
+    won = CompactState()
+    won.foundations = [13, 13, 13, 13]
+    batch = BatchState.from_states([won, CompactState()])
+    assert batch.is_won().tolist() == [True, False]
+
+def test_column_capacity():
+    state = CompactState()
+    state.tableau[0] = list(range(COLUMN_CAPACITY + 1))
+    with pytest.raises(ValueError):
+        BatchState.from_states([state])
@@ -32,5 +32,26 @@ def test_clone():
     cloned_card = card.clone()
     assert cloned_card.suit == card.suit, "Expected cloned card to have the same suit"
     assert cloned_card.rank == card.rank, "Expected cloned card to have the same rank"
-    # Weryfikacja czy klon jest innym obiektem
-    assert cloned_card is not card, "Expected cloned card to be a different object"
+    # Karty są niezmienne, więc klon jest tym samym obiektem
+    assert cloned_card is card, "Expected cloned card to be the same shared object"
+
+def test_cards_are_interned():
+    import copy
+    import pickle
+    from core.card import Card, CARDS, index_card
+
+    assert len(CARDS) == 52
+    card = create_card(Suit.SPADES, Rank.QUEEN)
+    assert Card(Suit.SPADES, Rank.QUEEN) is card
+    assert index_card(card.index) is card
+    assert copy.deepcopy(card) is card
+    assert pickle.loads(pickle.dumps(card)) is card
+
+def test_cards_are_immutable():
+    import pytest
+
+    card = create_card(Suit.HEARTS, Rank.TEN)
+    with pytest.raises(AttributeError):
+        card.rank = Rank.JACK
+    with pytest.raises(AttributeError):
+        card.hidden = True
@@ -0,0 +1,147 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+from core.compact import CompactState, card_index, index_card, CARD_RANK, CARD_SUIT, CARD_COLOR
+from core.card import create_card
+from core.enums import Suit, Rank, Color, Difficulty, TransferType
+from core.game import SolitareGame
+from core.move import DRAW
+from core.pile_part import create_pile
+from core.transfer import TableauTransfer, StockTransfer, FoundationTransfer
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def state_tuple(state):
+    return (state.tableau, state.hidden, state.stock, state.waste, state.foundations)
+
+def apply_with_transfers(game, move):
+    if move.is_draw:
+        game.stock.draw_cards(game.difficulty)
+        return True
+    if move.source == TransferType.TABLEAU:
+        source = TableauTransfer(game.tableau, move.source_index, move.depth)
+    else:
+        source = StockTransfer(game.stock)
+    if move.target == TransferType.TABLEAU:
+        target = TableauTransfer(game.tableau, move.target_index)
+    else:
+        target = FoundationTransfer(game.foundations, move.target_index)
+    return game.transfer(source, target)
+
+def test_card_tables():
+    for suit in Suit:
+        for rank in Rank:
+            card = create_card(suit, rank)
+            index = card_index(card)
+            assert 0 <= index < 52
+            assert CARD_RANK[index] == rank.value
+            assert CARD_COLOR[index] == card.get_color()
+            decoded = index_card(index)
+            assert decoded.suit == suit and decoded.rank == rank
+
+def test_from_game_roundtrip():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    state = CompactState.from_game(game)
+
+    assert [len(column) for column in state.tableau] == [1, 2, 3, 4, 5, 6, 7]
+    assert state.hidden == [0, 1, 2, 3, 4, 5, 6]
+    assert len(state.stock) + len(state.waste) == 24
+
+    restored = CompactState.from_game(state.to_game(mock_transfer_listener))
+    assert state_tuple(restored) == state_tuple(state)
+
+def test_copy_is_independent():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    state = CompactState.from_game(game)
+    copied = state.copy()
+    copied.apply_move(DRAW)
+    copied.tableau[0].clear()
+
+    assert state_tuple(state) != state_tuple(copied)
+    assert state_tuple(state) == state_tuple(CompactState.from_game(game))
+
+def test_stacking_and_foundation_rules():
+    state = CompactState()
+    king_hearts = card_index(create_card(Suit.HEARTS, Rank.KING))
+    queen_spades = card_index(create_card(Suit.SPADES, Rank.QUEEN))
+    queen_hearts = card_index(create_card(Suit.HEARTS, Rank.QUEEN))
+    ace_clubs = card_index(create_card(Suit.CLUBS, Rank.ACE))
+
+    assert state.can_stack(king_hearts, 0) == True
+    assert state.can_stack(queen_spades, 0) == False
+    state.tableau[0] = [king_hearts]
+    assert state.can_stack(queen_spades, 0) == True
+    assert state.can_stack(queen_hearts, 0) == False
+
+    assert state.can_found(ace_clubs) == True
+    assert state.can_found(queen_spades) == False
+    state.foundations[CARD_SUIT[queen_spades]] = 11
+    assert state.can_found(queen_spades) == True
+
+def test_moves_from_foundation():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles = [None] * 7
+    game.tableau.piles[0] = create_pile(create_card(Suit.SPADES, Rank.TWO))
+    game.foundations.attempt_place_card(create_card(Suit.HEARTS, Rank.ACE))
+    state = CompactState.from_game(game)
+
+    moves = [move for move in state.legal_moves() if move.source == TransferType.FOUNDATION]
+    assert len(moves) == 1
+    state.apply_move(moves[0])
+    assert state.foundations[CARD_SUIT[card_index(create_card(Suit.HEARTS, Rank.ACE))]] == 0
+    assert state.tableau[0][-1] == card_index(create_card(Suit.HEARTS, Rank.ACE))
+
+def test_moves_match_solitare_game():
+    random.seed(1234)
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener)
+        state = CompactState.from_game(game)
+        for _ in range(200):
+            moves = [move for move in state.legal_moves() if move.source != TransferType.FOUNDATION]
+            if not moves:
+                break
+            move = random.choice(moves)
+            assert apply_with_transfers(game, move), f"Game rejected {move}"
+            state.apply_move(move)
+            assert state_tuple(state) == state_tuple(CompactState.from_game(game))
+
+def test_is_won():
+    state = CompactState()
+    assert state.is_won() == False
+    state.foundations = [13, 13, 13, 13]
+    assert state.is_won() == True
+
+def test_key_ignores_column_order():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    state = CompactState.from_game(game)
+    swapped = state.copy()
+    swapped.tableau[0], swapped.tableau[6] = swapped.tableau[6], swapped.tableau[0]
+    swapped.hidden[0], swapped.hidden[6] = swapped.hidden[6], swapped.hidden[0]
+
+    assert state.key() == swapped.key()
+    swapped.apply_move(DRAW)
+    assert state.key() != swapped.key()
+
+def test_is_legal_matches_legal_moves():
+    from core.deal import deal_compact
+    from core.move import Move
+
+    rng = random.Random(11)
+    kinds = (TransferType.TABLEAU, TransferType.STOCK, TransferType.FOUNDATION)
+    for deal in range(3):
+        state = deal_compact(deal, Difficulty.EASY)
+        for _ in range(40):
+            legal = set(state.legal_moves())
+            for source in kinds:
+                for source_index in range(8):
+                    for depth in range(0, 20, 3):
+                        for target in kinds:
+                            for target_index in range(8):
+                                move = Move(source, source_index, depth, target, target_index)
+                                assert state.is_legal(move) == (move in legal), move
+            assert all(state.is_legal(move) for move in legal)
+            state.apply_move(rng.choice(sorted(legal, key=repr)))
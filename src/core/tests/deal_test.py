@@ -0,0 +1,58 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+import pytest
+from core.compact import CompactState
+from core.deal import shuffled_deck, deal_compact
+from core.enums import Difficulty
+from core.game import SolitareGame
+
+def test_shuffled_deck_is_deterministic():
+    assert shuffled_deck(42) == shuffled_deck(42)
+    assert shuffled_deck(42) != shuffled_deck(43)
+    assert sorted(shuffled_deck(7)) == list(range(52))
+
+def test_deal_layout():
+    state = deal_compact(5, Difficulty.EASY)
+    assert [len(column) for column in state.tableau] == [1, 2, 3, 4, 5, 6, 7]
+    assert state.hidden == [0, 1, 2, 3, 4, 5, 6]
+    assert len(state.waste) == 3
+    assert len(state.stock) == 21
+    assert state.foundations == [0, 0, 0, 0]
+    assert state.difficulty == Difficulty.EASY
+
+    cards = [card for column in state.tableau for card in column] + state.stock + state.waste
+    assert sorted(cards) == list(range(52))
+
+def test_deal_does_not_depend_on_global_random():
+    random.seed(1)
+    first = deal_compact(99).key()
+    random.seed(2)
+    assert deal_compact(99).key() == first
+
+def test_game_deal_matches_compact_deal():
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty, transfer_listener=None, deal_number=2**64 - 1)
+        assert game.deal_number == 2**64 - 1
+        assert CompactState.from_game(game).key() == deal_compact(2**64 - 1, difficulty).key()
+
+def test_game_deal_is_reproducible():
+    random.seed(1)
+    first = SolitareGame(Difficulty.HARD, transfer_listener=None, deal_number=123)
+    random.seed(2)
+    second = SolitareGame(Difficulty.HARD, transfer_listener=None, deal_number=123)
+    assert first.zobrist_hash() == second.zobrist_hash()
+    assert first.copy().zobrist_hash() == first.zobrist_hash()
+
+def test_random_deal_numbers():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=None)
+    assert 0 <= game.deal_number < 2**64
+    assert SolitareGame(Difficulty.HARD, transfer_listener=None, deal_number=game.deal_number).zobrist_hash() == game.zobrist_hash()
+
+def test_deal_number_out_of_range():
+    with pytest.raises(ValueError):
+        shuffled_deck(2**64)
+    with pytest.raises(ValueError):
+        shuffled_deck(-1)
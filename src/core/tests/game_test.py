@@ -5,6 +5,7 @@ add_parent_dir_to_path()
 from core.game import SolitareGame
 from core.enums import Difficulty
 from core.transfer import TableauTransfer, StockTransfer
+from .game_util import snapshot, malformed_variants
 
 def mock_transfer_listener(time_enum):
     """Mock transfer listener for testing"""
@@ -89,3 +90,256 @@ def test_game_invalid_transfer():
     # Original piles should remain unchanged
     assert game.tableau.get_pile(0) is not None  # Should still have cards from initial setup
     assert game.tableau.get_pile(1) is not None  # Should still have cards from initial setup
+
+def test_legal_moves_match_compact_state():
+    import random
+    from core.compact import CompactState
+
+    random.seed(4321)
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty=difficulty, transfer_listener=mock_transfer_listener)
+        for _ in range(150):
+            moves = game.legal_moves()
+            assert set(moves) == set(CompactState.from_game(game).legal_moves())
+            if not moves:
+                break
+            move = random.choice(moves)
+            assert game.apply_move(move) is True
+
+def test_apply_move_rejects_illegal_moves():
+    from core.move import Move
+    from core.enums import TransferType
+
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    # Hidden card at the bottom of pile 6
+    assert game.apply_move(Move(TransferType.TABLEAU, 6, 0, TransferType.TABLEAU, 0)) is False
+    # Empty foundation has nothing to offer
+    assert game.apply_move(Move(TransferType.FOUNDATION, 0, 0, TransferType.TABLEAU, 0)) is False
+    # Pile index out of range
+    assert game.apply_move(Move(TransferType.TABLEAU, 9, 0, TransferType.TABLEAU, 0)) is False
+
+def test_apply_move_rejects_malformed_moves_and_undo_restores_state():
+    import random
+
+    rng = random.Random(77)
+    for deal_number in range(6):
+        game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener, deal_number=deal_number)
+        for _ in range(120):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            before = snapshot(game)
+            for move in moves:
+                for variant in malformed_variants(move):
+                    assert game.apply_move(variant) is False, variant
+                assert game.apply_move(move) is True
+                assert game.undo() is True
+                assert snapshot(game) == before
+            game.apply_move(rng.choice(moves))
+
+def test_can_apply_move_matches_compact_is_legal():
+    import random
+    from core.compact import CompactState
+    from core.enums import TransferType
+    from core.move import Move
+
+    rng = random.Random(5)
+    kinds = (TransferType.TABLEAU, TransferType.STOCK, TransferType.FOUNDATION)
+    for deal_number in range(3):
+        game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=deal_number)
+        for _ in range(40):
+            state = CompactState.from_game(game)
+            for source in kinds:
+                for source_index in range(-1, 9):
+                    for depth in (0, 1, 2, 5, 12, 19):
+                        for target in kinds:
+                            for target_index in range(-1, 9):
+                                move = Move(source, source_index, depth, target, target_index)
+                                assert game.can_apply_move(move) == state.is_legal(move), move
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.apply_move(rng.choice(moves))
+
+def test_apply_move_notifies_listener():
+    from core.enums import Time
+    from core.move import DRAW
+
+    events = []
+    game = SolitareGame(difficulty=Difficulty.HARD, transfer_listener=events.append)
+    assert game.apply_move(DRAW) is True
+    assert events == [Time.PRE_MOVE, Time.POST_MOVE]
+
+def test_apply_move_from_foundation():
+    from core.card import create_card
+    from core.enums import Suit, Rank, TransferType
+    from core.move import Move
+
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles = [None] * 7
+    game.tableau.place_card(create_card(Suit.SPADES, Rank.KING), 0)
+    for rank in (Rank.ACE, Rank.TWO, Rank.THREE, Rank.FOUR, Rank.FIVE, Rank.SIX,
+                 Rank.SEVEN, Rank.EIGHT, Rank.NINE, Rank.TEN, Rank.JACK, Rank.QUEEN):
+        game.foundations.attempt_place_card(create_card(Suit.HEARTS, rank))
+
+    move = Move(TransferType.FOUNDATION, 0, 0, TransferType.TABLEAU, 0)
+    assert move in game.legal_moves()
+    assert game.apply_move(move) is True
+    assert game.tableau.get_top_card(0).rank == Rank.QUEEN
+    assert game.foundations.get_top_card(0).rank == Rank.JACK
+
+def test_counters_match_recount_during_play():
+    import random
+    from core.card import CARD_COUNT
+
+    rng = random.Random(77)
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty=difficulty, transfer_listener=mock_transfer_listener)
+        assert game.tableau.hidden_count() == 21
+        for _ in range(200):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            assert game.apply_move(rng.choice(moves))
+            if rng.random() < 0.2:
+                assert game.undo()
+            hidden = sum(pile.is_face_down(depth) for pile in game.tableau.piles if pile for depth in range(len(pile)))
+            on_foundations = sum(len(foundation.as_list()) for foundation in game.foundations.get_all())
+            assert game.tableau.hidden_count() == hidden
+            assert game.foundations.card_count() == on_foundations
+            assert game.progress() == on_foundations / CARD_COUNT
+            assert game.all_revealed() == (hidden == 0)
+            assert game.stock.get_card_count() + on_foundations + \
+                sum(len(pile) for pile in game.tableau.piles if pile) == CARD_COUNT
+
+def test_has_won_when_foundations_are_full():
+    from core.card import create_card
+    from core.enums import Suit, Rank
+    from core.stock import Stock
+
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    assert not game.has_won()
+    game.tableau.piles = [None] * 7
+    game.tableau.rehash()
+    game.stock = Stock([])
+    for suit in Suit:
+        for rank in Rank:
+            game.foundations.attempt_place_card(create_card(suit, rank))
+    assert game.all_revealed()
+    assert game.progress() == 1.0
+    assert game.has_won()
+
+def test_transfer_from_foundation_to_tableau():
+    from core.card import create_card
+    from core.enums import Suit, Rank, TransferType
+    from core.move import Move
+    from core.transfer import FoundationTransfer
+
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles = [None] * 7
+    game.tableau.place_card(create_card(Suit.SPADES, Rank.KING), 0)
+    for rank in (Rank.ACE, Rank.TWO, Rank.THREE, Rank.FOUR, Rank.FIVE, Rank.SIX,
+                 Rank.SEVEN, Rank.EIGHT, Rank.NINE, Rank.TEN, Rank.JACK, Rank.QUEEN):
+        game.foundations.attempt_place_card(create_card(Suit.HEARTS, rank))
+
+    source = FoundationTransfer(game.foundations, 0)
+    assert Move(*source.source(), *TableauTransfer(game.tableau, 0).destination()) == \
+        Move(TransferType.FOUNDATION, 0, 0, TransferType.TABLEAU, 0)
+    assert game.can_transfer(source, TableauTransfer(game.tableau, 0))
+    assert game.transfer(source, TableauTransfer(game.tableau, 0))
+    assert game.tableau.get_top_card(0).rank == Rank.QUEEN
+    assert game.foundations.get_top_card(0).rank == Rank.JACK
+
+def test_transfer_to_foundation_uses_card_suit():
+    from core.card import create_card
+    from core.enums import Suit, Rank, TransferType
+    from core.pile_part import create_pile
+    from core.transfer import FoundationTransfer
+
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles[1] = create_pile(create_card(Suit.CLUBS, Rank.ACE))
+    game.tableau.rehash()
+
+    # Any foundation slot accepts the card, it lands on its own suit
+    assert game.transfer(TableauTransfer(game.tableau, 1), FoundationTransfer(game.foundations, 0))
+    assert game.foundations.get_top_card(2).rank == Rank.ACE
+    assert game.journal.entries()[-1].move == (TransferType.TABLEAU, 1, 0, TransferType.FOUNDATION, 2)
+    assert game.undo()
+    assert game.tableau.get_top_card(1).rank == Rank.ACE
+
+def test_transfer_rejects_face_down_cards():
+    game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    before = game.zobrist_hash()
+    assert not game.can_transfer(TableauTransfer(game.tableau, 6, 0), TableauTransfer(game.tableau, 0))
+    assert not game.transfer(TableauTransfer(game.tableau, 6, 0), TableauTransfer(game.tableau, 0))
+    assert not game.transfer(StockTransfer(game.stock), StockTransfer(game.stock))
+    assert game.zobrist_hash() == before
+
+def test_auto_complete_finishes_revealed_game_in_one_batch():
+    from core.card import create_card, card_index
+    from core.compact import CompactState
+    from core.enums import Suit, Rank, Time
+
+    state = CompactState(Difficulty.EASY)
+    state.foundations = [10, 10, 10, 10]
+    columns = [(Suit.HEARTS, Suit.SPADES, Suit.HEARTS), (Suit.SPADES, Suit.HEARTS, Suit.SPADES),
+               (Suit.DIAMONDS, Suit.CLUBS, Suit.DIAMONDS), (Suit.CLUBS, Suit.DIAMONDS, Suit.CLUBS)]
+    for i, suits in enumerate(columns):
+        state.tableau[i] = [card_index(create_card(suit, rank))
+                            for suit, rank in zip(suits, (Rank.KING, Rank.QUEEN, Rank.JACK))]
+    events = []
+    game = state.to_game(events.append)
+
+    assert game.all_revealed()
+    done = game.auto_complete()
+    assert len(done) == 12
+    assert game.has_won()
+    assert events == [Time.PRE_MOVE, Time.POST_MOVE]
+    assert done[0][1].rank == Rank.JACK
+    assert len({card for _, card in done}) == 12
+    assert len(game.journal) == 12
+    assert game.undo() and not game.has_won()
+
+def test_auto_complete_only_plays_safe_cards():
+    import random
+    from core.compact import CompactState
+
+    rng = random.Random(9)
+    for _ in range(20):
+        game = SolitareGame(difficulty=Difficulty.EASY, transfer_listener=mock_transfer_listener)
+        for _ in range(rng.randint(0, 120)):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.apply_move(rng.choice(moves))
+        before = len(game.journal)
+        done = game.auto_complete()
+        assert len(game.journal) == before + len(done)
+        assert game.safe_foundation_move() is None
+        state = CompactState.from_game(game)
+        for move in state.legal_moves():
+            if move.target.is_foundation and move.source.is_tableau:
+                assert not state.is_safe_to_found(state.tableau[move.source_index][-1])
+
+def test_copy_shares_piles_until_moves():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    game.apply_move(game.legal_moves()[-1])
+    before = (game.zobrist_hash(), [pile.as_list() for pile in game.tableau.piles],
+              game.stock.waste_cards(), len(game.journal))
+
+    copied = game.copy()
+    assert copied.deal_number == game.deal_number
+    assert all(mine._cards is theirs._cards for mine, theirs in zip(game.tableau.piles, copied.tableau.piles))
+
+    for _ in range(40):
+        moves = copied.legal_moves()
+        if not moves:
+            break
+        copied.apply_move(moves[0])
+    while copied.undo():
+        pass
+
+    assert (game.zobrist_hash(), [pile.as_list() for pile in game.tableau.piles],
+            game.stock.waste_cards(), len(game.journal)) == before
+    game.rehash()
+    assert game.zobrist_hash() == before[0]
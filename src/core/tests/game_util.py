@@ -0,0 +1,39 @@
+from core.enums import TransferType
+
+def snapshot(game, journal=False):
+    """Return everything that makes up the position of a game, for comparing two games.
+
+    The position covers the tableau piles with their first face-up card, the stock,
+    the waste, the foundations and the Zobrist hash. With journal=True the done and
+    undone moves are compared too.
+    """
+    state = ([(pile.as_list(), pile.first_face_up()) if pile else None for pile in game.tableau.piles],
+             game.stock.stock_cards(), game.stock.waste_cards(),
+             [foundation.as_list() for foundation in game.foundations.foundations.values()],
+             game.zobrist_hash())
+    if journal:
+        state += (game.journal.entries(), game.journal.undone_entries())
+    return state
+
+def play(game, moves, saver=None):
+    """Apply the first legal move up to `moves` times, saving after each move if a saver is given."""
+    for _ in range(moves):
+        legal = game.legal_moves()
+        if not legal:
+            break
+        game.apply_move(legal[0])
+        if saver is not None:
+            saver.save(game)
+
+def malformed_variants(move):
+    """Return copies of a legal move with an index or depth the move cannot have."""
+    variants = []
+    if move.target == TransferType.FOUNDATION:
+        variants.append(move._replace(target_index=(move.target_index + 1) % 4))
+    if move.source == TransferType.STOCK:
+        variants += [move._replace(source_index=1), move._replace(depth=1)]
+    if move.is_draw:
+        variants.append(move._replace(target_index=1))
+    if move.source == TransferType.FOUNDATION:
+        variants.append(move._replace(depth=1))
+    return variants
@@ -0,0 +1,94 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+from core.card import create_card
+from core.enums import Suit, Rank, Difficulty, TransferType
+from core.game import SolitareGame
+from core.journal import Journal, JournalEntry
+from core.move import DRAW
+from core.pile_part import create_pile
+from core.transfer import TableauTransfer, StockTransfer, FoundationTransfer
+from .game_util import snapshot
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def test_journal_record_clears_redo():
+    journal = Journal()
+    journal.record(JournalEntry(DRAW, 3))
+    journal.record(JournalEntry(DRAW, 3))
+    assert journal.pop_undo() == JournalEntry(DRAW, 3)
+    assert journal.can_redo()
+    journal.record(JournalEntry(DRAW, 1))
+    assert not journal.can_redo()
+    assert len(journal) == 2
+
+def test_undo_redo_random_play():
+    rng = random.Random(6)
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener)
+        history = [snapshot(game)]
+        for _ in range(150):
+            assert game.apply_move(rng.choice(game.legal_moves()))
+            history.append(snapshot(game))
+
+        for expected in reversed(history[:-1]):
+            assert game.undo()
+            assert snapshot(game) == expected
+        assert not game.undo()
+
+        for expected in history[1:]:
+            assert game.redo()
+            assert snapshot(game) == expected
+        assert not game.redo()
+
+def test_undo_transfer_restores_hidden_card():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles[0] = create_pile(create_card(Suit.CLUBS, Rank.TWO), create_card(Suit.HEARTS, Rank.QUEEN), hidden=1)
+    game.tableau.piles[1] = create_pile(create_card(Suit.SPADES, Rank.KING))
+    game.rehash()
+    before = snapshot(game)
+
+    assert game.transfer(TableauTransfer(game.tableau, 0, 1), TableauTransfer(game.tableau, 1))
+    assert not game.tableau.piles[0].is_face_down(0)
+    assert game.journal.entries()[-1] == JournalEntry(
+        (TransferType.TABLEAU, 0, 1, TransferType.TABLEAU, 1), 1, True)
+
+    assert game.undo()
+    assert game.tableau.piles[0].is_face_down(0)
+    assert snapshot(game) == before
+
+def test_undo_stock_and_foundation_transfers():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.stock.return_to_waste(create_card(Suit.SPADES, Rank.ACE))
+    before = snapshot(game)
+
+    assert game.transfer(StockTransfer(game.stock), FoundationTransfer(game.foundations, 0))
+    assert game.journal.entries()[-1].move == (TransferType.STOCK, 0, 0, TransferType.FOUNDATION, 3)
+    assert game.undo()
+    assert snapshot(game) == before
+    assert game.redo()
+    top = game.foundations.get_top_card(3)
+    assert (top.suit, top.rank) == (Suit.SPADES, Rank.ACE)
+
+def test_undo_draw_that_recycled_waste():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    while game.stock.get_remaining_cards():
+        game.apply_move(DRAW)
+    before = snapshot(game)
+
+    assert game.apply_move(DRAW)
+    assert game.journal.entries()[-1].recycled
+    assert game.undo()
+    assert snapshot(game) == before
+
+def test_copy_keeps_journal():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    game.apply_move(DRAW)
+    copied = game.copy()
+    assert len(copied.journal) == 1
+    copied.undo()
+    assert len(game.journal) == 1
@@ -0,0 +1,80 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+from core.pile_part import Pile, create_pile
+from core.enums import Suit, Rank
+from core.card import create_card
+
+def make_pile():
+    return create_pile(create_card(Suit.CLUBS, Rank.TWO), create_card(Suit.HEARTS, Rank.FIVE),
+                       create_card(Suit.SPADES, Rank.KING), create_card(Suit.HEARTS, Rank.QUEEN),
+                       create_card(Suit.CLUBS, Rank.JACK), hidden=2)
+
+def test_create_empty_pile():
+    assert create_pile() is None
+
+def test_top_and_length():
+    pile = make_pile()
+    assert len(pile) == pile.length() == 5
+    assert pile.top().rank == Rank.JACK
+    assert pile.get_card().rank == Rank.TWO
+    assert pile.card_at(2).rank == Rank.KING
+    assert pile.first_face_up() == 2
+
+def test_add_and_pop():
+    pile = make_pile()
+    pile.add_card(create_card(Suit.DIAMONDS, Rank.TEN))
+    assert len(pile) == 6
+    assert pile.pop().rank == Rank.TEN
+    for _ in range(3):
+        pile.pop()
+    assert pile.first_face_up() == 2
+    assert pile.is_face_down(len(pile) - 1)
+
+def test_split_and_extend():
+    pile = make_pile()
+    part = pile.split(2)
+    assert [card.rank for card in part] == [Rank.KING, Rank.QUEEN, Rank.JACK]
+    assert part.first_face_up() == 0
+    assert len(pile) == 2 and pile.first_face_up() == 2
+
+    pile.extend(part)
+    assert len(pile) == 5
+    assert pile.first_face_up() == 2
+
+def test_set_top_hidden():
+    pile = make_pile()
+    pile.split(2)
+    assert pile.set_top_hidden(False)
+    assert not pile.set_top_hidden(False)
+    assert pile.first_face_up() == 1
+    assert pile.set_top_hidden(True)
+    assert pile.first_face_up() == 2
+
+def test_get_at_depth_copies_only_the_list():
+    pile = make_pile()
+    part = pile.get_at_depth(3)
+    assert len(part) == 2
+    part.pop()
+    assert len(pile) == 5
+    assert part.top() is pile.card_at(3)
+    assert pile.get_at_depth(5) is None
+
+def test_is_sorted():
+    pile = Pile([create_card(Suit.HEARTS, rank) for rank in (Rank.ACE, Rank.TWO, Rank.THREE)])
+    assert pile.is_sorted(reversed=True) is False
+    assert pile.is_sorted() is True
+
+def test_copy_shares_cards_until_written():
+    pile = make_pile()
+    copied = pile.copy()
+    assert copied._cards is pile._cards
+
+    copied.pop()
+    assert len(pile) == 5 and len(copied) == 4
+    part = pile.split(3)
+    assert len(pile) == 3 and len(copied) == 4
+    copied.extend(part)
+    assert [card.rank for card in copied] == [Rank.TWO, Rank.FIVE, Rank.KING, Rank.QUEEN, Rank.QUEEN, Rank.JACK]
+    assert len(pile) == 3
@@ -0,0 +1,64 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+from blessed.keyboard import Keystroke
+
+from core.card import create_card
+from core.enums import Difficulty, Suit, Rank
+from core.game import SolitareGame
+from core.stock import Stock
+from play_state import PlayState
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+class FakeOwner:
+    """Stands in for GameWrapper: holds the game and forwards undo/redo to it."""
+
+    def __init__(self, game):
+        self.game = game
+        self.states = []
+
+    def get_game(self):
+        return self.game
+
+    def undo(self):
+        if not self.game.undo():
+            raise ValueError("Nothing to undo...")
+
+    def redo(self):
+        if not self.game.redo():
+            raise ValueError("Nothing to redo...")
+
+    def set_state(self, state, force=False):
+        self.states.append(state)
+
+    def menu(self):
+        pass
+
+def test_undo_after_auto_complete_is_not_undone_again():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    game.tableau.piles = [None] * 7
+    game.stock = Stock([])
+    for index, suit in enumerate(Suit):
+        game.tableau.place_card(create_card(suit, Rank.KING), index)
+        for rank in list(Rank)[:-1]:
+            game.foundations.attempt_place_card(create_card(suit, rank))
+    game.tableau.rehash()
+
+    state = PlayState("play_state")
+    state.set_as_owner(FakeOwner(game))
+    state.on_input(None, Keystroke('a'))
+    assert game.foundations.card_count() == 52
+    state.flights = []
+
+    # Cofnięcie zdejmuje kartę z fundamentu i nie uruchamia ponownie automatycznego kończenia
+    state.on_input(None, Keystroke('z'))
+    assert game.foundations.card_count() == 51
+    assert game.journal.can_redo()
+
+    state.on_input(None, Keystroke('y'))
+    assert game.foundations.card_count() == 52
+    assert game.has_won()
@@ -0,0 +1,197 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+
+import pytest
+
+from core.game import SolitareGame
+from core.enums import Difficulty, ReplayAction
+from core.move import DRAW
+from core.replay import (Replay, ReplayStep, ReplayRecorder, ReplaySaver, encode_replay, decode_replay,
+                         verify_replay, verify_replay_data, verify_replay_files)
+from core.save_codec import SaveFormatError
+from .game_util import snapshot, malformed_variants
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        self.now += 0.5
+        return self.now
+
+def record_game(deal_number, difficulty, moves, seed=0):
+    rng = random.Random(seed)
+    game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener, deal_number=deal_number)
+    recorder = ReplayRecorder(clock=FakeClock())
+    recorder.record(game)
+    for _ in range(moves):
+        choice = rng.random()
+        if choice < 0.15 and game.undo() or choice < 0.25 and game.redo():
+            pass
+        else:
+            legal = game.legal_moves()
+            if not legal:
+                break
+            game.apply_move(rng.choice(legal))
+        recorder.record(game)
+    return game, recorder
+
+def record_replay(deal_number, difficulty, moves, seed=0):
+    return record_game(deal_number, difficulty, moves, seed)[1].replay
+
+def test_recorder_captures_moves_undo_and_redo():
+    game, recorder = record_game(7, Difficulty.HARD, 80)
+    game.undo()
+    game.undo()
+    recorder.record(game)
+    game.redo()
+    replay = recorder.record(game)
+    actions = {step.action for step in replay.steps}
+    assert actions == {ReplayAction.MOVE, ReplayAction.UNDO, ReplayAction.REDO}
+    assert [step.time for step in replay.steps] == sorted(step.time for step in replay.steps)
+    assert snapshot(replay.game()) == snapshot(game)
+
+def test_encode_decode_round_trip():
+    replay = record_replay(12345678901234, Difficulty.EASY, 60, seed=3)
+    decoded = decode_replay(encode_replay(replay))
+    assert decoded.deal_number == replay.deal_number
+    assert decoded.difficulty == Difficulty.EASY
+    assert decoded.steps == replay.steps
+    assert len(encode_replay(replay)) == len(encode_replay(Replay(1, Difficulty.EASY))) + 9 * len(replay)
+
+def test_decode_rejects_corrupted_data():
+    data = encode_replay(record_replay(5, Difficulty.HARD, 20))
+    with pytest.raises(SaveFormatError):
+        decode_replay(b"XXXX" + data[4:])
+    with pytest.raises(SaveFormatError):
+        decode_replay(data[:-3])
+    with pytest.raises(SaveFormatError):
+        decode_replay(data[:5])
+
+def test_recorder_starts_new_replay_for_new_game():
+    clock = FakeClock()
+    recorder = ReplayRecorder(clock=clock)
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=11)
+    recorder.record(game)
+    for _ in range(4):
+        game.apply_move(game.legal_moves()[0])
+        recorder.record(game)
+    game.undo()
+
+    # Gra wczytana z zapisu jest innym obiektem z tym samym dziennikiem
+    loaded = game.copy()
+    replay = recorder.record(loaded)
+    assert replay.deal_number == 11
+    assert [step.action for step in replay.steps] == [ReplayAction.MOVE] * 4 + [ReplayAction.UNDO]
+    assert all(step.time == 0 for step in replay.steps)
+    assert snapshot(replay.game()) == snapshot(loaded)
+
+def test_seek_positions_match_recorded_states():
+    rng = random.Random(1)
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=42)
+    recorder = ReplayRecorder(clock=FakeClock())
+    recorder.record(game)
+    states = [snapshot(game)]
+    for _ in range(30):
+        game.apply_move(rng.choice(game.legal_moves()))
+        recorder.record(game)
+        states.append(snapshot(game))
+    replay = recorder.replay
+    for position in (0, 1, 15, 30):
+        assert snapshot(replay.game(position)) == states[position]
+    assert replay.steps_until(replay.steps[9].time) == 10
+    assert replay.steps_until(-1) == 0
+    assert replay.steps_until(replay.duration()) == len(replay)
+
+def test_verify_accepts_recorded_replays():
+    for deal_number, difficulty in ((3, Difficulty.EASY), (4, Difficulty.HARD), (2 ** 63, Difficulty.HARD)):
+        game, recorder = record_game(deal_number, difficulty, 120, seed=deal_number % 97)
+        replay = recorder.replay
+        check = verify_replay(replay)
+        assert check.valid and check.steps == len(replay)
+        assert check.won == game.has_won()
+
+def test_verify_rejects_illegal_steps():
+    replay = record_replay(9, Difficulty.HARD, 20)
+    steps = [step for step in replay.steps if step.action == ReplayAction.MOVE]
+
+    # Powtórzenie ruchu, który przeniósł kartę, nie jest dozwolone
+    moved = next(step for step in steps if step.move != DRAW)
+    tampered = Replay(9, Difficulty.HARD, [moved, moved])
+    check = verify_replay(tampered)
+    assert not check.valid and check.steps == 1
+
+    assert not verify_replay(Replay(9, Difficulty.HARD, [ReplayStep(0, ReplayAction.UNDO)])).valid
+    assert not verify_replay(Replay(9, Difficulty.HARD, [ReplayStep(0, ReplayAction.REDO)])).valid
+    assert not verify_replay(Replay(10, Difficulty.HARD, replay.steps)).valid
+    assert not verify_replay_data(b"garbage").valid
+
+def test_verify_agrees_with_game_on_malformed_moves():
+    replay = record_replay(21, Difficulty.EASY, 80, seed=4)
+    tampered = 0
+    for index, step in enumerate(replay.steps):
+        if step.action != ReplayAction.MOVE:
+            continue
+        move = step.move
+        # Poza ruchami o złej postaci również sąsiednie stosy i głębokości, które bywają dozwolone
+        variants = malformed_variants(move) + [move._replace(source_index=move.source_index + 1),
+                                               move._replace(depth=move.depth + 1)]
+        for variant in variants:
+            candidate = Replay(21, Difficulty.EASY, replay.steps[:index] + [step._replace(move=variant)])
+            check = verify_replay(candidate)
+            try:
+                candidate.game()
+                playable = True
+            except ValueError:
+                playable = False
+            assert check.valid == playable, variant
+            tampered += not playable
+    assert tampered
+
+def test_verify_replay_files(tmp_path):
+    paths = []
+    for deal_number in range(5):
+        path = tmp_path / f"{deal_number}.replay"
+        path.write_bytes(encode_replay(record_replay(deal_number, Difficulty.HARD, 40, seed=deal_number)))
+        paths.append(str(path))
+    (tmp_path / "broken.replay").write_bytes(b"PSJR")
+    paths.append(str(tmp_path / "broken.replay"))
+
+    checks = verify_replay_files(paths)
+    assert [check.valid for check in checks] == [True] * 5 + [False]
+    assert verify_replay_files(paths, workers=2) == checks
+
+def test_replay_saver_writes_at_checkpoints_and_on_close(tmp_path):
+    path = str(tmp_path / "replay.bin")
+    saver = ReplaySaver(path, checkpoint_interval=10, clock=FakeClock())
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=31)
+    saver.record(game)
+    for _ in range(25):
+        game.apply_move(game.legal_moves()[0])
+        saver.save(game)
+    # Plik jest przepisywany co 10 kroków, a nie po każdym ruchu
+    assert saver.writes == 2
+    saver.writer.flush()
+    with open(path, "rb") as file:
+        assert len(decode_replay(file.read())) == 20
+
+    # Odczyt zapisuje najpierw brakujące kroki
+    assert saver.load().steps == saver.recorder.replay.steps
+    assert saver.writes == 3
+
+    # Nowa partia bez kroków nie zastępuje powtórki poprzedniej
+    saver.record(SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=32))
+    assert saver.exists() and saver.load().deal_number == 31
+
+    game.undo()
+    saver.save(game)
+    saver.close()
+    with open(path, "rb") as file:
+        assert decode_replay(file.read()).deal_number == 31
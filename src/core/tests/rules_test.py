@@ -0,0 +1,40 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+from core.card import CARDS, create_card
+from core.enums import Suit, Rank
+from core.foundations import Foundation
+from core.rules import CAN_STACK, CAN_START_COLUMN, NEXT_FOUNDATION, NO_CARD, STACKABLE_ON, KINGS
+
+def test_can_stack_matches_card_rules():
+    for top in CARDS:
+        for card in CARDS:
+            expected = top.rank.value == card.rank.value + 1 and not top.is_same_color(card)
+            assert CAN_STACK[top.index][card.index] == expected
+
+def test_stackable_lists():
+    queen_hearts = create_card(Suit.HEARTS, Rank.QUEEN)
+    assert sorted(CARDS[card].suit.name for card in STACKABLE_ON[create_card(Suit.SPADES, Rank.KING).index]) == \
+        ["DIAMONDS", "HEARTS"]
+    assert queen_hearts.index in STACKABLE_ON[create_card(Suit.CLUBS, Rank.KING).index]
+    assert [CARDS[card].rank for card in KINGS] == [Rank.KING] * 4
+    assert CAN_START_COLUMN[create_card(Suit.CLUBS, Rank.KING).index]
+    assert not CAN_START_COLUMN[queen_hearts.index]
+    assert [card.index for card in CARDS if CAN_START_COLUMN[card.index]] == KINGS
+
+def test_next_foundation_card():
+    for suit_index, suit in enumerate(Suit):
+        for count, rank in enumerate(Rank):
+            assert NEXT_FOUNDATION[suit_index][count] == create_card(suit, rank).index
+        assert NEXT_FOUNDATION[suit_index][len(Rank)] == NO_CARD
+    clubs = list(Suit).index(Suit.CLUBS)
+    assert NEXT_FOUNDATION[clubs][0] == create_card(Suit.CLUBS, Rank.ACE).index
+    assert NEXT_FOUNDATION[clubs][0] != create_card(Suit.CLUBS, Rank.TWO).index
+    assert NEXT_FOUNDATION[clubs][0] != create_card(Suit.SPADES, Rank.ACE).index
+
+def test_foundation_uses_next_card_table():
+    foundation = Foundation(Suit.DIAMONDS)
+    assert not foundation.can_place_card(create_card(Suit.HEARTS, Rank.ACE))
+    assert foundation.can_place_card(create_card(Suit.DIAMONDS, Rank.ACE))
+    assert not foundation.can_place_card(create_card(Suit.DIAMONDS, Rank.TWO))
@@ -0,0 +1,109 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import struct
+
+import pytest
+
+from core.game import SolitareGame
+from core.enums import Difficulty
+from core.journal import Journal
+from core.move import DRAW
+from core.save_codec import encode_game, decode_game, SaveFormatError, MAGIC, SAVE_VERSION, _HEADER, _HEADER_V1
+from .game_util import snapshot, play
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def test_fresh_game_is_about_100_bytes():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    data = encode_game(game)
+    assert data.startswith(MAGIC)
+    assert len(data) <= 100
+
+@pytest.mark.parametrize("difficulty", [Difficulty.EASY, Difficulty.HARD])
+def test_round_trip_keeps_position_and_history(difficulty):
+    game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener, deal_number=1234)
+    play(game, 40)
+    game.undo()
+    game.undo()
+
+    loaded = decode_game(encode_game(game), mock_transfer_listener)
+    assert loaded.difficulty == difficulty
+    assert loaded.deal_number == 1234
+    assert loaded.transfer_listener is mock_transfer_listener
+    assert snapshot(loaded) == snapshot(game)
+    assert loaded.zobrist_hash() == game.zobrist_hash()
+    assert loaded.journal.entries() == game.journal.entries()
+
+    # Historia działa po wczytaniu tak samo jak w oryginale
+    assert loaded.redo() and game.redo()
+    while game.undo():
+        assert loaded.undo()
+    assert snapshot(loaded) == snapshot(SolitareGame(difficulty, mock_transfer_listener, 1234))
+
+def test_newer_compatible_version_is_read():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    data = bytearray(encode_game(game))
+    # Nowsza wersja, która dopisała pole do nagłówka i sekcję na końcu pliku
+    header_size = data[6]
+    data[4] = SAVE_VERSION + 1
+    data[6] = header_size + 2
+    data[header_size:header_size] = b"\x00\x00"
+    data += b"future section"
+    assert snapshot(decode_game(bytes(data))) == snapshot(game)
+
+def test_incompatible_or_corrupt_data_is_rejected():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    data = encode_game(game)
+
+    newer = bytearray(data)
+    newer[5] = SAVE_VERSION + 1
+    with pytest.raises(SaveFormatError):
+        decode_game(bytes(newer))
+    with pytest.raises(SaveFormatError):
+        decode_game(b"\x80\x04dill-pickle")
+    with pytest.raises(SaveFormatError):
+        decode_game(data[:40])
+
+    duplicated = bytearray(data)
+    duplicated[-5] = duplicated[-6]
+    with pytest.raises(SaveFormatError):
+        decode_game(bytes(duplicated))
+
+def test_journal_longer_than_65535_moves_round_trips():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    game.apply_move(DRAW)
+    entry = game.journal.entries()[0]
+    game.journal = Journal.from_entries([entry] * 65536, [entry] * 70000)
+
+    loaded = decode_game(encode_game(game))
+    assert len(loaded.journal.entries()) == 65536
+    assert len(loaded.journal.undone_entries()) == 70000
+
+def test_version_1_header_is_read():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    play(game, 10)
+    data = encode_game(game)
+    magic, _, _, _, difficulty, deal_number, done, undone = _HEADER.unpack_from(data)
+    old = _HEADER_V1.pack(magic, 1, 1, _HEADER_V1.size, difficulty, deal_number, done, undone) + data[_HEADER.size:]
+
+    loaded = decode_game(old)
+    assert snapshot(loaded) == snapshot(game)
+    assert loaded.journal.entries() == game.journal.entries()
+
+def test_corrupt_journal_entries_are_rejected():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=77)
+    play(game, 30)
+    data = encode_game(game)
+    first_entry = len(data) - len(game.journal) * 4
+
+    # Indeksy stosów poza zakresem, zbyt duża liczba kart i rodzaj obszaru bez znaczenia
+    for position, value in ((1, 0xFF), (3, 200), (0, 0x03)):
+        for entry in range(len(game.journal)):
+            corrupt = bytearray(data)
+            corrupt[first_entry + entry * 4 + position] = value
+            with pytest.raises(SaveFormatError):
+                decode_game(bytes(corrupt))
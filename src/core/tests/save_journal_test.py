@@ -0,0 +1,126 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import os
+
+from core.game import SolitareGame
+from core.enums import Difficulty
+from core.save_journal import GameSaver, recover_game, journal_delta, UNDO, REDO, MOVE
+from .game_util import snapshot, play
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def test_journal_delta_describes_undo_redo_and_moves():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    for _ in range(3):
+        game.apply_move(game.legal_moves()[0])
+    done, undone = game.journal.entries(), game.journal.undone_entries()
+
+    game.undo()
+    game.undo()
+    records = journal_delta(done, undone, game.journal.entries(), game.journal.undone_entries())
+    assert records == [UNDO, UNDO]
+    game.redo()
+    # Cofnięcie i ponowienie tego samego ruchu się znoszą
+    records = journal_delta(done, undone, game.journal.entries(), game.journal.undone_entries())
+    assert records == [UNDO]
+    records = journal_delta(done[:1], done[:0:-1], game.journal.entries(), game.journal.undone_entries())
+    assert records == [REDO]
+
+    before = game.journal.entries(), game.journal.undone_entries()
+    game.apply_move(game.legal_moves()[-1])
+    records = journal_delta(*before, game.journal.entries(), game.journal.undone_entries())
+    assert len(records) == 1 and records[0][:1] == MOVE
+
+def test_moves_are_appended_between_checkpoints(tmp_path):
+    saver = GameSaver(str(tmp_path / "save.bin"), str(tmp_path / "save.log"), checkpoint_interval=10)
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener, deal_number=99)
+    saver.save(game)
+    saver.writer.flush()
+    checkpoint = os.path.getsize(tmp_path / "save.bin")
+    log = os.path.getsize(tmp_path / "save.log")
+
+    play(game, 5, saver)
+    saver.writer.flush()
+    assert saver.checkpoints == 1
+    assert os.path.getsize(tmp_path / "save.bin") == checkpoint
+    assert os.path.getsize(tmp_path / "save.log") == log + 5 * 5
+
+    play(game, 10, saver)
+    assert saver.checkpoints == 2
+    saver.close()
+
+def test_load_restores_exact_position(tmp_path):
+    paths = str(tmp_path / "save.bin"), str(tmp_path / "save.log")
+    saver = GameSaver(*paths, checkpoint_interval=7)
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener, deal_number=5)
+    saver.save(game)
+    play(game, 30, saver)
+    game.undo()
+    saver.save(game)
+    game.undo()
+    saver.save(game)
+    game.redo()
+    saver.save(game)
+    saver.close()
+
+    loader = GameSaver(*paths)
+    loaded = loader.load(mock_transfer_listener)
+    assert snapshot(loaded, journal=True) == snapshot(game, journal=True)
+    assert loaded.zobrist_hash() == game.zobrist_hash()
+    assert loaded.transfer_listener is mock_transfer_listener
+
+    # Wczytana gra dopisuje dalej do tego samego dziennika
+    play(loaded, 3, loader)
+    loader.close()
+    assert snapshot(GameSaver(*paths).load(), journal=True) == snapshot(loaded, journal=True)
+
+def test_recovery_ignores_torn_record_and_stale_log(tmp_path):
+    paths = str(tmp_path / "save.bin"), str(tmp_path / "save.log")
+    saver = GameSaver(*paths)
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    saver.save(game)
+    play(game, 4, saver)
+    saver.close()
+
+    with open(paths[0], "rb") as file:
+        checkpoint = file.read()
+    with open(paths[1], "rb") as file:
+        log = file.read()
+
+    # Przerwane dopisywanie: ostatni rekord jest niepełny
+    recovered, replayed, complete = recover_game(checkpoint, log[:-2])
+    assert replayed == 3 and not complete
+    # Dziennik innego punktu kontrolnego nie jest powtarzany
+    recovered, replayed, complete = recover_game(checkpoint, log[:4] + b"\x00\x00\x00\x00" + log[8:])
+    assert replayed == 0 and not complete
+    assert recovered.journal.entries() == []
+
+def test_failed_checkpoint_forces_next_checkpoint(tmp_path):
+    paths = str(tmp_path / "save.bin"), str(tmp_path / "save.log")
+    saver = GameSaver(*paths, checkpoint_interval=5)
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    saver.save(game)
+    play(game, 3, saver)
+    assert saver.writer.flush(timeout=5)
+
+    write = saver.writer._replace
+
+    def failing_write(path, data):
+        raise OSError("disk full")
+
+    saver.writer._replace = failing_write
+    play(game, 2, saver)
+    assert saver.writer.flush(timeout=5)
+    assert saver.writer.failed == 1
+    saver.writer._replace = write
+
+    # Zapis po błędzie jest pełnym punktem kontrolnym, a nie dopisaniem do starego dziennika
+    checkpoints = saver.checkpoints
+    play(game, 2, saver)
+    assert saver.checkpoints == checkpoints + 1
+    saver.close()
+    assert snapshot(GameSaver(*paths).load(), journal=True) == snapshot(game, journal=True)
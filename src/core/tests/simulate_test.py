@@ -0,0 +1,52 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+import pytest
+from core.compact import CompactState
+from core.deal import deal_compact
+from core.enums import Difficulty
+from core.simulate import SimulationStats, playout, run_batch, simulate, worker_seeds
+
+def test_playout_respects_move_limit():
+    state, moves = playout(deal_compact(1), random.Random(0), "random", max_moves=25)
+    assert moves == 25
+    assert sum(state.foundations) <= 52
+
+def test_greedy_playout_finishes_won_game():
+    state = CompactState()
+    state.foundations = [13, 13, 13, 12]
+    state.tableau[0] = [51]
+    final, moves = playout(state, random.Random(0), "greedy")
+    assert final.is_won()
+    assert moves == 1
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        playout(deal_compact(1), random.Random(0), "clever")
+
+def test_run_batch_is_deterministic():
+    task = (7, 5, "greedy", "EASY", 200)
+    first, second = run_batch(task), run_batch(task)
+    assert (first.playouts, first.wins, first.moves, first.foundation_cards) == \
+           (second.playouts, second.wins, second.moves, second.foundation_cards)
+    assert first.playouts == 5
+
+def test_simulate_splits_playouts_between_workers():
+    stats = simulate(7, "random", Difficulty.HARD, seed=3, workers=2, max_moves=20)
+    assert stats.playouts == 7
+    assert stats.moves <= 7 * 20
+    assert stats.elapsed > 0
+    assert stats.playouts_per_second > 0
+
+def test_worker_seeds_are_distinct():
+    seeds = worker_seeds(11, 8)
+    assert len(set(seeds)) == 8
+    assert seeds == worker_seeds(11, 8)
+
+def test_stats_merge():
+    stats = SimulationStats(2, 1, 40, 30)
+    stats.merge(SimulationStats(3, 0, 60, 10))
+    assert (stats.playouts, stats.wins, stats.moves, stats.foundation_cards) == (5, 1, 100, 40)
+    assert stats.win_rate == 0.2
@@ -0,0 +1,83 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+from core.compact import CompactState, card_index
+from core.card import create_card
+from core.enums import Suit, Rank, Difficulty, SolveStatus
+from core.game import SolitareGame
+from core.solver import solve, ordered_moves
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def hearts(*ranks):
+    return [card_index(create_card(Suit.HEARTS, rank)) for rank in ranks]
+
+def hearts_left_state(difficulty):
+    """All suits except hearts are on foundations, hearts wait in the stock."""
+    state = CompactState(difficulty)
+    state.foundations = [0, 13, 13, 13]
+    state.stock = hearts(*reversed(list(Rank)))
+    return state
+
+def test_solve_already_won():
+    state = CompactState()
+    state.foundations = [13, 13, 13, 13]
+    result = solve(state)
+    assert result.status == SolveStatus.WON
+    assert result.moves == []
+
+def test_solve_finds_winning_sequence():
+    for difficulty in Difficulty:
+        state = hearts_left_state(difficulty)
+        result = solve(state)
+
+        assert result.status == SolveStatus.WON
+        replay = state.copy()
+        for move in result.moves:
+            assert move in replay.legal_moves()
+            replay.apply_move(move)
+        assert replay.is_won()
+
+def test_solve_detects_unwinnable():
+    state = CompactState()
+    state.foundations = [0, 13, 13, 13]
+    # Ace of hearts is buried under the two, every other column ends with a heart
+    state.tableau = [hearts(Rank.ACE, Rank.TWO), hearts(Rank.THREE, Rank.FOUR), hearts(Rank.FIVE, Rank.SIX),
+                     hearts(Rank.SEVEN, Rank.EIGHT), hearts(Rank.NINE, Rank.TEN),
+                     hearts(Rank.JACK, Rank.QUEEN), hearts(Rank.KING)]
+    state.hidden = [1, 1, 1, 1, 1, 1, 0]
+
+    result = solve(state)
+    assert result.status == SolveStatus.UNWINNABLE
+    assert result.moves == []
+
+def test_solve_respects_node_budget():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    result = solve(game, max_nodes=2)
+    assert result.status in (SolveStatus.UNKNOWN, SolveStatus.UNWINNABLE)
+    assert result.nodes <= 2
+
+def test_solve_respects_time_budget():
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    result = solve(game, max_nodes=10**9, max_seconds=0)
+    assert result.status != SolveStatus.UNWINNABLE
+    assert result.elapsed < 5
+
+def test_solve_does_not_modify_input():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    state = CompactState.from_game(game)
+    before = state.key()
+    solve(state, max_nodes=500)
+    assert state.key() == before
+    assert CompactState.from_game(game).key() == before
+
+def test_safe_foundation_move_is_forced():
+    state = CompactState()
+    state.tableau[0] = hearts(Rank.ACE)
+    state.tableau[1] = [card_index(create_card(Suit.SPADES, Rank.KING))]
+    moves = ordered_moves(state)
+    assert len(moves) == 1
+    assert moves[0].target.is_foundation
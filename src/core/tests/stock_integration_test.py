@@ -5,7 +5,9 @@ managing waste, and transferring cards in an actual game context.
 """
 import pytest
 from core.game import SolitareGame
-from core.enums import Difficulty
+from core.card import create_card
+from core.enums import Difficulty, Suit, Rank, TransferType
+from core.move import Move
 from core.transfer import StockTransfer, TableauTransfer
 
 def mock_transfer_listener(time_enum):
@@ -17,14 +19,14 @@ def test_stock_integration_easy_mode():
     game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
     
     # Game setup draws cards during initialization, so let's clear and start fresh
-    initial_waste_count = len(game.stock._waste)
+    initial_waste_count = len(game.stock.waste_cards())
     
     # Draw cards from stock in easy mode
     drawn = game.stock.draw_cards(Difficulty.EASY)
     assert len(drawn) == 1, "Should draw 1 card in easy mode"
     
     # Verify waste has the previously drawn cards plus the new one
-    assert len(game.stock._waste) == initial_waste_count + 1
+    assert len(game.stock.waste_cards()) == initial_waste_count + 1
     assert game.stock.get_top_waste_card() == drawn[0]
     
     # Verify visible waste shows only 1 card in easy mode
@@ -37,21 +39,21 @@ def test_stock_integration_hard_mode():
     game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
     
     # Game setup draws cards during initialization, so track the initial state
-    initial_waste_count = len(game.stock._waste)
+    initial_waste_count = len(game.stock.waste_cards())
     
     # Draw cards from stock in hard mode
     drawn = game.stock.draw_cards(Difficulty.HARD)
     assert len(drawn) == 3, "Should draw 3 cards in hard mode"
     
     # Verify waste has the previously drawn cards plus the new ones
-    assert len(game.stock._waste) == initial_waste_count + 3
+    assert len(game.stock.waste_cards()) == initial_waste_count + 3
     assert game.stock.get_top_waste_card() == drawn[-1]  # Last card drawn is on top
     
     # Verify visible waste shows up to 3 cards in hard mode
     visible_waste = game.stock.get_waste(Difficulty.HARD)
     # Should show the last 3 cards (which are the ones we just drew)
     assert len(visible_waste) == 3
-    assert visible_waste == game.stock._waste[-3:]
+    assert visible_waste == game.stock.waste_cards()[-3:]
 
 def test_stock_transfer_integration():
     """Test that StockTransfer works correctly with the new stock logic"""
@@ -60,27 +62,29 @@ def test_stock_transfer_integration():
     # Draw cards to create waste
     game.stock.draw_cards(Difficulty.HARD)
     
+    # Put a king on top of the waste and clear the tableau so it can start a column
+    king = create_card(Suit.SPADES, Rank.KING)
+    stock_cards = [card for card in game.stock.stock_cards() if card != king]
+    waste_cards = [card for card in game.stock.waste_cards() if card != king]
+    game.stock.set_piles(stock_cards, waste_cards + [king])
+    game.tableau.piles = [None] * 7
+    game.tableau.rehash()
+
     # Create a stock transfer
     stock_transfer = StockTransfer(game.stock, Difficulty.HARD)
-    
-    # Check if we can create an offer
-    assert stock_transfer.stock.can_draw_from_waste()
-    
-    offer = stock_transfer.create_offer(None)
-    assert offer is not None
-    assert offer.item is not None
-    
-    # The offered card should be the top waste card
-    top_card = game.stock.get_top_waste_card()
-    assert offer.item == top_card
-    
-    # Complete the offer
-    initial_waste_count = len(game.stock._waste)
-    offer.complete()
-    
-    # Verify the card was removed from waste
-    assert len(game.stock._waste) == initial_waste_count - 1
-    assert top_card not in game.stock._waste
+    target = TableauTransfer(game.tableau, 0)
+    move = Move(*stock_transfer.source(), *target.destination())
+    assert move == Move(TransferType.STOCK, 0, 0, TransferType.TABLEAU, 0)
+    assert game.can_apply_move(move)
+
+    # Apply the move
+    initial_waste_count = len(game.stock.waste_cards())
+    assert game.apply_move(move)
+
+    # Verify the card was moved from waste to the tableau
+    assert len(game.stock.waste_cards()) == initial_waste_count - 1
+    assert king not in game.stock.waste_cards()
+    assert game.tableau.get_top_card(0) == king
 
 def test_stock_recycle_integration():
     """Test that stock properly recycles waste when stock is empty"""
@@ -88,13 +92,13 @@ def test_stock_recycle_integration():
     
     # Draw all cards from stock
     total_cards_drawn = 0
-    while game.stock._cards:
+    while game.stock.stock_cards():
         drawn = game.stock.draw_cards(Difficulty.EASY)
         total_cards_drawn += len(drawn)
     
     # Verify stock is empty but waste has cards
-    assert len(game.stock._cards) == 0
-    waste_count = len(game.stock._waste)
+    assert len(game.stock.stock_cards()) == 0
+    waste_count = len(game.stock.waste_cards())
     assert waste_count > 0
     
     # Draw again - should trigger recycling
@@ -102,18 +106,18 @@ def test_stock_recycle_integration():
     
     # Verify recycling worked
     assert len(drawn) == 1
-    assert len(game.stock._waste) == 1  # Only the newly drawn card
-    assert len(game.stock._cards) == waste_count - 1  # Remaining recycled cards
+    assert len(game.stock.waste_cards()) == 1  # Only the newly drawn card
+    assert len(game.stock.stock_cards()) == waste_count - 1  # Remaining recycled cards
 
 def test_stock_empty_scenario():
     """Test behavior when stock and waste are both empty"""
     game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
     
     # Exhaust all cards by drawing and removing them
-    while game.stock._cards or game.stock._waste:
-        if game.stock._cards:
+    while game.stock.stock_cards() or game.stock.waste_cards():
+        if game.stock.stock_cards():
             game.stock.draw_cards(Difficulty.EASY)
-        if game.stock._waste:
+        if game.stock.waste_cards():
             game.stock.draw_top_card_from_waste()
     
     # Verify everything is empty
@@ -125,17 +129,19 @@ def test_stock_empty_scenario():
     drawn = game.stock.draw_cards(Difficulty.EASY)
     assert len(drawn) == 0
     
-    # Stock transfer should not be able to create offers
+    # No move can take a card from the stock
     stock_transfer = StockTransfer(game.stock, Difficulty.EASY)
-    offer = stock_transfer.create_offer(None)
-    assert offer is None
+    for index in range(7):
+        move = Move(*stock_transfer.source(), *TableauTransfer(game.tableau, index).destination())
+        assert not game.can_apply_move(move)
+        assert not game.apply_move(move)
 
 def test_stock_with_multiple_difficulties():
     """Test that stock works correctly when switching between difficulties"""
     game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
     
     # Game initialization draws 3 cards, so we have initial waste
-    initial_waste_count = len(game.stock._waste)
+    initial_waste_count = len(game.stock.waste_cards())
     assert initial_waste_count == 3  # Should be 3 from initialization
     
     # Draw 3 cards in hard mode
@@ -157,4 +163,4 @@ def test_stock_with_multiple_difficulties():
     assert len(drawn_easy) == 1
     
     # Total waste should now have initial + 3 + 1 = 7 cards
-    assert len(game.stock._waste) == initial_waste_count + 3 + 1
+    assert len(game.stock.waste_cards()) == initial_waste_count + 3 + 1
@@ -8,34 +8,34 @@ class TestStock:
     def test_stock_initialization(self):
         """Test stock initialization creates a full deck"""
         stock = Stock()
-        assert len(stock._cards) == 52
-        assert len(stock._waste) == 0
+        assert len(stock.stock_cards()) == 52
+        assert len(stock.waste_cards()) == 0
         assert stock.initial_card_amount == 52
 
     def test_draw_cards_easy_difficulty(self):
         """Test drawing one card in easy mode"""
         stock = Stock()
-        initial_count = len(stock._cards)
+        initial_count = len(stock.stock_cards())
         
         drawn = stock.draw_cards(Difficulty.EASY)
         
         assert len(drawn) == 1
-        assert len(stock._cards) == initial_count - 1
-        assert len(stock._waste) == 1
-        assert drawn[0] in stock._waste
+        assert len(stock.stock_cards()) == initial_count - 1
+        assert len(stock.waste_cards()) == 1
+        assert drawn[0] in stock.waste_cards()
 
     def test_draw_cards_hard_difficulty(self):
         """Test drawing three cards in hard mode"""
         stock = Stock()
-        initial_count = len(stock._cards)
+        initial_count = len(stock.stock_cards())
         
         drawn = stock.draw_cards(Difficulty.HARD)
         
         assert len(drawn) == 3
-        assert len(stock._cards) == initial_count - 3
-        assert len(stock._waste) == 3
+        assert len(stock.stock_cards()) == initial_count - 3
+        assert len(stock.waste_cards()) == 3
         for card in drawn:
-            assert card in stock._waste
+            assert card in stock.waste_cards()
 
     def test_get_waste_easy(self):
         """Test getting waste in easy mode shows only top card"""
@@ -46,7 +46,7 @@ class TestStock:
         
         waste = stock.get_waste(Difficulty.EASY)
         assert len(waste) == 1
-        assert waste[0] == stock._waste[-1]  # Should be the last card
+        assert waste[0] == stock.waste_cards()[-1]  # Should be the last card
 
     def test_get_waste_hard(self):
         """Test getting waste in hard mode shows up to 3 cards"""
@@ -57,7 +57,7 @@ class TestStock:
         
         waste = stock.get_waste(Difficulty.HARD)
         assert len(waste) == 3
-        assert waste == stock._waste[-3:]  # Should be the last 3 cards
+        assert waste == stock.waste_cards()[-3:]  # Should be the last 3 cards
 
     def test_get_top_waste_card(self):
         """Test getting the top waste card"""
@@ -79,15 +79,15 @@ class TestStock:
         
         # Draw cards to waste
         drawn = stock.draw_cards(Difficulty.HARD)
-        initial_waste_count = len(stock._waste)
-        expected_card = stock._waste[-1]
+        initial_waste_count = len(stock.waste_cards())
+        expected_card = stock.waste_cards()[-1]
         
         # Draw top card from waste
         card = stock.draw_top_card_from_waste()
         
         assert card == expected_card
-        assert len(stock._waste) == initial_waste_count - 1
-        assert card not in stock._waste
+        assert len(stock.waste_cards()) == initial_waste_count - 1
+        assert card not in stock.waste_cards()
 
     def test_can_draw_from_waste(self):
         """Test checking if we can draw from waste"""
@@ -101,7 +101,7 @@ class TestStock:
         assert stock.can_draw_from_waste()
         
         # Remove all waste cards
-        while stock._waste:
+        while stock.waste_cards():
             stock.draw_top_card_from_waste()
         
         assert not stock.can_draw_from_waste()
@@ -111,20 +111,20 @@ class TestStock:
         stock = Stock()
         
         # Draw all cards from stock to waste
-        while stock._cards:
+        while stock.stock_cards():
             stock.draw_cards(Difficulty.HARD)
         
         # Verify stock is empty and waste has cards
-        assert len(stock._cards) == 0
-        waste_count = len(stock._waste)
+        assert len(stock.stock_cards()) == 0
+        waste_count = len(stock.waste_cards())
         assert waste_count > 0
         
         # Try to draw again - should recycle waste to stock
         drawn = stock.draw_cards(Difficulty.HARD)
         
         assert len(drawn) > 0
-        assert len(stock._waste) == len(drawn)  # Only the newly drawn cards
-        assert len(stock._cards) == waste_count - len(drawn)  # Remaining recycled cards
+        assert len(stock.waste_cards()) == len(drawn)  # Only the newly drawn cards
+        assert len(stock.stock_cards()) == waste_count - len(drawn)  # Remaining recycled cards
 
     def test_remove_card_from_waste(self):
         """Test removing a specific card from waste"""
@@ -133,14 +133,14 @@ class TestStock:
         # Draw cards
         drawn = stock.draw_cards(Difficulty.HARD)
         card_to_remove = drawn[1]  # Middle card
-        initial_waste_count = len(stock._waste)
+        initial_waste_count = len(stock.waste_cards())
         
         # Remove the card
         result = stock.remove_card_from_waste(card_to_remove)
         
         assert result is True
-        assert len(stock._waste) == initial_waste_count - 1
-        assert card_to_remove not in stock._waste
+        assert len(stock.waste_cards()) == initial_waste_count - 1
+        assert card_to_remove not in stock.waste_cards()
         
         # Try to remove a card that's not in waste
         dummy_card = Card(Suit.HEARTS, Rank.ACE)
@@ -153,14 +153,14 @@ class TestStock:
         
         # Draw some cards to waste
         stock.draw_cards(Difficulty.HARD)
-        waste_count = len(stock._waste)
-        stock_count = len(stock._cards)
+        waste_count = len(stock.waste_cards())
+        stock_count = len(stock.stock_cards())
         
         # Reset
         stock.reset()
         
-        assert len(stock._cards) == waste_count
-        assert len(stock._waste) == 0
+        assert len(stock.stock_cards()) == waste_count
+        assert len(stock.waste_cards()) == 0
 
     def test_is_empty(self):
         """Test checking if stock is completely empty"""
@@ -173,11 +173,11 @@ class TestStock:
         stock.draw_cards(Difficulty.HARD)
         
         # Remove all cards from stock
-        stock._cards.clear()
+        stock.set_piles([], stock.waste_cards())
         assert not stock.is_empty()  # Still has waste
         
         # Remove all waste cards too
-        stock._waste.clear()
+        stock.set_piles([], [])
         assert stock.is_empty()  # Now truly empty
 
     def test_copy(self):
@@ -187,10 +187,129 @@ class TestStock:
         
         copied_stock = stock.copy()
         
-        assert len(copied_stock._cards) == len(stock._cards)
-        assert len(copied_stock._waste) == len(stock._waste)
+        assert len(copied_stock.stock_cards()) == len(stock.stock_cards())
+        assert len(copied_stock.waste_cards()) == len(stock.waste_cards())
         assert copied_stock.initial_card_amount == stock.initial_card_amount
         
         # Verify it's a real copy (modifying one doesn't affect the other)
         stock.draw_cards(Difficulty.EASY)
-        assert len(copied_stock._cards) != len(stock._cards)
+        assert len(copied_stock.stock_cards()) != len(stock.stock_cards())
+
+    @pytest.mark.parametrize("difficulty", [Difficulty.EASY, Difficulty.HARD])
+    def test_stock_cycle_matches_real_draws(self, difficulty):
+        """Test the draw index predicts the waste top of repeated draw_cards calls"""
+        stock = Stock(list(Stock().stock_cards()[:24]))
+        expected = [stock.top_after(draws, difficulty) for draws in range(120)]
+        reachable = stock.reachable_cards(difficulty)
+
+        probe = stock.copy()
+        for draws in range(120):
+            assert probe.get_top_waste_card() is expected[draws]
+            card = probe.get_top_waste_card()
+            if card is not None:
+                assert reachable[card] <= draws
+            probe.draw_cards(difficulty)
+        assert all(expected[draws] is card for card, draws in reachable.items())
+
+    def test_stock_cycle_hard_reaches_every_third_card(self):
+        """Test draw-3 mode reaches every third card per pass of a 24 card stock"""
+        stock = Stock(list(Stock().stock_cards()[:24]))
+        first_pass = {card for card, draws in stock.reachable_cards(Difficulty.HARD).items() if draws <= 8}
+        assert len(first_pass) == 8
+        # Recycling reverses the stock, so the second pass reaches other cards
+        assert len(stock.reachable_cards(Difficulty.HARD)) == 16
+        assert len(stock.reachable_cards(Difficulty.EASY)) == 24
+
+    def test_stock_cycle_follows_draws(self):
+        """Test the index is shifted, not rebuilt, when cards are drawn"""
+        stock = Stock(list(Stock().stock_cards()[:10]))
+        cycle = stock.stock_cycle(Difficulty.HARD)
+        for _ in range(7):
+            stock.draw_cards(Difficulty.HARD)
+            assert stock.stock_cycle(Difficulty.HARD) is cycle
+            fresh = Stock([])
+            fresh.set_piles(stock.stock_cards(), stock.waste_cards())
+            assert stock.reachable_cards(Difficulty.HARD) == fresh.reachable_cards(Difficulty.HARD)
+
+    def test_stock_cycle_invalidated_by_waste_changes(self):
+        """Test taking the waste top rebuilds the index"""
+        stock = Stock(list(Stock().stock_cards()[:10]))
+        stock.draw_cards(Difficulty.EASY)
+        card = stock.get_top_waste_card()
+        assert stock.draws_until(card, Difficulty.EASY) == 0
+
+        stock.draw_top_card_from_waste()
+        assert stock.draws_until(card, Difficulty.EASY) is None
+        stock.return_to_waste(card)
+        assert stock.draws_until(card, Difficulty.EASY) == 0
+
+    def test_stock_cycle_empty(self):
+        """Test an empty stock has nothing to reach"""
+        stock = Stock([])
+        assert stock.reachable_cards() == {}
+        assert stock.top_after(5) is None
+
+    @pytest.mark.parametrize("difficulty", [Difficulty.EASY, Difficulty.HARD])
+    def test_ring_buffer_matches_list_piles(self, difficulty):
+        """Test the buffer behaves like plain stock and waste lists over random play"""
+        import random
+        from core.difficulty import get_draw_amount
+        from core.zobrist import stock_hash
+
+        rng = random.Random(7)
+        cards = Stock().stock_cards()[:24]
+        stock = Stock(list(cards))
+        model_cards, model_waste = list(cards), []
+        taken = []
+        for _ in range(400):
+            action = rng.random()
+            if action < 0.6:
+                recycled = not model_cards and bool(model_waste)
+                if recycled:
+                    model_cards, model_waste = model_waste[:], []
+                drawn = [model_cards.pop() for _ in range(min(get_draw_amount(difficulty), len(model_cards)))]
+                model_waste.extend(drawn)
+                assert stock.draw_cards(difficulty) == drawn
+                if drawn and rng.random() < 0.3:
+                    stock.undraw_cards(len(drawn), recycled)
+                    model_cards.extend(reversed(model_waste[-len(drawn):]))
+                    del model_waste[-len(drawn):]
+                    if recycled:
+                        model_cards, model_waste = [], model_cards[:]
+            elif action < 0.8 and model_waste:
+                taken.append(model_waste.pop())
+                assert stock.draw_top_card_from_waste() is taken[-1]
+            elif taken:
+                model_waste.append(taken[-1])
+                stock.return_to_waste(taken.pop())
+            assert stock.stock_cards() == model_cards
+            assert stock.waste_cards() == model_waste
+            assert stock.zobrist_hash() == stock_hash([card.index for card in model_cards],
+                                                      [card.index for card in model_waste])
+
+    def test_recycle_does_not_copy_cards(self):
+        """Test recycling the waste keeps the same buffer"""
+        stock = Stock(Stock().stock_cards()[:5])
+        slots = stock._slots
+        while stock.get_remaining_cards():
+            stock.draw_cards(Difficulty.EASY)
+        waste = stock.waste_cards()
+        stock.draw_cards(Difficulty.EASY)
+        assert stock._slots is slots
+        assert stock.waste_cards() == [waste[-1]]
+        assert stock.stock_cards() == waste[:-1]
+
+    def test_waste_view_follows_draws(self):
+        """Test the visible waste is a live, read-only view"""
+        stock = Stock(Stock().stock_cards()[:10])
+        view = stock.get_waste(Difficulty.HARD)
+        assert len(view) == 0
+        assert stock.get_waste(Difficulty.HARD) is view
+
+        stock.draw_cards(Difficulty.EASY)
+        assert list(view) == stock.waste_cards()
+        stock.draw_cards(Difficulty.HARD)
+        assert view == stock.waste_cards()[-3:]
+        assert view[-1] is stock.get_top_waste_card()
+        with pytest.raises(TypeError):
+            view[0] = None
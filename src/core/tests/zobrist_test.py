@@ -0,0 +1,115 @@
+from .parent_util import add_parent_dir_to_path
+
+add_parent_dir_to_path()
+
+import random
+from core.compact import CompactState
+from core.enums import Difficulty, TransferType
+from core.game import SolitareGame
+from core.transfer import TableauTransfer, StockTransfer, FoundationTransfer
+from core.zobrist import hash_state
+
+def mock_transfer_listener(time_enum):
+    """Mock transfer listener for testing"""
+    pass
+
+def full_hash(game, canonical=False):
+    return hash_state(CompactState.from_game(game), canonical=canonical)
+
+def assert_hash_matches(game):
+    assert game.zobrist_hash() == full_hash(game)
+    assert game.canonical_key() == full_hash(game, canonical=True)
+
+def transfer_move(game, move):
+    if move.source == TransferType.TABLEAU:
+        source = TableauTransfer(game.tableau, move.source_index, move.depth)
+    else:
+        source = StockTransfer(game.stock)
+    if move.target == TransferType.TABLEAU:
+        target = TableauTransfer(game.tableau, move.target_index)
+    else:
+        target = FoundationTransfer(game.foundations, move.target_index)
+    return game.transfer(source, target)
+
+def test_initial_hash_matches_full_recompute():
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener)
+        assert_hash_matches(game)
+
+def test_incremental_hash_during_random_play():
+    rng = random.Random(5)
+    for difficulty in Difficulty:
+        game = SolitareGame(difficulty, transfer_listener=mock_transfer_listener)
+        for _ in range(300):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            assert game.apply_move(rng.choice(moves))
+            assert_hash_matches(game)
+
+def test_incremental_hash_with_transfers():
+    rng = random.Random(11)
+    game = SolitareGame(Difficulty.EASY, transfer_listener=mock_transfer_listener)
+    for _ in range(200):
+        moves = [move for move in game.legal_moves() if move.source != TransferType.FOUNDATION]
+        move = rng.choice(moves)
+        if move.is_draw:
+            game.stock.draw_cards(game.difficulty)
+        else:
+            assert transfer_move(game, move)
+        assert_hash_matches(game)
+
+def test_hash_returns_after_undoing_move():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    before = game.zobrist_hash()
+    card = game.stock.get_top_waste_card()
+    game.stock.draw_top_card_from_waste()
+    assert game.zobrist_hash() != before
+    game.stock.return_to_waste(card)
+    assert game.zobrist_hash() == before
+
+def test_copy_keeps_hash():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    game.apply_move(game.legal_moves()[-1])
+    copied = game.copy()
+    assert copied.zobrist_hash() == game.zobrist_hash()
+    assert copied.canonical_key() == game.canonical_key()
+
+def test_canonical_key_ignores_column_order():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    state = CompactState.from_game(game)
+    state.tableau[2], state.tableau[5] = state.tableau[5], []
+    state.hidden[2], state.hidden[5] = state.hidden[5], 0
+    moved = state.copy()
+    moved.tableau[0], moved.tableau[2] = moved.tableau[2], moved.tableau[0]
+    moved.hidden[0], moved.hidden[2] = moved.hidden[2], moved.hidden[0]
+
+    first, second = state.to_game(), moved.to_game()
+    assert first.canonical_key() == second.canonical_key()
+    assert first.zobrist_hash() != second.zobrist_hash()
+
+def test_hash_distinguishes_positions():
+    game = SolitareGame(Difficulty.HARD, transfer_listener=mock_transfer_listener)
+    other = game.copy()
+    other.difficulty = Difficulty.EASY
+    assert other.zobrist_hash() != game.zobrist_hash()
+
+    state = CompactState.from_game(game)
+    revealed = state.copy()
+    revealed.hidden[6] -= 1
+    assert hash_state(state) != hash_state(revealed)
+    assert hash_state(state, canonical=True) != hash_state(revealed, canonical=True)
+
+def test_hash_accepts_difficulty_given_as_string():
+    # Menu tworzy gry z poziomem podanym jako napis
+    for name in ("easy", "hard"):
+        game = SolitareGame(name, transfer_listener=mock_transfer_listener, deal_number=8)
+        assert_hash_matches(game)
+        for _ in range(20):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            game.apply_move(moves[0])
+        assert_hash_matches(game)
+    assert (SolitareGame(Difficulty.HARD, mock_transfer_listener, 8).zobrist_hash()
+            != SolitareGame(Difficulty.EASY, mock_transfer_listener, 8).zobrist_hash())
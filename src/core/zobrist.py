@@ -0,0 +1,165 @@
+"""
+Klucze Zobrista do haszowania stanu gry.
+
+Każdy element stanu (karta na danej głębokości kolumny, karta na danej
+pozycji talii lub stosu odrzutowego, liczba kart na fundamencie, poziom
+trudności) ma przypisaną losową liczbę 64-bitową. Hash stanu to XOR
+kluczy jego elementów, więc ruch zmienia go w czasie proporcjonalnym do
+liczby przeniesionych kart. Tablice są generowane ze stałego ziarna, przez
+co hashe są stabilne między uruchomieniami programu.
+"""
+
+import random
+from core.card import CARD_COUNT, SUITS, RANKS
+from core.difficulty import get_draw_amount
+from core.enums import Difficulty
+
+PILE_COUNT = 7           # Liczba kolumn tableau (Tableau.PILE_COUNT)
+MAX_DEPTH = CARD_COUNT   # Górne ograniczenie długości kolumny i talii
+_MASK = (1 << 64) - 1
+
+_rng = random.Random(0x50_1174_12E)
+
+def _key() -> int:
+    return _rng.getrandbits(64)
+
+# [głębokość][karta][ukryta] - klucze niezależne od numeru kolumny
+TABLEAU_KEYS = [[(_key(), _key()) for _ in range(CARD_COUNT)] for _ in range(MAX_DEPTH)]
+COLUMN_KEYS = [_key() for _ in range(PILE_COUNT)]
+STOCK_KEYS = [[_key() for _ in range(CARD_COUNT)] for _ in range(MAX_DEPTH)]
+WASTE_KEYS = [[_key() for _ in range(CARD_COUNT)] for _ in range(MAX_DEPTH)]
+# [kolor][liczba kart]; pusty fundament ma klucz 0
+FOUNDATION_KEYS = [[0] + [_key() for _ in RANKS] for _ in SUITS]
+# [liczba dobieranych kart] - klucz zależy od tego, jak poziom wpływa na grę, więc
+# pasuje także do poziomu podanego jako napis (np. "hard" z menu)
+DIFFICULTY_KEYS = {get_draw_amount(difficulty): _key() for difficulty in Difficulty}
+
+def mix(value: int) -> int:
+    """
+    Miesza bity wartości 64-bitowej (finalizer splitmix64).
+
+    Args:
+        value (int): Wartość do wymieszania
+
+    Returns:
+        int: Wymieszana wartość 64-bitowa
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+def tableau_key(depth: int, card: int, hidden: bool) -> int:
+    """
+    Zwraca klucz karty leżącej na danej głębokości kolumny.
+
+    Args:
+        depth (int): Głębokość karty w kolumnie (0 = spód)
+        card (int): Numer karty 0..51
+        hidden (bool): Czy karta jest zakryta
+
+    Returns:
+        int: Klucz Zobrista
+    """
+    return TABLEAU_KEYS[depth][card][hidden]
+
+def tableau_hash(column_hashes: list[int]) -> int:
+    """
+    Łączy hashe kolumn w hash tableau zależny od kolejności kolumn.
+
+    Args:
+        column_hashes (list[int]): Hashe kolejnych kolumn
+
+    Returns:
+        int: Hash tableau
+    """
+    result = 0
+    for key, column in zip(COLUMN_KEYS, column_hashes):
+        result ^= mix(column ^ key)
+    return result
+
+def canonical_tableau_hash(column_hashes: list[int]) -> int:
+    """
+    Łączy hashe kolumn w hash niezależny od kolejności kolumn.
+
+    Kolumny są sumowane jako multizbiór, więc dwie pozycje różniące się
+    tylko ułożeniem kolumn (np. tym, która kolumna jest pusta) mają ten
+    sam hash.
+
+    Args:
+        column_hashes (list[int]): Hashe kolejnych kolumn
+
+    Returns:
+        int: Kanoniczny hash tableau
+    """
+    result = 0
+    for column in column_hashes:
+        result += mix(column)
+    return result & _MASK
+
+def column_hash(cards: list[int], hidden: int) -> int:
+    """
+    Liczy od zera hash jednej kolumny.
+
+    Args:
+        cards (list[int]): Numery kart od spodu kolumny
+        hidden (int): Liczba zakrytych kart na spodzie
+
+    Returns:
+        int: Hash kolumny
+    """
+    result = 0
+    for depth, card in enumerate(cards):
+        result ^= TABLEAU_KEYS[depth][card][depth < hidden]
+    return result
+
+def stock_hash(cards: list[int], waste: list[int]) -> int:
+    """
+    Liczy od zera hash talii i stosu odrzutowego.
+
+    Args:
+        cards (list[int]): Numery kart w talii
+        waste (list[int]): Numery kart na stosie odrzutowym
+
+    Returns:
+        int: Hash talii
+    """
+    result = 0
+    for position, card in enumerate(cards):
+        result ^= STOCK_KEYS[position][card]
+    for position, card in enumerate(waste):
+        result ^= WASTE_KEYS[position][card]
+    return result
+
+def foundations_hash(counts: list[int]) -> int:
+    """
+    Liczy hash fundamentów na podstawie liczby kart każdego koloru.
+
+    Args:
+        counts (list[int]): Liczba kart na fundamencie każdego koloru
+
+    Returns:
+        int: Hash fundamentów
+    """
+    result = 0
+    for suit, count in enumerate(counts):
+        result ^= FOUNDATION_KEYS[suit][count]
+    return result
+
+def hash_state(state, canonical: bool = False) -> int:
+    """
+    Liczy od zera hash zwartego stanu gry.
+
+    Wynik jest równy SolitareGame.zobrist_hash() (lub canonical_key()
+    dla canonical=True) gry, z której zbudowano stan.
+
+    Args:
+        state (CompactState): Stan gry
+        canonical (bool): Czy hash ma nie zależeć od kolejności kolumn
+
+    Returns:
+        int: Hash stanu
+    """
+    columns = [column_hash(cards, hidden) for cards, hidden in zip(state.tableau, state.hidden)]
+    tableau = canonical_tableau_hash(columns) if canonical else tableau_hash(columns)
+    return (tableau ^ stock_hash(state.stock, state.waste)
+            ^ foundations_hash(state.foundations) ^ DIFFICULTY_KEYS[state.draw_amount])
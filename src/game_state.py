@@ -13,6 +13,10 @@ class GameState:
     
     Każdy konkretny stan gry (np. menu, rozgrywka) powinien dziedziczyć po tej klasie
     i implementować metody on_input() oraz draw().
+
+    Główna pętla rysuje stan tylko wtedy, gdy needs_redraw() zwraca True.
+    Animacje przesuwa tick(), wywoływane w każdej klatce, także gdy
+    rysowanie jest pomijane; stan zgłasza zmianę obrazu przez mark_dirty().
     """
     
     def __init__(self, id: str):
@@ -25,6 +29,7 @@ class GameState:
         self.id = id
         self._state_manager = None
         self._game = None
+        self._dirty = True  # Czy obraz stanu zmienił się od ostatniego rysowania
 
     def set_game(self, game) -> None:
         """
@@ -38,6 +43,37 @@ class GameState:
     def init(self):
         pass
 
+    def tick(self) -> None:
+        """
+        Przesuwa animacje stanu o jedną klatkę.
+
+        Wywoływane w każdej klatce głównej pętli, niezależnie od tego,
+        czy stan jest rysowany. Stan, którego obraz zmienia się w czasie,
+        wywołuje tu mark_dirty().
+        """
+        pass
+
+    def mark_dirty(self) -> None:
+        """
+        Zgłasza, że obraz stanu się zmienił i trzeba go narysować ponownie.
+        """
+        self._dirty = True
+
+    def needs_redraw(self) -> bool:
+        """
+        Sprawdza, czy stan trzeba narysować w tej klatce.
+
+        Returns:
+            bool: True jeśli od ostatniego rysowania wywołano mark_dirty()
+        """
+        return self._dirty
+
+    def mark_clean(self) -> None:
+        """
+        Oznacza stan jako narysowany.
+        """
+        self._dirty = False
+
     def get_game(self):
         """
         Zwraca przypisaną instancję gry.
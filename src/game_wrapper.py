@@ -7,8 +7,9 @@ from core.game import SolitareGame
 from blessed import Terminal
 from ui.screen import Screen
 from core.enums import Difficulty, Time
-import dill
-import os
+from core.save_journal import GameSaver
+from core.replay import Replay, ReplaySaver
+from contextlib import contextmanager
 from transition_manager import TransitionManager
 import sys
 import random
@@ -27,16 +28,22 @@ class GameWrapper:
         """
         Inicjalizuje nową instancję GameWrapper.
         
-        Tworzy nową grę pasjansa, inicjalizuje terminal i ekran,
-        oraz przygotowuje listę na historię stanów gry.
+        Tworzy nową grę pasjansa oraz inicjalizuje terminal i ekran.
+        Historia ruchów jest przechowywana w dzienniku samej gry, a zapisy
+        trafiają na dysk w tle przez GameSaver. Przebieg partii jest
+        nagrywany jako powtórka zapisywana do pliku 'replay.bin'.
         """
         self._current_state = None
         self._game = SolitareGame(difficulty=Difficulty.HARD, transfer_listener=self.create_on_transfer())
-        self.last_game_states = []
         self._term = Terminal()
         self._screen = Screen(self._term.width, self._term.height)
         self.running = True
         self.transition_manager = TransitionManager(self)
+        self.saver = GameSaver("save.bin", "save.log")
+        self.replay_saver = ReplaySaver("replay.bin")
+        self.replay_saver.record(self._game)
+        self.frames_rendered = 0  # Klatki narysowane przez główną pętlę
+        self.frames_skipped = 0   # Klatki pominięte, bo nic się nie zmieniło
 
     def set_state(self, state, force=False) -> None:
         """
@@ -58,6 +65,7 @@ class GameWrapper:
                 self._current_state.set_as_owner(None)
             self._current_state = state
             self._current_state.set_as_owner(self)
+            self._current_state.mark_dirty()
 
             self._current_state.set_game(self._game)
 
@@ -99,7 +107,7 @@ class GameWrapper:
             raise ValueError("Current state is not set.")
         return self._current_state
     
-    def reset_game(self, difficulty=Difficulty.EASY) -> None:
+    def reset_game(self, difficulty=Difficulty.EASY, deal_number=None) -> None:
         """
         Resetuje grę do stanu początkowego.
         
@@ -108,21 +116,13 @@ class GameWrapper:
         
         Args:
             difficulty: Poziom trudności nowej gry (domyślnie EASY)
+            deal_number (int, optional): Numer rozdania do odtworzenia; None losuje nowe
         """
-        self._game = SolitareGame(difficulty=difficulty, transfer_listener=self.create_on_transfer())
+        self._game = SolitareGame(difficulty=difficulty, transfer_listener=self.create_on_transfer(),
+                                  deal_number=deal_number)
+        self.replay_saver.record(self._game)
         if self._current_state is not None:
-            self._current_state.draw(self._term, self._screen)
-
-    def save_state(self) -> None:
-        """
-        Zapisuje aktualny stan gry do historii.
-        
-        Zachowuje maksymalnie 3 ostatnie stany gry dla funkcji cofania.
-        Starsze stany są automatycznie usuwane.
-        """
-        self.last_game_states.append(self._game.copy())
-        if len(self.last_game_states) > 3:
-            self.last_game_states.pop(0)
+            self._current_state.mark_dirty()
 
     def create_on_transfer(self):
         """
@@ -139,10 +139,8 @@ class GameWrapper:
             Args:
                 time (Time): Moment transferu (PRE_MOVE lub POST_MOVE)
             """
-            if time == Time.PRE_MOVE:
-                wrapper.save_state()
-            elif time == Time.POST_MOVE:
-                self.save_game()
+            if time == Time.POST_MOVE:
+                wrapper.save_game()
 
         return on_transfer
     
@@ -150,17 +148,30 @@ class GameWrapper:
         """
         Cofa ostatni ruch w grze.
         
-        Przywraca poprzedni stan gry z historii i odświeża wyświetlanie.
+        Odwraca ostatni ruch zapisany w dzienniku gry i odświeża wyświetlanie.
+        Liczba cofnięć nie jest ograniczona.
         
         Raises:
             ValueError: Jeśli nie ma ruchów do cofnięcia
         """
-        if self.last_game_states:
-            self._game = self.last_game_states.pop()
-            if self._current_state is not None:
-                self._current_state.draw(self._term, self._screen)
-        else:
+        if not self._game.undo():
             raise ValueError("Nothing to undo...")
+        self.save_game()
+        if self._current_state is not None:
+            self._current_state.mark_dirty()
+
+    def redo(self) -> None:
+        """
+        Ponawia ostatnio cofnięty ruch.
+        
+        Raises:
+            ValueError: Jeśli nie ma ruchów do ponowienia
+        """
+        if not self._game.redo():
+            raise ValueError("Nothing to redo...")
+        self.save_game()
+        if self._current_state is not None:
+            self._current_state.mark_dirty()
 
     def run(self):
         """
@@ -169,15 +180,22 @@ class GameWrapper:
         Inicjalizuje tryb pełnoekranowy terminala, ukrywa kursor
         i rozpoczyna główną pętlę obsługującą wejście i renderowanie.
         Pętla działa dopóki self.running jest True.
+
+        Klatka jest rysowana tylko wtedy, gdy trwa przejście między stanami
+        albo aktualny stan zgłosił zmianę obrazu (needs_redraw()); w pozostałych
+        klatkach pętla jedynie przesuwa animacje stanu (tick()).
         """
         print(self._term.clear)
-        with self._term.cbreak(), self._term.hidden_cursor(), self._term.fullscreen():
+        with self._term.cbreak(), self._term.hidden_cursor(), self._term.fullscreen(), self._autosave_on_exit():
             while self.running:
                 if self._current_state is not None:
                     input = self._term.inkey(timeout=0.02)
                     if input and not self.transition_manager.began():
                         self._current_state.on_input(self._term, input)
+                        self._current_state.mark_dirty()
 
+                    # Klatka kończąca przejście też musi zostać narysowana, by zniknęły jego karty
+                    in_transition = self.transition_manager.began()
                     random.seed(time.time())
                     for x in range(16):
                         if self.transition_manager.began():
@@ -187,13 +205,35 @@ class GameWrapper:
                                 self.transition_manager.expand()
 
 
+                    self._current_state.tick()
+                    if not in_transition and not self._current_state.needs_redraw():
+                        self.frames_skipped += 1
+                        continue
+
                     self._screen.clear()
                     self._current_state.draw(self._term, self._screen)
+                    self._current_state.mark_clean()
                     self.transition_manager.render(self._screen, self._term)
                     self._screen.render(self._term, 0, 0)
+                    self.frames_rendered += 1
 
         print(self._term.clear)
         print("Thanks for playing!")
+        frames = self.frames_rendered + self.frames_skipped
+        if frames:
+            print(f"Rendered {self.frames_rendered} of {frames} frames, skipped {self.frames_skipped} "
+                  f"({self.frames_skipped / frames:.0%}).")
+
+    @contextmanager
+    def _autosave_on_exit(self):
+        """
+        Zamyka zapis w tle przy wyjściu z gry, czekając na ostatni zapis.
+        """
+        try:
+            yield
+        finally:
+            self.saver.close()
+            self.replay_saver.close()
 
     def was_game_saved(self) -> bool:
         """
@@ -201,33 +241,57 @@ class GameWrapper:
         Returns:
             bool: True jeśli gra została zapisana, False w przeciwnym razie
         """
-        return os.path.exists("save.bin")
+        return self.saver.exists()
     
     def save_game(self) -> None:
         """
         Zapisuje aktualny stan gry do pliku.
         
-        Serializuje obiekt gry i zapisuje go do pliku 'save.bin'.
+        Ruchy od poprzedniego zapisu są dopisywane do dziennika 'save.log',
+        a co kilkadziesiąt ruchów cała gra trafia do punktu kontrolnego
+        'save.bin' (core.save_journal). Powtórka partii trafia do 'replay.bin'
+        co kilkadziesiąt kroków i przy wyjściu z gry (core.replay.ReplaySaver).
+        Pliki są zapisywane w tle.
         """
-        self._game.transfer_listener = None
-        with open("save.bin", "wb") as f:
-            dill.dump(self._game, f)
-        self._game.transfer_listener = self.create_on_transfer()
+        self.saver.save(self._game)
+        self.replay_saver.save(self._game)
 
     def load_game(self) -> None:
         """
         Ładuje stan gry z pliku.
         
-        Deserializuje obiekt gry z pliku 'save.bin' i ustawia go jako aktualny stan gry.
+        Wczytuje punkt kontrolny z pliku 'save.bin', powtarza ruchy z dziennika
+        'save.log' i ustawia wynik jako aktualny stan gry.
         
         Raises:
             FileNotFoundError: Jeśli plik 'save.bin' nie istnieje
+            SaveFormatError: Jeśli plik jest uszkodzony lub zapisany w nieznanym formacie
         """
 
-        if not os.path.exists("save.bin"):
+        if not self.saver.exists():
             raise FileNotFoundError("Save file not found.")
-        with open("save.bin", "rb") as f:
-            self._game = dill.load(f)
-            print(dill.load(f))
-        self._game.transfer_listener = self.create_on_transfer()
+        self._game = self.saver.load(self.create_on_transfer())
+        self.replay_saver.record(self._game)
+
+    def was_replay_saved(self) -> bool:
+        """
+        Sprawdza, czy na dysku jest powtórka ostatniej partii.
+
+        Returns:
+            bool: True jeśli plik 'replay.bin' istnieje
+        """
+        return self.replay_saver.exists()
+
+    def load_replay(self) -> Replay:
+        """
+        Wczytuje powtórkę ostatniej partii z pliku 'replay.bin'.
+
+        Returns:
+            Replay: Wczytana powtórka
+
+        Raises:
+            FileNotFoundError: Jeśli plik 'replay.bin' nie istnieje
+            SaveFormatError: Jeśli plik jest uszkodzony lub zapisany w nieznanym formacie
+        """
+        return self.replay_saver.load()
 
@@ -2,7 +2,9 @@ from game_state import GameState
 from pyfiglet import Figlet
 import math
 from play_state import PlayState
+from replay_state import ReplayState
 from core.enums import Difficulty
+from core.save_codec import SaveFormatError
 import random
 
 class MenuState(GameState):
@@ -34,7 +36,13 @@ class MenuState(GameState):
             self.target_offset -= term.width
 
         if input.name == "KEY_ENTER" or input.name == "KEY_RETURN":
-            if self.option == 0:
+            if self.options[self.option] == "Watch Replay":
+                try:
+                    replay = self.get_owner().load_replay()
+                except (FileNotFoundError, SaveFormatError):
+                    return  # Brak powtórki albo plik z poprzedniej wersji gry
+                self.get_owner().set_state(ReplayState("replay_state", replay))
+            elif self.option == 0:
                 self.get_owner().reset_game(difficulty="easy")
                 self.get_owner().set_state(PlayState("play_state", difficulty=Difficulty.EASY))
             elif self.option == 1:
@@ -42,7 +50,10 @@ class MenuState(GameState):
                 self.get_owner().set_state(PlayState("play_state", difficulty=Difficulty.HARD))
             elif self.option == 2:
                 if self.get_owner().was_game_saved():
-                    self.get_owner().load_game()
+                    try:
+                        self.get_owner().load_game()
+                    except SaveFormatError:
+                        return  # Uszkodzony zapis albo plik z poprzedniej wersji gry
                     self.get_owner().set_state(PlayState("play_state", difficulty=self.get_owner().get_game().difficulty))
 
 
@@ -51,6 +62,23 @@ class MenuState(GameState):
 
         # if self.get_owner().was_game_saved():
         #     self.options.append("Continue")
+        if self.get_owner().was_replay_saved():
+            self.options.append("Watch Replay")
+
+    def tick(self):
+        """
+        Przesuwa animację wjazdu logo i przewijania między opcjami.
+
+        Menu jest rysowane ponownie tylko wtedy, gdy logo przesunie się
+        o cały znak.
+        """
+        before = (int(self.intro), math.floor(self.logo_offset))
+        if int(self.intro) == self.intro_target:
+            self.logo_offset += (self.target_offset - self.logo_offset) / 4
+        else:
+            self.intro += (self.intro_target - self.intro) / 6
+        if (int(self.intro), math.floor(self.logo_offset)) != before:
+            self.mark_dirty()
 
     def render_logo(self, screen, term, color, motto="", x_offset=0, y_offset=0):
         text = "PASJANS"
@@ -96,12 +124,9 @@ class MenuState(GameState):
         # ╰─────────╯
 
         if int(self.intro) == self.intro_target:
-
-            self.logo_offset += (self.target_offset - self.logo_offset) / 4
-            
             self.render_logo(screen, term, term.on_color(18), x_offset=math.floor(self.logo_offset), y_offset=4, motto="Easy Mode")
             self.render_logo(screen, term, term.on_color(88), x_offset=math.floor(self.logo_offset)+term.width, y_offset=4, motto="Hard Mode")
-            self.render_logo(screen, term, term.on_black, x_offset=math.floor(self.logo_offset)+term.width*2, y_offset=4, motto="Continue")
+            self.render_logo(screen, term, term.on_black, x_offset=math.floor(self.logo_offset)+term.width*2, y_offset=4, motto="Replay" if "Watch Replay" in self.options else "Continue")
 
             for i, option in enumerate(self.options):
                 prefix = term.bold + term.white + term.on_green if i == self.option else term.normal
@@ -112,5 +137,4 @@ class MenuState(GameState):
                     text = "  " + text + "  "
                 screen.insert_line(screen.width // 2 - len(text) // 2, 14 + i, text, prefix=prefix, suffix=term.normal)
         else:
-            self.render_logo(screen, term, term.on_color(18), x_offset=math.floor(self.logo_offset), y_offset=4 + int(self.intro))
-            self.intro += (self.intro_target - self.intro) / 6
\ No newline at end of file
+            self.render_logo(screen, term, term.on_color(18), x_offset=math.floor(self.logo_offset), y_offset=4 + int(self.intro))
\ No newline at end of file
@@ -9,13 +9,16 @@ from core.card import create_card
 import math
 from time import time
 import random
-from core.transfer import TableauTransfer, StockTransfer, FoundationTransfer
+from core.transfer import TableauTransfer, FoundationTransfer
 import sys
 from enum import Enum
-from core.enums import Suit
+from core.enums import Suit, TransferType
+from core.move import DRAW
 from win_state import WinState
 
 BOARD_DETAILS = 50  # Liczba elementów dekoracyjnych na planszy
+FLIGHT_FRAMES = 10  # Liczba klatek lotu karty na fundament przy automatycznym kończeniu
+FLIGHT_DELAY = 3    # Odstęp (w klatkach) między startami kolejnych kart
 
 class CursorType(Enum):
     """
@@ -81,11 +84,14 @@ class PlayState(GameState):
 
         self.toasts = []
 
+        self.flights = []                   # Karty lecące na fundamenty: (karta, start, kolor, klatka startu)
+
         self.dif = difficulty
 
 
     def init(self):
         self.get_owner().reset_game(difficulty=self.dif)
+        self.toasts.append(f"Deal #{self.get_owner().get_game().deal_number}")
 
         
     def get_focused_card(self):
@@ -100,7 +106,7 @@ class PlayState(GameState):
         pile = game.tableau.piles[cursor[0]]
         if pile is None:
             return None
-        card = pile.as_list()[cursor[1]]
+        card = pile.card_at(cursor[1])
 
         return card
 
@@ -126,8 +132,8 @@ class PlayState(GameState):
             
         # Sprawdź długość stosu tylko jeśli stos nie jest None
         if new_x < len(game.tableau.piles) and game.tableau.piles[new_x] is not None:
-            if new_y >= len(game.tableau.piles[new_x].as_list()):
-                new_y = len(game.tableau.piles[new_x].as_list()) - 1
+            if new_y >= len(game.tableau.piles[new_x]):
+                new_y = len(game.tableau.piles[new_x]) - 1
         else:
             # Dla pustych stosów ustaw y na 0
             new_y = 0
@@ -135,14 +141,8 @@ class PlayState(GameState):
         if new_x >= 0 and new_x < len(game.tableau.piles):
             pile = game.tableau.piles[new_x]
             if pile is not None:
-                cards = pile.as_list()
-                for i, card in enumerate(cards):
-                    if i < new_y:
-                        continue
-                    if card.hidden:
-                        new_y += 1
-                    else:
-                        break
+                # Zakryte karty leżą na spodzie stosu
+                new_y = max(new_y, pile.first_face_up())
         return (new_x, new_y)
 
     
@@ -150,8 +150,8 @@ class PlayState(GameState):
         """
         Rysuje kompletną planszę gry na ekranie.
         
-        Rysuje tło, dekoracje, wszystkie elementy gry (stock, fundamenty, tableau)
-        i aktualizuje liczniki animacji.
+        Rysuje tło, dekoracje i wszystkie elementy gry (stock, fundamenty, tableau).
+        Liczniki animacji przesuwa tick().
         
         Args:
             term: Instancja terminala do formatowania
@@ -169,11 +169,10 @@ class PlayState(GameState):
 
             screen.set_char(x, y, term.on_darkgreen + term.green + "~" + term.normal)
 
-        self.blink = self.frame % 30 < 10
-
         self.draw_stock(term, screen)
         self.draw_foundations(term, screen)
         self.draw_tableau(term, screen, x_off=14)
+        self.draw_flights(term, screen)
 
         if self.transfer_a is not None and self.cursor_type == CursorType.FOUNDATION and self.global_timer % 20 < 10:
             x_a, y_a = self.transfer_a_origin
@@ -183,13 +182,36 @@ class PlayState(GameState):
         for i, toast in enumerate(self.toasts):
             screen.insert_line(0, screen.height - 1 - i, toast, prefix=term.on_black + term.white, suffix=term.normal)
 
+    def animation_frame(self) -> tuple:
+        """
+        Zwraca wartości liczników animacji widoczne na planszy.
+
+        Returns:
+            tuple: Miganie kursora, liczba komunikatów, widoczność opisu karty
+                i miganie linii transferu
+        """
+        return (self.blink, len(self.toasts), self.frame > 50,
+                self.transfer_a is not None and self.global_timer % 20 < 10)
+
+    def tick(self):
+        """
+        Przesuwa liczniki animacji planszy o jedną klatkę.
+
+        Plansza jest rysowana ponownie tylko wtedy, gdy zmieni się któraś
+        z wartości animation_frame() albo lecą karty na fundamenty.
+        """
+        before = self.animation_frame()
+
         if len(self.toasts) > 0:
             if self.global_timer % max(5, int(20/len(self.toasts))) == 0:
                 self.toasts.pop(0)
 
         self.global_timer += 1
+        self.frame += 1
+        self.blink = self.frame % 30 < 10
 
-        
+        if self.flights or self.animation_frame() != before:
+            self.mark_dirty()
 
 
     def draw_stock(self, term, screen):
@@ -206,10 +228,9 @@ class PlayState(GameState):
         game = self.get_owner().get_game()
 
         dummy_card = create_card()
-        dummy_card.hidden = True
 
         for y in range(2):
-            draw_card(term, screen, dummy_card, x=1, y=1-y, invert=(self.cursor[1]==0 and self.blink and self.cursor_type == CursorType.STOCK))
+            draw_card(term, screen, dummy_card, x=1, y=1-y, invert=(self.cursor[1]==0 and self.blink and self.cursor_type == CursorType.STOCK), hidden=True)
 
         cards = game.stock.get_waste(game.difficulty)
         for y, card in enumerate(cards):
@@ -243,6 +264,11 @@ class PlayState(GameState):
             if len(cards) == 0:
                 continue
 
+            # Karty, które jeszcze lecą, nie leżą jeszcze na fundamencie
+            cards = cards[:len(cards) - sum(1 for flight in self.flights if flight[2] == x)]
+            if len(cards) == 0:
+                continue
+
             card = cards[-1]
             should_blink = self.blink and self.get_focused_card() == card and self.cursor_type == CursorType.FOUNDATION
 
@@ -251,6 +277,52 @@ class PlayState(GameState):
             else:
                 draw_card_top(term, screen, card, x=screen.width-12, y=x*7, invert=should_blink) 
 
+    def start_auto_complete(self) -> int:
+        """
+        Przenosi na fundamenty wszystkie bezpieczne karty i uruchamia animację ich lotu.
+
+        Gra wykonuje całą serię naraz (jeden zapis gry), a stan jedynie
+        animuje przeniesione karty od ich dawnych miejsc do fundamentów.
+
+        Returns:
+            int: Liczba przeniesionych kart
+        """
+        done = self.get_owner().get_game().auto_complete()
+        for i, (move, card) in enumerate(done):
+            if move.source == TransferType.TABLEAU:
+                start = (move.source_index * 12 + 14, move.depth + 1)
+            else:
+                start = (1, 9)
+            self.flights.append((card, start, move.target_index, self.global_timer + i * FLIGHT_DELAY))
+        if done:
+            self.toasts.append(f"Auto-complete: {len(done)} cards")
+        return len(done)
+
+    def draw_flights(self, term, screen):
+        """
+        Rysuje karty lecące na fundamenty i usuwa te, które już doleciały.
+
+        Karty czekające na start są rysowane w swoich dawnych miejscach;
+        późniejsze (leżące niżej w kolumnie) rysowane są pod wcześniejszymi.
+
+        Args:
+            term: Instancja terminala do formatowania
+            screen: Bufor ekranu do rysowania
+        """
+        if not self.flights:
+            return
+
+        for card, (x, y), suit, start in reversed(self.flights):
+            progress = max(0.0, (self.global_timer - start) / FLIGHT_FRAMES)
+            if progress >= 1:
+                continue
+            target_x, target_y = screen.width - 12, suit * 7
+            draw_card(term, screen, card, x=round(x + (target_x - x) * progress), y=round(y + (target_y - y) * progress))
+
+        self.flights = [flight for flight in self.flights if self.global_timer - flight[3] < FLIGHT_FRAMES]
+        if not self.flights and self.get_owner().get_game().has_won():
+            self.get_owner().set_state(WinState('win'))
+
     def draw_tableau(self, term, screen, x_off=0):
         """
         Rysuje główną planszę gry (tableau) w środkowej części ekranu.
@@ -270,10 +342,11 @@ class PlayState(GameState):
             for y, card in enumerate(cards):
                 should_blink = self.blink and self.get_focused_card() == card and self.cursor_type == CursorType.TABLEAU
 
+                hidden = pile.is_face_down(y)
                 if len(cards) == y + 1:
-                    draw_card(term, screen, card, x=x*12+x_off, y=y+1, invert=should_blink)
+                    draw_card(term, screen, card, x=x*12+x_off, y=y+1, invert=should_blink, hidden=hidden)
                 else:
-                    draw_card_top(term, screen, card, x=x*12+x_off, y=y+1, invert=should_blink)
+                    draw_card_top(term, screen, card, x=x*12+x_off, y=y+1, invert=should_blink, hidden=hidden)
                 
                 if self.get_focused_card() == card and self.transfer_a is not None and self.global_timer % 20 < 10 and self.cursor_type == CursorType.TABLEAU:
                     screen.line(self.transfer_a_origin[0], self.transfer_a_origin[1], x*12+x_off+5, y+4, term.on_yellow + term.white + " " + term.normal)
@@ -288,12 +361,11 @@ class PlayState(GameState):
                     screen.line(self.transfer_a_origin[0], self.transfer_a_origin[1], x*12+x_off+5, y+4, term.on_yellow + term.white + " " + term.normal)
         
         focused_card = self.get_focused_card()
-        if focused_card and not focused_card.hidden and self.frame > 50 and self.cursor_type == CursorType.TABLEAU:
-            x, y = self.get_real_cursor()
+        x, y = self.get_real_cursor()
+        focused_pile = self.get_owner().get_game().tableau.piles[x]
+        if focused_card and not focused_pile.is_face_down(y) and self.frame > 50 and self.cursor_type == CursorType.TABLEAU:
             screen.insert_line(x*12+3+x_off, y+8, str(focused_card), prefix=term.on_black + term.white, suffix=term.normal)
 
-        self.frame += 1
-
     def clamp_cursor(self):
         """
         Ogranicza pozycję kursora do prawidłowych wartości.
@@ -493,41 +565,19 @@ class PlayState(GameState):
         if input.name == 'KEY_ENTER':
             if self.cursor[1] == 0:
                 game = self.get_owner().get_game()
-                game.stock.draw_cards(game.difficulty)
+                game.apply_move(DRAW)
                 self.frame = 0
             elif self.cursor[1] == 1:
                 game = self.get_owner().get_game()
-                placed = False
-                for x in range(3):
-                    placed = game.transfer(StockTransfer(game.stock, game.difficulty), FoundationTransfer(
-                        foundations=game.foundations,
-                        target_index=x,
-                        difficulty=game.difficulty
-                    ))
-                    if placed:
-                        self.cursor_type = CursorType.TABLEAU
-                        self.cursor = (x, 0)
-                        self.frame = 0
-                        self.clamp_cursor()
-                        placed = True
-                        break
-                if not placed:
-                    for x in range(len(game.tableau.piles)):
-                        placed = game.transfer(StockTransfer(game.stock, game.difficulty), TableauTransfer(
-                            tableau=game.tableau,
-                            source_index=x,
-                            depth=0,
-                            difficulty=game.difficulty
-                        ))
-                        if placed:
-                            self.cursor_type = CursorType.TABLEAU
-                            self.cursor = (x, 0)
-                            self.frame = 0
-                            self.clamp_cursor()
-                            placed = True
-                            break
-                    if not placed:
-                        self.toasts.append("No valid moves available.")
+                moves = [move for move in game.legal_moves()
+                         if move.source == TransferType.STOCK and not move.is_draw]
+                if moves and game.apply_move(moves[0]):
+                    self.cursor_type = CursorType.TABLEAU
+                    self.cursor = (moves[0].target_index if moves[0].target.is_tableau else 0, 0)
+                    self.frame = 0
+                    self.clamp_cursor()
+                else:
+                    self.toasts.append("No valid moves available.")
             
 
     def on_input(self, term, input):
@@ -544,12 +594,30 @@ class PlayState(GameState):
         if input == 'q':
             self.get_owner().menu()
 
+        if self.flights:
+            return
+
+        if input == 'a':
+            if not self.start_auto_complete():
+                self.toasts.append("No safe moves to foundations.")
+
         if input == 'z':
             try:
                 self.get_owner().undo()
             except ValueError as e:
                 self.toasts.append(str(e))
 
+        if input == 'y':
+            try:
+                self.get_owner().redo()
+            except ValueError as e:
+                self.toasts.append(str(e))
+
+        # Automatyczne kończenie startuje tylko po ruchu gracza - nie po cofnięciu,
+        # ponowieniu ani ruchu kursora, inaczej cofnięty ruch wracałby od razu
+        game = self.get_owner().get_game()
+        moves_before = len(game.journal)
+
         if self.cursor_type == CursorType.TABLEAU:
             self.handle_cursor_for_tableau(input)
 
@@ -559,6 +627,11 @@ class PlayState(GameState):
         elif self.cursor_type == CursorType.FOUNDATION:
             self.handle_cursor_for_foundation(input)
 
-        if self.get_owner().get_game().has_won():
+        game = self.get_owner().get_game()
+        if (len(game.journal) > moves_before and game.all_revealed()
+                and game.safe_foundation_move() is not None):
+            self.start_auto_complete()
+
+        if not self.flights and game.has_won():
             self.get_owner().set_state(WinState('win'))
 
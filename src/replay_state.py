@@ -0,0 +1,184 @@
+"""
+Stan odtwarzania powtórki partii.
+Pokazuje planszę w kolejnych krokach powtórki z dowolną prędkością
+i pozwala przeskoczyć do wybranego kroku.
+"""
+
+from game_state import GameState
+from play_state import PlayState, BOARD_DETAILS
+from core.replay import Replay
+from time import time
+import random
+
+MIN_SPEED = 0.25  # Najmniejsza prędkość odtwarzania
+MAX_SPEED = 64    # Największa prędkość odtwarzania
+
+class ReplayState(GameState):
+    """
+    Stan odtwarzający powtórkę partii.
+
+    Plansza jest rysowana metodami PlayState, ale gra pochodzi z powtórki,
+    a nie z GameWrapper. Kroki są wykonywane na bieżąco w miarę upływu czasu
+    odtwarzania; przeskok wstecz odtwarza grę od początku rozdania.
+    """
+
+    def __init__(self, id: str, replay: Replay):
+        """
+        Inicjalizuje stan odtwarzania.
+
+        Args:
+            id (str): Identyfikator stanu
+            replay (Replay): Odtwarzana powtórka
+        """
+        super().__init__(id)
+        self.replay = replay
+        self.replay_game = replay.game(0)
+        self.position = 0        # Liczba wykonanych kroków powtórki
+        self.clock = 0.0         # Czas odtwarzania w sekundach partii
+        self.speed = 1.0         # Mnożnik prędkości odtwarzania
+        self.paused = False
+        self.error = None        # Opis kroku, którego nie udało się wykonać
+        self.last_time = None    # Czas poprzedniej klatki
+        self.seed = hash(time()) % (10**8)  # Ziarno dla generowania dekoracji
+
+        # Plansza rysowana przez PlayState bez kursora i animacji
+        self.board = PlayState("replay_board")
+        self.board.cursor_type = None
+        self.board.set_as_owner(self)
+
+    def get_game(self):
+        """
+        Zwraca grę w aktualnym kroku powtórki.
+
+        Returns:
+            SolitareGame: Odtwarzana gra
+        """
+        return self.replay_game
+
+    def seek(self, position: int) -> None:
+        """
+        Przechodzi do podanego kroku powtórki.
+
+        Kroki do przodu są wykonywane na bieżącej grze, a cofnięcie
+        odtwarza grę od początku rozdania. Jeśli któregoś kroku nie da się
+        wykonać, odtwarzanie zatrzymuje się przed nim i pokazuje błąd.
+
+        Args:
+            position (int): Liczba kroków do wykonania
+        """
+        position = max(0, min(position, len(self.replay)))
+        if position < self.position:
+            try:
+                self.replay_game = self.replay.game(position)
+            except ValueError as error:
+                self.stop(str(error))
+                return
+        else:
+            for index in range(self.position, position):
+                step = self.replay.steps[index]
+                if not Replay.apply_step(self.replay_game, step):
+                    position = index
+                    self.stop(f"Replay step {index} ({step.action.name}) cannot be applied")
+                    break
+        self.position = position
+        self.clock = self.replay.steps[position - 1].time if position else 0.0
+
+    def stop(self, error: str) -> None:
+        """
+        Wstrzymuje odtwarzanie z powodu błędu w powtórce.
+
+        Args:
+            error (str): Opis błędu pokazywany na pasku stanu
+        """
+        self.error = error
+        self.paused = True
+        self.mark_dirty()
+
+    def set_speed(self, speed: float) -> None:
+        """
+        Ustawia prędkość odtwarzania.
+
+        Args:
+            speed (float): Mnożnik prędkości (ograniczony do MIN_SPEED..MAX_SPEED)
+        """
+        self.speed = max(MIN_SPEED, min(speed, MAX_SPEED))
+
+    def on_input(self, term, input):
+        """
+        Obsługuje sterowanie odtwarzaniem.
+
+        Spacja wstrzymuje i wznawia, strzałki przechodzą o krok, + i -
+        zmieniają prędkość, Home i End skaczą na początek i koniec,
+        cyfry skaczą do kolejnych dziesiątych części powtórki, a q wraca do menu.
+
+        Args:
+            term: Instancja terminala
+            input: Wciśnięty klawisz od użytkownika
+        """
+        if input == 'q':
+            self.get_owner().menu()
+        elif input == ' ':
+            self.paused = not self.paused
+        elif input == '+':
+            self.set_speed(self.speed * 2)
+        elif input == '-':
+            self.set_speed(self.speed / 2)
+        elif input.isdigit():
+            self.seek(len(self.replay) * int(input) // 10)
+        elif input.name == "KEY_RIGHT":
+            self.paused = True
+            self.seek(self.position + 1)
+        elif input.name == "KEY_LEFT":
+            self.paused = True
+            self.seek(self.position - 1)
+        elif input.name == "KEY_HOME":
+            self.seek(0)
+        elif input.name == "KEY_END":
+            self.seek(len(self.replay))
+
+    def tick(self) -> None:
+        """
+        Przesuwa czas odtwarzania i wykonuje kroki, których czas już minął.
+
+        Plansza jest rysowana ponownie tylko po wykonaniu kroku.
+        """
+        now = time()
+        if self.last_time is not None and not self.paused and self.position < len(self.replay):
+            self.clock += (now - self.last_time) * self.speed
+            target = self.replay.steps_until(self.clock)
+            if target > self.position:
+                clock = self.clock
+                self.seek(target)
+                self.clock = clock
+                self.mark_dirty()
+        self.last_time = now
+
+    def draw(self, term, screen):
+        """
+        Rysuje planszę w aktualnym kroku powtórki i pasek stanu odtwarzania.
+
+        Args:
+            term: Instancja terminala do formatowania
+            screen: Bufor ekranu do rysowania
+        """
+        screen.bg(term.on_darkgreen + " " + term.normal)
+
+        for i in range(BOARD_DETAILS):
+            random.seed(self.seed + i)
+            x = random.randint(0, term.width - 1)
+            y = random.randint(0, term.height - 1)
+            screen.set_char(x, y, term.on_darkgreen + term.green + "~" + term.normal)
+
+        self.board.draw_stock(term, screen)
+        self.board.draw_foundations(term, screen)
+        self.board.draw_tableau(term, screen, x_off=14)
+
+        if self.error is not None:
+            status = f" Replay deal #{self.replay.deal_number}  step {self.position}/{len(self.replay)}  {self.error}  [q] menu "
+            screen.insert_line(0, screen.height - 1, status, prefix=term.on_red + term.white, suffix=term.normal)
+            return
+
+        state = "paused" if self.paused else f"{self.speed:g}x"
+        status = (f" Replay deal #{self.replay.deal_number}  step {self.position}/{len(self.replay)}  {state}"
+                  f"  [space] pause  [left/right] step  [+/-] speed  [0-9] jump  [q] menu ")
+        screen.insert_line(0, screen.height - 1, status, prefix=term.on_black + term.white, suffix=term.normal)
@@ -0,0 +1,51 @@
+"""
+Masowa symulacja rozgrywek bez interfejsu - punkt wejścia wiersza poleceń.
+
+Rozgrywa podaną liczbę partii losową albo zachłanną polityką, dzieląc je
+między procesy, i wypisuje łączne statystyki oraz liczbę partii na sekundę.
+
+Przykład:
+    python src/simulate_games.py 100000 --policy greedy --workers 8 --seed 1
+"""
+
+import argparse
+import os
+import sys
+from core.enums import Difficulty
+from core.simulate import simulate, POLICIES, DEFAULT_MAX_MOVES
+
+def main(argv=None) -> int:
+    """
+    Uruchamia symulację.
+
+    Args:
+        argv (list[str], optional): Argumenty wiersza poleceń
+
+    Returns:
+        int: Kod wyjścia procesu
+    """
+    parser = argparse.ArgumentParser(description="Run headless Klondike playouts and report throughput.")
+    parser.add_argument("playouts", type=int, help="number of games to play")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--difficulty", choices=["easy", "hard"], default="hard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed for deal numbers and move choices")
+    parser.add_argument("--max-moves", type=int, default=DEFAULT_MAX_MOVES, help="move limit of a single game")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = simulate(args.playouts, args.policy, Difficulty[args.difficulty.upper()], args.seed,
+                         args.workers, args.max_moves)
+    except KeyboardInterrupt:
+        print("Interrupted.")
+        return 130
+
+    print(f"Played {stats.playouts} games in {stats.elapsed:.2f}s ({stats.playouts_per_second:.1f} playouts/s).")
+    if stats.playouts:
+        print(f"Wins: {stats.wins} ({stats.win_rate:.2%}), "
+              f"average moves: {stats.moves / stats.playouts:.1f}, "
+              f"average foundation cards: {stats.foundation_cards / stats.playouts:.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
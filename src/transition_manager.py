@@ -74,8 +74,5 @@ class TransitionManager:
             self.wrapper.set_state(self.target, force=True)
 
         for card, x, y in self.cards:
-            if card.hidden:
-                continue
-            
             draw_card(term, screen, card, x, y)
 
@@ -99,14 +99,14 @@ def rank_to_ascii(rank: Rank):
             ]
         
 
-def draw_card(term: Terminal, screen: Screen, card: Card, x: int, y: int, invert: bool = False):
+def draw_card(term: Terminal, screen: Screen, card: Card, x: int, y: int, invert: bool = False, hidden: bool = False):
     color = term.color(40) if card.get_color() == Color.BLACK else term.on_color(88)
 
-    rank = card.rank.short_name() if not card.hidden else '???'
+    rank = card.rank.short_name() if not hidden else '???'
     while len(rank) < 3:
         rank += ' '
 
-    if card.hidden:
+    if hidden:
         rank = "?  "
         color = term.on_color(18)
 
@@ -117,11 +117,11 @@ def draw_card(term: Terminal, screen: Screen, card: Card, x: int, y: int, invert
         else:
             reversed_rank = reversed_rank + char
 
-    suit = card.suit if not card.hidden else '???'
-    if card.hidden:
+    suit = card.suit if not hidden else '???'
+    if hidden:
         suit = '-'
 
-    ascii_center = rank_to_ascii(card.rank if not card.hidden else None)
+    ascii_center = rank_to_ascii(card.rank if not hidden else None)
 
     if invert:
         color = term.reverse + color
@@ -149,16 +149,16 @@ def draw_foundation_base(term: Terminal, screen: Screen, suit: Suit, x: int, y:
     screen.insert_line(x, y + 5, f'│ {suit}       │', prefix=color, suffix=term.normal)
     screen.insert_line(x, y + 6, '╰─────────╯', prefix=color, suffix=term.normal)
 
-def draw_card_top(term: Terminal, screen: Screen, card: Card, x: int, y: int, invert: bool = False):
+def draw_card_top(term: Terminal, screen: Screen, card: Card, x: int, y: int, invert: bool = False, hidden: bool = False):
     color = term.color(40) if card.get_color() == Color.BLACK else term.on_color(88)
 
-    rank = card.rank.short_name() if not card.hidden else '??'
+    rank = card.rank.short_name() if not hidden else '??'
     while len(rank) < 2:
         rank += ' '
 
-    suit = card.suit if not card.hidden else '?'
+    suit = card.suit if not hidden else '?'
 
-    if card.hidden:
+    if hidden:
         rank = '??'
         suit = '?'
         color = term.on_color(18)
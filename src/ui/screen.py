@@ -1,107 +1,207 @@
+import re
 import sys
 from blessed import Terminal
 
+# Niezmieniony fragment wiersza krótszy niż tyle komórek jest wypisywany zamiast przesuwania kursora
+MIN_GAP = 8
+
+# Sekwencje sterujące terminala (SGR, wybór zestawu znaków i pozostałe CSI)
+ESCAPE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|[()][0-9A-Za-z]|[@-Z\\-_])")
+
 class Screen:
+    # Komórka to znak (plan znaków) i numer stylu (plan stylów). Styl to sekwencje sterujące
+    # poprzedzające znak; każda komórka kończy się resetem atrybutów (term.normal), więc
+    # styl nie przechodzi na kolejne komórki.
+
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
-        self.chars = [[" " for _ in range(width)] for _ in range(height)]
-        self.prev_chars = [row.copy() for row in self.chars]
+        self.blank = [" "] * width
+        self.blank_styles = [0] * width
+        self.glyphs = [self.blank[:] for _ in range(height)]
+        self.styles = [self.blank_styles[:] for _ in range(height)]
+        self.prev_glyphs = [self.blank[:] for _ in range(height)]
+        self.prev_styles = [self.blank_styles[:] for _ in range(height)]
+
+        # Numery stylów: style_codes[numer] to sekwencje sterujące stylu, 0 to brak stylu
+        self.style_codes = [""]
+        self._style_numbers = {"": 0}
+        # Komórki podane jako gotowe napisy, rozłożone na (znak, numer stylu)
+        self._cells = {}
+
+        # Zakres kolumn [lo, hi) zapisanych w każdym wierszu od ostatniego clear()
+        self.touch_lo = [width] * height
+        self.touch_hi = [0] * height
+        # Ten sam zakres dla klatki widocznej na terminalu
+        self.prev_lo = [width] * height
+        self.prev_hi = [0] * height
 
         self.last_delta_num = 0
 
+    def style(self, codes: str) -> int:
+        number = self._style_numbers.get(codes)
+        if number is None:
+            number = self._style_numbers[codes] = len(self.style_codes)
+            self.style_codes.append(codes)
+        return number
+
+    def _cell(self, char: str) -> tuple[str, int]:
+        # Rozkłada napis "styl + znak + reset" na znak i numer stylu
+        cell = self._cells.get(char)
+        if cell is None:
+            start = 0
+            while match := ESCAPE.match(char, start):
+                start = match.end()
+            cell = self._cells[char] = (ESCAPE.sub("", char[start:]), self.style(char[:start]))
+        return cell
+
+    def _touch(self, y: int, lo: int, hi: int):
+        if lo < self.touch_lo[y]:
+            self.touch_lo[y] = lo
+        if hi > self.touch_hi[y]:
+            self.touch_hi[y] = hi
+
     def clear(self):
-        self.chars = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        for y in range(self.height):
+            if self.touch_lo[y] < self.touch_hi[y]:
+                self.glyphs[y][:] = self.blank
+                self.styles[y][:] = self.blank_styles
+        self.touch_lo = [self.width] * self.height
+        self.touch_hi = [0] * self.height
 
     def set_char(self, x: int, y: int, char: str):
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.chars[y][x] = char
+            self.glyphs[y][x], self.styles[y][x] = self._cell(char)
+            self._touch(y, x, x + 1)
 
     def get_char(self, x: int, y: int) -> str:
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.chars[y][x]
+            return self.style_codes[self.styles[y][x]] + self.glyphs[y][x]
         return " "
-    
+
     def insert_line(self, x: int, y: int, line: str, prefix="", suffix=""):
-        if 0 <= y and y < len(self.chars):
-            for i, char in enumerate(line):
-                cx = x + i
-                if 0 <= cx < self.width and cx < len(self.chars[y]):
-                    self.chars[y][cx] = f"{prefix}{char}{suffix}"
+        if 0 <= y < self.height:
+            lo, hi = max(x, 0), min(x + len(line), self.width)
+            if lo < hi:
+                self.glyphs[y][lo:hi] = line[lo - x:hi - x]
+                self.styles[y][lo:hi] = [self.style(prefix)] * (hi - lo)
+                self._touch(y, lo, hi)
 
     def bg(self, char: str):
+        glyph, style = self._cell(char)
         for y in range(self.height):
-            for x in range(self.width):
-                self.chars[y][x] = char
+            self.glyphs[y][:] = [glyph] * self.width
+            self.styles[y][:] = [style] * self.width
+        self.touch_lo = [0] * self.height
+        self.touch_hi = [self.width] * self.height
 
     def rect(self, x: int, y: int, width: int, height: int, char: str):
-        for dy in range(height):
-            for dx in range(width):
-                if 0 <= x + dx < self.width and 0 <= y + dy < self.height:
-                    self.chars[y + dy][x + dx] = char
+        lo, hi = max(x, 0), min(x + width, self.width)
+        if lo >= hi:
+            return
+        glyph, style = self._cell(char)
+        for row in range(max(y, 0), min(y + height, self.height)):
+            self.glyphs[row][lo:hi] = [glyph] * (hi - lo)
+            self.styles[row][lo:hi] = [style] * (hi - lo)
+            self._touch(row, lo, hi)
 
     def line(self, x0: int, y0: int, x1: int, y1: int, char: str) -> None:
         steep = abs(y1 - y0) > abs(x1 - x0)
-        
+
         if steep:
             x0, y0 = y0, x0  # swap(x0, y0)
             x1, y1 = y1, x1  # swap(x1, y1)
-        
+
         if x0 > x1:
             x0, x1 = x1, x0  # swap(x0, x1)
             y0, y1 = y1, y0  # swap(y0, y1)
-        
+
         dx = x1 - x0
         dy = abs(y1 - y0)
         err = dx // 2  # Integer division equivalent to dx / 2
-        
+
         if y0 < y1:
             ystep = 1
         else:
             ystep = -1
-        
+
         x = x0
         while x <= x1:
             if steep:
                 self.set_char(y0, x, char)  # drawPixel(y0, x, color)
             else:
                 self.set_char(x, y0, char)  # drawPixel(x, y0, color)
-            
+
             err -= dy
             if err < 0:
                 y0 += ystep
                 err += dx
-            
-            x += 1
 
+            x += 1
 
+    def _row_runs(self, y: int, lo: int, hi: int) -> list[tuple[int, int]]:
+        # Zmienione fragmenty wiersza; krótkie niezmienione przerwy są dołączane do fragmentu
+        glyphs, prev_glyphs = self.glyphs[y], self.prev_glyphs[y]
+        styles, prev_styles = self.styles[y], self.prev_styles[y]
+        runs = []
+        x = lo
+        while x < hi:
+            while x < hi and glyphs[x] == prev_glyphs[x] and styles[x] == prev_styles[x]:
+                x += 1
+            if x == hi:
+                break
+            start = end = x
+            while x < hi and x - end < MIN_GAP:
+                if glyphs[x] != prev_glyphs[x] or styles[x] != prev_styles[x]:
+                    end = x + 1
+                x += 1
+            runs.append((start, end))
+            x = end
+        return runs
+
+    def _emit_run(self, out: list, normal: str, y: int, start: int, end: int):
+        # Sekwencja stylu jest wypisywana tylko tam, gdzie styl zmienia się wzdłuż fragmentu
+        glyphs, styles = self.glyphs[y], self.styles[y]
+        current = 0
+        run = start
+        for x in range(start, end):
+            style = styles[x]
+            if style != current:
+                out.append(''.join(glyphs[run:x]))
+                out.append(normal + self.style_codes[style] if current else self.style_codes[style])
+                current, run = style, x
+        out.append(''.join(glyphs[run:end]))
+        if current:
+            out.append(normal)
 
     def render(self, term: Terminal, x_pos: int = 0, y_pos: int = 0) -> None:
-        deltas = [[self.chars[y][x] != self.prev_chars[y][x]
-                   for x in range(self.width)]
-                  for y in range(self.height)]
-
-        self.last_delta_num = sum(sum(1 for cell in row if cell) for row in deltas)
-
-        if self.last_delta_num > 0:
+        # Porównywane są tylko wiersze zapisane w tej albo w poprzedniej klatce (pozostałe są puste
+        # w obu), a w nich tylko zapisany zakres kolumn - najpierw w całości, a komórka po komórce
+        # dopiero wtedy, gdy się różni.
+        out = []
+        changed = 0
+        normal = term.normal
+        for y in range(self.height):
+            lo = min(self.touch_lo[y], self.prev_lo[y])
+            hi = max(self.touch_hi[y], self.prev_hi[y])
+            if lo >= hi or (self.glyphs[y][lo:hi] == self.prev_glyphs[y][lo:hi]
+                            and self.styles[y][lo:hi] == self.prev_styles[y][lo:hi]):
+                continue
+            for start, end in self._row_runs(y, lo, hi):
+                out.append(term.move_xy(start + x_pos, y + y_pos))
+                self._emit_run(out, normal, y, start, end)
+                changed += end - start
+
+        self.last_delta_num = changed
+
+        if changed > 0:
             sys.stdout.write(term.home)
-
-            out = []
-            for y in range(self.height):
-                x = 0
-                while x < self.width:
-                    if deltas[y][x]:
-                        start = x
-                        buf = []
-                        while x < self.width and deltas[y][x]:
-                            buf.append(self.chars[y][x])
-                            x += 1
-                        out.append(term.move_xy(start + x_pos, y + y_pos))
-                        out.append(''.join(buf))
-                    else:
-                        x += 1
-
             sys.stdout.write(''.join(out))
             sys.stdout.flush()
 
-            self.prev_chars = [row.copy() for row in self.chars]
+        # Narysowana klatka staje się poprzednią, a jej bufor posłuży do rysowania następnej.
+        # Bufor rysowania zawiera wtedy starszą klatkę, więc każda klatka zaczyna się od clear().
+        self.glyphs, self.prev_glyphs = self.prev_glyphs, self.glyphs
+        self.styles, self.prev_styles = self.prev_styles, self.styles
+        self.touch_lo, self.prev_lo = self.prev_lo, self.touch_lo
+        self.touch_hi, self.prev_hi = self.prev_hi, self.touch_hi
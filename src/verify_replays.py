@@ -0,0 +1,69 @@
+"""
+Weryfikacja plików powtórek bez interfejsu - punkt wejścia wiersza poleceń.
+
+Sprawdza, czy każdy krok powtórek jest zgodny z zasadami gry, dzieląc
+pliki między procesy, i wypisuje niepoprawne powtórki oraz liczbę
+sprawdzonych powtórek na sekundę.
+
+Przykład:
+    python src/verify_replays.py replays/ --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from core.replay import verify_replay_files
+
+def collect_paths(paths: list[str]) -> list[str]:
+    """
+    Rozwija katalogi na zawarte w nich pliki.
+
+    Args:
+        paths (list[str]): Ścieżki plików i katalogów
+
+    Returns:
+        list[str]: Ścieżki plików powtórek
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(root, name) for root, _, names in os.walk(path) for name in sorted(names))
+        else:
+            files.append(path)
+    return files
+
+def main(argv=None) -> int:
+    """
+    Uruchamia weryfikację.
+
+    Args:
+        argv (list[str], optional): Argumenty wiersza poleceń
+
+    Returns:
+        int: Kod wyjścia procesu (1 jeśli któraś powtórka jest niepoprawna)
+    """
+    parser = argparse.ArgumentParser(description="Check replay files against the game rules and report throughput.")
+    parser.add_argument("paths", nargs="+", help="replay files or directories containing them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.paths)
+    start = time.perf_counter()
+    try:
+        checks = verify_replay_files(paths, args.workers)
+    except KeyboardInterrupt:
+        print("Interrupted.")
+        return 130
+    elapsed = time.perf_counter() - start
+
+    invalid = [(path, check) for path, check in zip(paths, checks) if not check.valid]
+    for path, check in invalid:
+        print(f"{path}: invalid at step {check.steps}")
+    rate = len(paths) / elapsed if elapsed > 0 else 0.0
+    print(f"Verified {len(paths)} replays in {elapsed:.2f}s ({rate:.1f} replays/s).")
+    print(f"Valid: {len(paths) - len(invalid)}, invalid: {len(invalid)}, won: {sum(check.won for check in checks)}")
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
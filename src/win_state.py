@@ -26,6 +26,15 @@ class WinState(GameState):
     def init(self):
         self.x_off = self.get_owner()._screen.width
 
+    def needs_redraw(self) -> bool:
+        """
+        Ekran wygranej jest animowany w każdej klatce.
+
+        Returns:
+            bool: Zawsze True
+        """
+        return True
+
     def draw(self, term, screen):
         """
         Rysuje zawartość menu na ekranie.